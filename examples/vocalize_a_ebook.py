@@ -90,9 +90,11 @@ def main():
     text = extract_text_from_epub("book.epub")
 
     speaker_file = 'sample_voice.wav'
-    # Initialize the engine, you can experiment with the scheduler_max_concurrency parameter to optimize the performance
+    # Initialize the engine, you can experiment with the scheduler_max_concurrency parameter to optimize the performance.
+    # The book is split and tokenized in worker processes, they import this script again: keep the main guard below
     tts = TTS(
-        scheduler_max_concurrency=12).from_pretrained("AstraMindAI/xttsv2", gpt_model="AstraMindAI/xtts2-gpt")
+        scheduler_max_concurrency=12).from_pretrained("AstraMindAI/xttsv2", gpt_model="AstraMindAI/xtts2-gpt",
+                                                      text_preparation_workers=4)
     req = TTSRequest(
             text=text,
             language="auto",
@@ -51,6 +51,7 @@ setup(
         "pytest",
         "pypinyin",
         "safetensors",
+        "scipy",
         "sounddevice",
         "soundfile",
         "spacy==3.7.5",
@@ -0,0 +1,223 @@
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from auralis.common.logging.logger import setup_logger
+
+# Bump when the enhancement output changes, so stale entries are never served
+ENHANCEMENT_CACHE_VERSION = 2
+_ENTRY_SUFFIX = '.npy'
+_TMP_SUFFIX = '.tmp'
+# Temporary files older than this belong to a writer that died mid-write
+STALE_TMP_SECONDS = 3600
+
+
+def default_cache_dir() -> Path:
+    """Get the default location of the enhancement cache.
+
+    ``AURALIS_CACHE_DIR`` takes precedence, then ``XDG_CACHE_HOME`` and finally ``~/.cache``.
+
+    Returns:
+        Path: Directory the enhanced audio is stored in.
+    """
+    if cache_dir := os.environ.get('AURALIS_CACHE_DIR'):
+        return Path(cache_dir) / 'enhancement'
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'auralis' / 'enhancement'
+
+
+class EnhancementCache:
+    """Content-addressed disk store for enhanced reference audio.
+
+    Entries are keyed by the content hash of the source audio and the hash of the
+    preprocessing config, so identical uploads under different names share an entry and
+    an edited file never returns a stale result. Arrays are stored as ``.npy`` files,
+    written to a temporary file and atomically renamed, so several workers can share the
+    same directory. The least recently used entries (by mtime, refreshed on every hit) are
+    evicted once the store grows past its byte budget, temporary files in progress count
+    against it too. Temporary files left by a process that died mid-write are removed at
+    start up and by every eviction pass.
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 max_size_bytes: int = 1024 ** 3):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (Optional[Union[str, Path]], optional): Store location. Defaults to ``default_cache_dir()``.
+            max_size_bytes (int, optional): Size budget of the store, 0 disables it. Defaults to 1GB.
+        """
+        self.logger = setup_logger(__file__)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        # Bytes written since the last eviction pass, avoids listing the directory on every put
+        self._pending_bytes = 0
+        self._dir_ready = False
+        if self.enabled:
+            self.sweep_temporary_files()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size_bytes > 0
+
+    @staticmethod
+    def make_key(content_hash: str, config_hash: str) -> str:
+        """Build the key of an entry.
+
+        Args:
+            content_hash (str): Hash of the source audio content.
+            config_hash (str): Hash of the preprocessing config.
+
+        Returns:
+            str: Entry key.
+        """
+        return f"v{ENHANCEMENT_CACHE_VERSION}-{content_hash}-{config_hash}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_ENTRY_SUFFIX}"
+
+    def _ensure_dir(self):
+        if not self._dir_ready:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._dir_ready = True
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Look up an entry.
+
+        Args:
+            key (str): Entry key.
+
+        Returns:
+            Optional[np.ndarray]: The stored array, None on a miss.
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            array = np.load(path, allow_pickle=False)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError) as e:
+            # Truncated or corrupted entry, drop it and recompute
+            self.logger.warning(f"Discarding unreadable enhancement cache entry {path.name}: {e}")
+            self._unlink(path)
+            return None
+
+        try:
+            # Refresh the entry for the LRU ordering
+            os.utime(path)
+        except OSError:
+            pass
+        return array
+
+    def put(self, key: str, array: np.ndarray):
+        """Store an entry atomically and evict old entries if over budget.
+
+        Args:
+            key (str): Entry key.
+            array (np.ndarray): Array to store.
+        """
+        if not self.enabled:
+            return
+        try:
+            self._ensure_dir()
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{key}.", suffix=_TMP_SUFFIX)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.save(f, np.ascontiguousarray(array), allow_pickle=False)
+                os.replace(tmp_path, self._path(key))
+            except BaseException:
+                self._unlink(Path(tmp_path))
+                raise
+        except OSError as e:
+            self.logger.warning(f"Could not write enhancement cache entry: {e}")
+            return
+
+        with self._lock:
+            self._pending_bytes += array.nbytes
+            # Only scan the directory once we might actually be over budget
+            if self._pending_bytes < self.max_size_bytes // 16:
+                return
+            self._pending_bytes = 0
+        self.evict()
+
+    def _is_stale_tmp(self, stat: os.stat_result, now: float) -> bool:
+        return now - stat.st_mtime > STALE_TMP_SECONDS
+
+    def sweep_temporary_files(self):
+        """Remove the temporary files of writes that never completed."""
+        now = time.time()
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(_TMP_SUFFIX):
+                        continue
+                    try:
+                        if self._is_stale_tmp(entry.stat(), now):
+                            self._unlink(Path(entry.path))
+                    except FileNotFoundError:
+                        continue
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+    def evict(self):
+        """Remove the least recently used entries until the store fits its budget."""
+        entries = []
+        total = 0
+        now = time.time()
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    is_tmp = entry.name.endswith(_TMP_SUFFIX)
+                    if not is_tmp and not entry.name.endswith(_ENTRY_SUFFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        # Evicted (or renamed into place) by another worker in the meantime
+                        continue
+                    if is_tmp:
+                        if self._is_stale_tmp(stat, now):
+                            self._unlink(Path(entry.path))
+                        else:
+                            # a write in progress, it takes room but can't be evicted
+                            total += stat.st_size
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+        except FileNotFoundError:
+            return
+
+        if total <= self.max_size_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size_bytes:
+                break
+            self._unlink(Path(path))
+            total -= size
+
+    def clear(self):
+        """Remove every entry."""
+        if not self.cache_dir.exists():
+            return
+        for path in self.cache_dir.glob(f"*{_ENTRY_SUFFIX}"):
+            self._unlink(path)
+        self.sweep_temporary_files()
+
+    @staticmethod
+    def _unlink(path: Path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+enhancement_cache = EnhancementCache()
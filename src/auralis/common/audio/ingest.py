@@ -0,0 +1,293 @@
+import asyncio
+import hashlib
+import io
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+import torch
+import torchaudio
+from cachetools import LRUCache
+
+from auralis.common.logging.logger import setup_logger
+
+EncodedAudio = Union[str, Path, bytes]
+AudioArray = Union[np.ndarray, torch.Tensor]
+# Paths and encoded bytes are decoded, arrays are taken as already sampled at the target rate
+# unless they come as an (array, sample_rate) tuple
+AudioSource = Union[EncodedAudio, AudioArray, Tuple[AudioArray, int]]
+
+# Extra audio decoded past max_length so the resampler tail does not see an artificial cut
+_RESAMPLE_MARGIN_SECONDS = 0.05
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=32)
+def get_resampler(orig_sr: int,
+                  target_sr: int,
+                  device: torch.device = torch.device("cpu"),
+                  dtype: torch.dtype = torch.float32) -> torchaudio.transforms.Resample:
+    """Get a resampler for a rate pair, building its sinc kernel only once.
+
+    ``torchaudio.functional.resample`` recomputes the interpolation kernel on every call,
+    the transform computes it at construction time, so we keep one per rate pair,
+    device and dtype. The defaults match the functional version, hence the output is identical.
+
+    Args:
+        orig_sr (int): Sampling rate of the input.
+        target_sr (int): Desired sampling rate.
+        device (torch.device, optional): Device the kernel lives on. Defaults to CPU.
+        dtype (torch.dtype, optional): Kernel dtype. Defaults to float32.
+
+    Returns:
+        torchaudio.transforms.Resample: Cached resampler.
+    """
+    return torchaudio.transforms.Resample(orig_sr, target_sr, dtype=dtype).to(device)
+
+
+def resample(audio: torch.Tensor, orig_sr: int, target_sr: int) -> torch.Tensor:
+    """Resample audio using a cached kernel.
+
+    Args:
+        audio (torch.Tensor): Audio tensor of shape [..., samples].
+        orig_sr (int): Sampling rate of the input.
+        target_sr (int): Desired sampling rate.
+
+    Returns:
+        torch.Tensor: Resampled audio, the input itself if the rates already match.
+    """
+    if orig_sr == target_sr:
+        return audio
+    return get_resampler(orig_sr, target_sr, audio.device, audio.dtype)(audio)
+
+
+def hash_audio_source(source: EncodedAudio) -> str:
+    """Hash the content of an encoded audio source.
+
+    Args:
+        source (EncodedAudio): Path to an audio file or raw encoded bytes.
+
+    Returns:
+        str: Hex digest of the content.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    else:
+        with open(source, 'rb') as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def is_in_memory_audio(source: AudioSource) -> bool:
+    """Check whether a source is an already decoded waveform.
+
+    Args:
+        source (AudioSource): Audio source.
+
+    Returns:
+        bool: True for arrays, tensors and (array, sample_rate) tuples.
+    """
+    if isinstance(source, tuple):
+        return len(source) == 2 and isinstance(source[0], (np.ndarray, torch.Tensor))
+    return isinstance(source, (np.ndarray, torch.Tensor))
+
+
+def to_waveform(source: AudioSource, sampling_rate: int) -> Tuple[torch.Tensor, int]:
+    """Convert an in-memory audio source to a mono float32 tensor.
+
+    Args:
+        source (AudioSource): Array, tensor or (array, sample_rate) tuple. Multichannel
+            inputs are expected channels first.
+        sampling_rate (int): Rate assumed for bare arrays and tensors.
+
+    Returns:
+        Tuple[torch.Tensor, int]: Audio of shape [1, samples] and its sampling rate.
+    """
+    if isinstance(source, tuple):
+        source, sampling_rate = source
+    audio = torch.from_numpy(np.ascontiguousarray(source)) if isinstance(source, np.ndarray) else source
+    audio = audio.detach().cpu().to(torch.float32)
+    if audio.dim() == 1:
+        audio = audio.unsqueeze(0)
+    elif audio.size(0) != 1:
+        audio = torch.mean(audio, dim=0, keepdim=True)
+    return audio, int(sampling_rate)
+
+
+def _open_source(source: EncodedAudio):
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray, memoryview)) else source
+
+
+def decode_audio(source: EncodedAudio, max_length: Optional[float] = None) -> Tuple[torch.Tensor, int]:
+    """Decode an audio source to a mono float32 tensor at its native rate.
+
+    Only the first ``max_length`` seconds (plus a small margin for resampling) are read,
+    so long recordings are never decoded in full.
+
+    Args:
+        source (EncodedAudio): Path to an audio file or raw encoded bytes.
+        max_length (Optional[float], optional): Seconds to read. Defaults to None (everything).
+
+    Returns:
+        Tuple[torch.Tensor, int]: Audio of shape [1, samples] and its sampling rate.
+    """
+    try:
+        with sf.SoundFile(_open_source(source)) as f:
+            sr = f.samplerate
+            frames = -1 if max_length is None else math.ceil((max_length + _RESAMPLE_MARGIN_SECONDS) * sr)
+            data = f.read(frames=frames, dtype='float32', always_2d=True)
+        audio = torch.from_numpy(data.T.copy())
+    except RuntimeError:
+        # Formats libsndfile can't read, fall back to the torchaudio backends (i.e. ffmpeg)
+        info = torchaudio.info(_open_source(source))
+        sr = info.sample_rate
+        frames = -1 if max_length is None else math.ceil((max_length + _RESAMPLE_MARGIN_SECONDS) * sr)
+        audio, sr = torchaudio.load(_open_source(source), num_frames=frames)
+
+    # Stereo to mono if needed
+    if audio.size(0) != 1:
+        audio = torch.mean(audio, dim=0, keepdim=True)
+    return audio.to(torch.float32), sr
+
+
+def _tensor_nbytes(tensor: torch.Tensor) -> int:
+    return tensor.numel() * tensor.element_size()
+
+
+class AudioIngestor:
+    """Decodes and resamples reference audio off the event loop.
+
+    Decoding runs in a thread pool (libsndfile and torch release the GIL), resampling
+    kernels are cached per rate pair and the decoded mono float32 audio at the target
+    rate is kept in a size-bounded LRU cache keyed by the content hash of the source,
+    so the same reference uploaded twice, or under a different name, is decoded once.
+
+    Attributes:
+        executor (ThreadPoolExecutor): Pool the decoding runs in.
+    """
+
+    def __init__(self, max_workers: int = 4, cache_size_bytes: int = 512 * 1024 ** 2):
+        """Initialize the ingestor.
+
+        Args:
+            max_workers (int, optional): Decoding threads. Defaults to 4.
+            cache_size_bytes (int, optional): Budget for cached decoded audio. Defaults to 512MB.
+        """
+        self.logger = setup_logger(__file__)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auralis-audio")
+        self._cache = LRUCache(maxsize=cache_size_bytes, getsizeof=_tensor_nbytes)
+        # (path, size, mtime) -> content hash, avoids re-hashing unchanged files
+        self._hash_memo = LRUCache(maxsize=4096)
+        self._lock = threading.Lock()
+
+    def content_hash(self, source: AudioSource) -> str:
+        """Hash the content of an audio source.
+
+        File hashes are memoized on (path, size, mtime), so unchanged files are read only once.
+
+        Args:
+            source (AudioSource): Path, encoded bytes or an in-memory waveform.
+
+        Returns:
+            str: Hex digest of the content.
+        """
+        if is_in_memory_audio(source):
+            sampling_rate = source[1] if isinstance(source, tuple) else None
+            audio = source[0] if isinstance(source, tuple) else source
+            if isinstance(audio, torch.Tensor):
+                audio = audio.detach().cpu().numpy()
+            audio = np.ascontiguousarray(audio)
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(f"{audio.dtype}{audio.shape}{sampling_rate}".encode())
+            digest.update(audio)
+            return digest.hexdigest()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return hash_audio_source(source)
+        stat = os.stat(source)
+        memo_key = (os.path.realpath(source), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            content_hash = self._hash_memo.get(memo_key)
+        if content_hash is None:
+            content_hash = hash_audio_source(source)
+            with self._lock:
+                self._hash_memo[memo_key] = content_hash
+        return content_hash
+
+    def load(self,
+             source: AudioSource,
+             sampling_rate: int,
+             max_length: Optional[float] = None) -> torch.Tensor:
+        """Load an audio source synchronously.
+
+        Args:
+            source (AudioSource): Path, encoded bytes or an in-memory waveform.
+            sampling_rate (int): Target sampling rate.
+            max_length (Optional[float], optional): Seconds to keep. Defaults to None (everything).
+
+        Returns:
+            torch.Tensor: Mono float32 audio of shape [1, samples], clipped to [-1, 1].
+        """
+        if is_in_memory_audio(source):
+            # Nothing to decode, there is no point in caching it
+            audio, sr = to_waveform(source, sampling_rate)
+            audio = resample(audio, sr, sampling_rate)
+            if max_length is not None:
+                audio = audio[:, : int(sampling_rate * max_length)]
+            return audio.clone().clip_(-1, 1)
+
+        cache_key = (self.content_hash(source), sampling_rate, max_length)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached.clone()
+
+        audio, sr = decode_audio(source, max_length)
+        audio = resample(audio, sr, sampling_rate)
+        if max_length is not None:
+            audio = audio[:, : int(sampling_rate * max_length)]
+
+        # Clip audio invalid values
+        audio = audio.contiguous().clip_(-1, 1)
+        with self._lock:
+            self._cache[cache_key] = audio
+        return audio.clone()
+
+    async def load_async(self,
+                         source: AudioSource,
+                         sampling_rate: int,
+                         max_length: Optional[float] = None) -> torch.Tensor:
+        """Load an audio source in the decoding pool without blocking the event loop.
+
+        Args:
+            source (AudioSource): Path, encoded bytes or an in-memory waveform.
+            sampling_rate (int): Target sampling rate.
+            max_length (Optional[float], optional): Seconds to keep. Defaults to None (everything).
+
+        Returns:
+            torch.Tensor: Mono float32 audio of shape [1, samples], clipped to [-1, 1].
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, partial(self.load, source, sampling_rate, max_length)
+        )
+
+    def clear_cache(self):
+        """Drop all cached audio."""
+        with self._lock:
+            self._cache.clear()
+            self._hash_memo.clear()
+
+    def shutdown(self):
+        """Shut down the decoding pool."""
+        self.executor.shutdown(wait=False)
+
+
+audio_ingestor = AudioIngestor()
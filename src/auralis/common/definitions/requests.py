@@ -1,75 +1,23 @@
-import io
+import hashlib
+import threading
 import uuid
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from pathlib import Path
-from typing import Union, AsyncGenerator, Optional, List, Literal, get_args, Callable
+from typing import Union, AsyncGenerator, Optional, List, Literal, get_args, Callable, Tuple, Sequence
 
 import langid
-import librosa
-import soundfile as sf
+import numpy as np
 
-import functools
-import hashlib
-import json
-from functools import lru_cache
-from dataclasses import asdict, field
+from dataclasses import field
 
 from cachetools import LRUCache
 
-
-def hash_params(*args, **kwargs):
-    """Create a hash from function parameters for caching.
-
-    Args:
-        *args: Variable positional arguments to hash.
-        **kwargs: Variable keyword arguments to hash.
-
-    Returns:
-        str: MD5 hash of the stringified parameters.
-    """
-    params_str = json.dumps([str(arg) for arg in args], sort_keys=True)
-    return hashlib.md5(params_str.encode()).hexdigest()
-
-
-def cached_processing(maxsize=128):
-    """Decorator for caching audio processing results.
-
-    Implements an LRU cache for audio processing functions to avoid
-    reprocessing the same audio files with the same configuration.
-
-    Args:
-        maxsize (int, optional): Maximum size of the LRU cache. Defaults to 128.
-
-    Returns:
-        Callable: Decorated function with caching behavior.
-    """
-    def decorator(func):
-        # Create cache storage
-        cache = LRUCache(maxsize=maxsize)
-        @functools.wraps(func)
-        def wrapper(self, audio_path: str, audio_config: AudioPreprocessingConfig, *args, **kwargs):
-            # Create hash from the two parameters we care about
-            params_dict = {
-                'audio_path': audio_path,
-                'config': asdict(audio_config)
-            }
-            cache_key = hash_params(params_dict)
-
-            # Check cache
-            if result := cache.get(cache_key):
-                return result
-
-            # If not in cache, process and store
-            result = func(self, audio_path, audio_config, *args, **kwargs)
-            cache.__setitem__(cache_key, result)
-            return result
-
-        return wrapper
-
-    return decorator
-
-from auralis.common.definitions.enhancer import EnhancedAudioProcessor, AudioPreprocessingConfig
+from auralis.common.audio.enhancement_cache import EnhancementCache, enhancement_cache
+from auralis.common.audio.ingest import AudioSource, audio_ingestor
+from auralis.common.definitions.enhancer import AudioPreprocessingConfig, get_audio_processor
+from auralis.common.logging.logger import setup_logger
+from auralis.common.metrics.performance import track_stage
 
 SupportedLanguages = Literal[
         "en",
@@ -93,12 +41,61 @@ SupportedLanguages = Literal[
         ""
     ]
 
-@lru_cache(maxsize=1024)
+# Characters langid looks at for a request, taken from a few spots across the text
+LANGUAGE_SAMPLE_CHARS = 2000
+LANGUAGE_SAMPLE_WINDOWS = 4
+# Shorter chunks are too ambiguous to classify on their own, they keep the request language
+MIN_CHUNK_DETECTION_CHARS = 20
+
+logger = setup_logger(__file__)
+
+_language_cache = LRUCache(maxsize=8192)
+_language_cache_lock = threading.Lock()
+
+# Chunk level detection runs here, so it overlaps with tokenization on the caller side
+language_detection_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="auralis-langid")
+
+
+def sample_text(text: str, max_chars: int = LANGUAGE_SAMPLE_CHARS, windows: int = LANGUAGE_SAMPLE_WINDOWS) -> str:
+    """Take a bounded, representative sample of a text.
+
+    Args:
+        text (str): Text to sample.
+        max_chars (int, optional): Maximum sample length. Defaults to LANGUAGE_SAMPLE_CHARS.
+        windows (int, optional): Number of evenly spaced windows the sample is made of.
+            Defaults to LANGUAGE_SAMPLE_WINDOWS.
+
+    Returns:
+        str: The text itself if short enough, otherwise the windows joined by spaces.
+    """
+    if len(text) <= max_chars:
+        return text
+    window = max_chars // windows
+    stride = (len(text) - window) / max(windows - 1, 1)
+    return " ".join(text[int(i * stride):int(i * stride) + window] for i in range(windows))
+
+
+def _classify(text: str) -> str:
+    """Run langid on a text, hash-cached so the text itself is never kept alive by the cache."""
+    key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    with _language_cache_lock:
+        detected_language = _language_cache.get(key)
+    if detected_language is None:
+        detected_language = langid.classify(text)[0].strip()
+        if detected_language == "zh":
+            # we use zh-cn
+            detected_language = "zh-cn"
+        with _language_cache_lock:
+            _language_cache[key] = detected_language
+    return detected_language
+
+
 def get_language(text: str):
     """Detect the language of input text.
 
     Uses langid for language detection and handles special cases like
-    Chinese (zh-cn).
+    Chinese (zh-cn). Only a bounded sample of the text is classified, so the cost
+    does not grow with the document.
 
     Args:
         text (str): Text to detect language for.
@@ -106,11 +103,31 @@ def get_language(text: str):
     Returns:
         str: Detected language code.
     """
-    detected_language =  langid.classify(text)[0].strip()
-    if detected_language == "zh":
-        # we use zh-cn
-        detected_language = "zh-cn"
-    return detected_language
+    return _classify(sample_text(text))
+
+
+def detect_languages(texts: Sequence[str], default_language: str) -> List[str]:
+    """Detect the language of each chunk of a document.
+
+    Args:
+        texts (Sequence[str]): Text chunks, i.e. sentences.
+        default_language (str): Language used for chunks too short to classify reliably
+            or detected as an unsupported language.
+
+    Returns:
+        List[str]: A supported language code per chunk.
+    """
+    supported = get_args(SupportedLanguages)
+    languages = []
+    for text in texts:
+        language = default_language
+        if len(text.strip()) >= MIN_CHUNK_DETECTION_CHARS:
+            detected_language = get_language(text)
+            if detected_language in supported:
+                language = detected_language
+        languages.append(language)
+    return languages
+
 
 def validate_language(language: str) -> SupportedLanguages:
     """Validate that a language code is supported.
@@ -141,12 +158,16 @@ class TTSRequest:
 
     Attributes:
         text (Union[AsyncGenerator[str, None], str, List[str]]): Input text to synthesize.
-        speaker_files (Union[Union[str,List[str]], Union[bytes,List[bytes]]]): Reference audio for voice cloning.
+        speaker_files (Union[AudioSource, List[AudioSource]]): Reference audio for voice cloning, as paths,
+            encoded bytes, numpy arrays or tensors (optionally as (array, sample_rate) tuples).
         context_partial_function (Optional[Callable]): Optional function for context preparation.
         start_time (Optional[float]): Request start time.
         enhance_speech (bool): Whether to apply speech enhancement.
         audio_config (AudioPreprocessingConfig): Audio preprocessing configuration.
         language (SupportedLanguages): Language code for synthesis.
+        per_chunk_language (bool): Detect the language of every sentence chunk, for mixed-language
+            documents. ``language`` (detected on a sample of the text if 'auto') is used for chunks
+            too short to classify.
         request_id (str): Unique request identifier.
         load_sample_rate (int): Sample rate for loading audio files.
         sound_norm_refs (bool): Whether to normalize reference audio.
@@ -164,13 +185,14 @@ class TTSRequest:
     # Request metadata
     text: Union[AsyncGenerator[str, None], str, List[str]]
 
-    speaker_files: Union[Union[str,List[str]], Union[bytes,List[bytes]]]
+    speaker_files: Union[AudioSource, List[AudioSource]]
     context_partial_function: Optional[Callable] = None
 
     start_time: Optional[float] = None
     enhance_speech: bool = False
     audio_config: AudioPreprocessingConfig = field(default_factory=AudioPreprocessingConfig)
     language: SupportedLanguages = "auto"
+    per_chunk_language: bool = False
     request_id: str = field(default_factory=lambda: uuid.uuid4().hex)
     load_sample_rate: int = 22050
     sound_norm_refs: bool = False
@@ -191,60 +213,75 @@ class TTSRequest:
 
     def __post_init__(self):
         """Initialize request after dataclass creation.
-        
-        Performs language detection if needed and sets up audio preprocessing.
+
+        Only validates the parameters, so building a request is cheap and safe to do on the
+        event loop. Language detection and speech enhancement are run later, as stages of
+        the first generation phase (see ``infer_language`` and ``enhance_speaker_files``).
         """
-        if self.language == 'auto' and len(self.text) > 0:
-            self.language = get_language(self.text)
+        with track_stage('request_init'):
+            validate_language(self.language)
+            self.speaker_files_enhanced = False
 
-        validate_language(self.language)
-        self.processor = EnhancedAudioProcessor(self.audio_config)
-        if isinstance(self.speaker_files, list) and self.enhance_speech:
-            self.speaker_files = [self.preprocess_audio(f, self.audio_config) for f in self.speaker_files]
+    @property
+    def needs_language_detection(self) -> bool:
+        return self.language == 'auto' and isinstance(self.text, str) and len(self.text) > 0
+
+    @property
+    def needs_enhancement(self) -> bool:
+        return self.enhance_speech and isinstance(self.speaker_files, list) and not self.speaker_files_enhanced
 
     def infer_language(self):
         """Infer the language of the input text if not specified.
         
         Updates the language attribute based on text content if set to 'auto'.
         """
-        if self.language == 'auto':
-            self.language = get_language(self.text)
+        if self.needs_language_detection:
+            self.language = validate_language(get_language(self.text))
+
+    def enhance_speaker_files(self):
+        """Apply speech enhancement to the reference audio, if requested and not done yet."""
+        if self.needs_enhancement:
+            self.speaker_files = [self.preprocess_audio(f, self.audio_config) for f in self.speaker_files]
+            self.speaker_files_enhanced = True
+
+    @property
+    def processor(self):
+        return get_audio_processor(self.audio_config)
 
-    @cached_processing()
-    def preprocess_audio(self, audio_source: Union[str, bytes], audio_config: AudioPreprocessingConfig) -> str:
+    def preprocess_audio(self,
+                         audio_source: AudioSource,
+                         audio_config: AudioPreprocessingConfig) -> Union[Tuple[np.ndarray, int], AudioSource]:
         """Preprocess audio files for voice cloning.
 
         Applies audio enhancement and preprocessing according to the configuration.
-        Results are cached to avoid reprocessing the same files.
+        Results are stored in the enhancement cache, keyed by the audio content and the
+        configuration, so the same audio is never enhanced twice, whatever its name.
 
         Args:
-            audio_source (Union[str, bytes]): Path to audio file or audio data.
+            audio_source (AudioSource): Path to audio file, encoded audio data or a waveform.
             audio_config (AudioPreprocessingConfig): Preprocessing configuration.
 
         Returns:
-            str: Path to the processed audio file.
+            Union[Tuple[np.ndarray, int], AudioSource]: The processed waveform and its sampling rate,
+                or the original source if processing failed.
 
         Note:
-            Processed files are stored in /tmp/auralis with unique identifiers.
+            The processed audio is kept in memory and handed as is to the conditioning step.
         """
         try:
-            temp_dir = Path("/tmp/auralis")
-            temp_dir.mkdir(exist_ok=True)
-            if isinstance(audio_source, str):
-                audio_source = Path(audio_source)
-                audio, sr = librosa.load(audio_source, sr=self.audio_config.sample_rate)
-            else:
-                audio, sr = librosa.load(io.BytesIO(audio_source), sr=self.audio_config.sample_rate)
-            processed = self.processor.process(audio)
-
-            output_path = temp_dir / (f"{hash(audio_source) if isinstance(audio_source, bytes) else audio_source.stem}"
-                                      f"{uuid.uuid4().hex}"
-                                      f"{'.wav' if isinstance(audio_source, bytes) else audio_source.suffix}")
-            sf.write(output_path, processed, sr)
-            return str(output_path)
+            cache_key = EnhancementCache.make_key(
+                audio_ingestor.content_hash(audio_source), audio_config.config_hash()
+            )
+            processed = enhancement_cache.get(cache_key)
+            if processed is None:
+                audio = audio_ingestor.load(audio_source, audio_config.sample_rate).squeeze(0)
+                # the processor comes from the same config as the key
+                processed = get_audio_processor(audio_config).process(audio)
+                enhancement_cache.put(cache_key, processed)
+            return processed, audio_config.sample_rate
 
         except Exception as e:
-            print(f"Error processing audio: {e}. Using original file.")
+            logger.warning(f"Error processing audio: {e}. Using original file.")
             return audio_source
 
     def copy(self):
@@ -259,6 +296,7 @@ class TTSRequest:
             'enhance_speech': self.enhance_speech,
             'audio_config': self.audio_config,
             'language': self.language,
+            'per_chunk_language': self.per_chunk_language,
             'request_id': self.request_id,
             'load_sample_rate': self.load_sample_rate,
             'sound_norm_refs': self.sound_norm_refs,
@@ -274,4 +312,6 @@ class TTSRequest:
             'do_sample': self.do_sample
         }
 
-        return TTSRequest(**copy_fields)
+        request_copy = TTSRequest(**copy_fields)
+        request_copy.speaker_files_enhanced = self.speaker_files_enhanced
+        return request_copy
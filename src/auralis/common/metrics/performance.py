@@ -1,7 +1,9 @@
+import threading
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from functools import wraps
-from typing import TypeVar, AsyncGenerator, Callable, Any
+from typing import TypeVar, AsyncGenerator, Callable, Any, Dict, Iterator
 from auralis.common.logging.logger import setup_logger
 
 
@@ -23,6 +25,9 @@ class TTSMetricsTracker:
         window_tokens (int): Total tokens processed in current window.
         window_audio_seconds (float): Total audio seconds generated in window.
         window_requests (int): Total requests processed in window.
+        window_stage_seconds (Dict[str, float]): Time spent in each preprocessing stage in window.
+        window_stage_calls (Dict[str, int]): Number of runs of each preprocessing stage in window.
+        limiters (Dict[str, AdaptiveLimiter]): Adaptive concurrency limiters, by stage name.
     """
 
     logger = setup_logger(__file__)
@@ -34,6 +39,10 @@ class TTSMetricsTracker:
     window_tokens: int = 0
     window_audio_seconds: float = 0
     window_requests: int = 0
+    window_stage_seconds: Dict[str, float] = field(default_factory=dict)
+    window_stage_calls: Dict[str, int] = field(default_factory=dict)
+    limiters: Dict[str, Any] = field(default_factory=dict)
+    _stage_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
 
     @property
     def requests_per_second(self) -> float:
@@ -65,6 +74,56 @@ class TTSMetricsTracker:
         elapsed = (time.time() - self.window_start) * 1000  # in ms
         return elapsed / self.window_audio_seconds if self.window_audio_seconds > 0 else 0
 
+    def record_stage(self, stage: str, seconds: float) -> None:
+        """Record the duration of a preprocessing stage.
+
+        Stages may run in worker threads, hence the lock.
+
+        Args:
+            stage (str): Stage name.
+            seconds (float): Time spent in the stage.
+        """
+        with self._stage_lock:
+            self.window_stage_seconds[stage] = self.window_stage_seconds.get(stage, 0.0) + seconds
+            self.window_stage_calls[stage] = self.window_stage_calls.get(stage, 0) + 1
+
+    @property
+    def stage_summary(self) -> str:
+        """Average duration of each stage in the current window.
+
+        Returns:
+            str: Summary like ``language_detection 1.2ms, enhancement 40.1ms``.
+        """
+        with self._stage_lock:
+            return ", ".join(
+                f"{stage} {seconds / self.window_stage_calls[stage] * 1000:.1f}ms"
+                for stage, seconds in self.window_stage_seconds.items()
+            )
+
+    def register_limiter(self, limiter: Any) -> None:
+        """Report the state of a concurrency limiter with the other metrics.
+
+        Args:
+            limiter (AdaptiveLimiter): Limiter, replacing any previous one with the same name.
+        """
+        self.limiters[limiter.name] = limiter
+
+    @property
+    def limiter_summary(self) -> str:
+        """Current limit and load of each registered limiter.
+
+        Returns:
+            str: Summary like ``vocoder 3 (3 running, 2 waiting, 41.0ms/unit)``.
+        """
+        summaries = []
+        for name, limiter in self.limiters.items():
+            stats = limiter.stats
+            summaries.append(
+                f"{name} {stats['limit']:.0f} ({stats['in_flight']:.0f} running, {stats['waiting']:.0f} waiting, "
+                f"{stats['latency'] * 1000:.1f}ms/unit)"
+            )
+        return ", ".join(summaries)
+
     def reset_window(self) -> None:
         """Reset all metrics for a new window.
         
@@ -78,6 +137,9 @@ class TTSMetricsTracker:
         self.window_tokens = 0
         self.window_audio_seconds = 0
         self.window_requests = 0
+        with self._stage_lock:
+            self.window_stage_seconds = {}
+            self.window_stage_calls = {}
 
     def update_metrics(self, tokens: int, audio_seconds: float) -> bool:
         """Update metrics with new generation results.
@@ -102,6 +164,24 @@ class TTSMetricsTracker:
 metrics = TTSMetricsTracker()
 
 
+@contextmanager
+def track_stage(stage: str) -> Iterator[None]:
+    """Time a block of code as a preprocessing stage in the global metrics.
+
+    Args:
+        stage (str): Stage name.
+
+    Example:
+        >>> with track_stage('language_detection'):
+        ...     request.infer_language()
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record_stage(stage, time.perf_counter() - start)
+
+
 def track_generation(func: Callable[..., AsyncGenerator[T, None]]) -> Callable[..., AsyncGenerator[T, None]]:
     """Decorator to track TTS generation performance metrics.
 
@@ -139,11 +219,15 @@ def track_generation(func: Callable[..., AsyncGenerator[T, None]]) -> Callable[.
                 audio_seconds = output.array.shape[0] / output.sample_rate
 
                 if metrics.update_metrics(output.token_length, audio_seconds):
+                    stages = metrics.stage_summary
+                    limits = metrics.limiter_summary
                     metrics.logger.info(
                         f"Generation metrics | "
                         f"Throughput: {metrics.requests_per_second:.2f} req/s | "
                         f"{metrics.tokens_per_second:.1f} tokens/s | "
                         f"Latency: {metrics.ms_per_second_of_audio:.0f}ms per second of audio generated"
+                        f"{f' | Stages: {stages}' if stages else ''}"
+                        f"{f' | Limits: {limits}' if limits else ''}"
                     )
                     metrics.reset_window()
             yield output
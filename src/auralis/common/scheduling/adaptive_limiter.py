@@ -0,0 +1,187 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class _Permit:
+    """Async context manager holding one slot of a limiter for a call."""
+
+    __slots__ = ('limiter', 'work', 'start', 'epoch')
+
+    def __init__(self, limiter: 'AdaptiveLimiter', work: float):
+        self.limiter = limiter
+        self.work = work
+        self.start = 0.0
+        self.epoch = 0
+
+    async def __aenter__(self):
+        await self.limiter._acquire()
+        self.start = time.perf_counter()
+        self.epoch = self.limiter.epoch
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.limiter._release(time.perf_counter() - self.start, self.work, self.epoch, failed=exc_type is not None)
+
+
+class AdaptiveLimiter:
+    """Concurrency limit of a stage, adapted to the latency of its calls (AIMD).
+
+    Used like a semaphore, ``async with limiter.acquire(work):``, where ``work`` is the
+    amount of work of the call: the latency is compared per unit of work, so long and
+    short calls can be mixed. Every ``window`` calls the mean latency is compared to the
+    best one seen: while it stays within ``tolerance`` of it and the calls actually used
+    the whole limit, the limit grows by one; once the latency climbs past it, running more
+    calls at once only queues them on the device, and the limit is multiplied by ``backoff``.
+
+    Only the calls started under the current limit count for the next adjustment, the
+    ones still running from before would blur the effect of the change.
+
+    The best latency is only known from calls that didn't queue on the device, so the
+    first window and then one window every ``probe_interval`` run at ``min_limit`` to
+    measure it again. In between it slowly drifts up (``baseline_drift`` per window), so a
+    baseline measured on an idle device doesn't pin the limit down forever.
+    """
+
+    def __init__(self,
+                 name: str,
+                 initial_limit: int,
+                 max_limit: int,
+                 min_limit: int = 1,
+                 window: int = 8,
+                 tolerance: float = 1.3,
+                 backoff: float = 0.75,
+                 baseline_drift: float = 0.01,
+                 probe_interval: int = 32):
+        """Initialize the limiter.
+
+        Args:
+            name (str): Stage name, used in the metrics.
+            initial_limit (int): Starting limit.
+            max_limit (int): Highest limit, for instance the calls the memory can hold.
+            min_limit (int, optional): Lowest limit. Defaults to 1.
+            window (int, optional): Calls per adjustment. Defaults to 8.
+            tolerance (float, optional): Latency ratio over the baseline still considered flat. Defaults to 1.3.
+            backoff (float, optional): Limit factor when the latency climbs. Defaults to 0.75.
+            baseline_drift (float, optional): Relative increase of the baseline per window. Defaults to 0.01.
+            probe_interval (int, optional): Windows between two baseline probes, 0 disables
+                them after the first one. Defaults to 32.
+        """
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= max_limit")
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.window = window
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.baseline_drift = baseline_drift
+        self.probe_interval = probe_interval
+        # the first window measures the baseline, then the limit goes to initial_limit
+        self.limit = min_limit
+        self._probe_return: Optional[int] = min(max(initial_limit, min_limit), max_limit)
+        self._windows = 0
+
+        self.in_flight = 0
+        self.epoch = 0  # bumped at every limit change
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.baseline: Optional[float] = None  # best latency per unit of work
+        self.latency: Optional[float] = None  # latency per unit of work of the last window
+        self._window_seconds = 0.0
+        self._window_work = 0.0
+        self._window_calls = 0
+        self._window_saturated = False
+
+    def acquire(self, work: float = 1.0) -> _Permit:
+        """Hold a slot for a call.
+
+        Args:
+            work (float, optional): Amount of work of the call (tokens, seconds of audio...). Defaults to 1.0.
+
+        Returns:
+            _Permit: Async context manager holding the slot.
+        """
+        return _Permit(self, max(work, 1e-9))
+
+    async def _acquire(self):
+        if self.in_flight < self.limit and not self.waiters:
+            self._take()
+            return
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was handed over right before the cancellation, pass it on
+                self.in_flight -= 1
+                self._wake()
+            else:
+                self.waiters.remove(future)
+            raise
+
+    def _take(self):
+        self.in_flight += 1
+        if self.in_flight >= self.limit:
+            self._window_saturated = True
+
+    def _wake(self):
+        while self.waiters and self.in_flight < self.limit:
+            future = self.waiters.popleft()
+            if not future.done():
+                self._take()
+                future.set_result(None)
+
+    def _release(self, seconds: float, work: float, epoch: int, failed: bool = False):
+        self.in_flight -= 1
+        if not failed and epoch == self.epoch:
+            self._window_seconds += seconds
+            self._window_work += work
+            self._window_calls += 1
+            if self._window_calls >= self.window:
+                self._adjust()
+        self._wake()
+
+    def _adjust(self):
+        latency = self._window_seconds / self._window_work
+        saturated = self._window_saturated or bool(self.waiters)
+        self._window_seconds = self._window_work = 0.0
+        self._window_calls = 0
+        self._window_saturated = self.in_flight >= self.limit
+
+        self.latency = latency
+        if self.baseline is None:
+            self.baseline = latency
+        else:
+            self.baseline = min(self.baseline * (1.0 + self.baseline_drift), latency)
+        self._windows += 1
+
+        if self._probe_return is not None:
+            limit, self._probe_return = self._probe_return, None
+        elif self.probe_interval and self._windows % self.probe_interval == 0 and self.limit > self.min_limit:
+            limit, self._probe_return = self.min_limit, self.limit
+        elif latency > self.baseline * self.tolerance:
+            limit = max(self.min_limit, int(self.limit * self.backoff))
+        elif saturated:
+            limit = min(self.max_limit, self.limit + 1)
+        else:
+            return
+        if limit != self.limit:
+            self.limit = limit
+            self.epoch += 1
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Current state of the limiter.
+
+        Returns:
+            Dict[str, float]: Limit, calls in flight and waiting, latency and baseline per unit of work.
+        """
+        return {
+            'limit': self.limit,
+            'in_flight': self.in_flight,
+            'waiting': len(self.waiters),
+            'latency': self.latency or 0.0,
+            'baseline': self.baseline or 0.0,
+        }
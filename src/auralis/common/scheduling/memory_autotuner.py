@@ -0,0 +1,237 @@
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import torch
+
+from auralis.common.logging.logger import setup_logger
+
+# Bump when what a profile measures changes, so stale profiles are measured again
+MEMORY_PROFILE_VERSION = 1
+
+# Device index -> (free bytes, total bytes), like torch.cuda.mem_get_info
+MemoryInfoProvider = Callable[[int], Tuple[int, int]]
+
+
+def default_profile_dir() -> Path:
+    """Get the default location of the memory profiles.
+
+    ``AURALIS_CACHE_DIR`` takes precedence, then ``XDG_CACHE_HOME`` and finally ``~/.cache``.
+
+    Returns:
+        Path: Directory the profiles are stored in.
+    """
+    if cache_dir := os.environ.get('AURALIS_CACHE_DIR'):
+        return Path(cache_dir) / 'memory_profiles'
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'auralis' / 'memory_profiles'
+
+
+@dataclass
+class MemoryProfile:
+    """Memory a model needs on a device, in bytes.
+
+    Attributes:
+        device_name (str): Device the profile was measured on.
+        model_bytes (int): Weights of the modules living outside of the vLLM engine.
+        engine_bytes (int): Weights of the vLLM model.
+        sequence_bytes (int): KV cache and activations of one full length sequence in the engine.
+        vocoder_base_bytes (int): Vocoder workspace, whatever the concurrency.
+        vocoder_bytes_per_call (int): Vocoder activations of each concurrent call.
+        conditioning_base_bytes (int): Conditioning workspace, whatever the concurrency.
+        conditioning_bytes_per_call (int): Conditioning activations of each concurrent call.
+        version (int): Profile format version.
+    """
+    device_name: str
+    model_bytes: int
+    engine_bytes: int
+    sequence_bytes: int
+    vocoder_base_bytes: int
+    vocoder_bytes_per_call: int
+    conditioning_base_bytes: int
+    conditioning_bytes_per_call: int
+    version: int = MEMORY_PROFILE_VERSION
+
+
+@dataclass
+class MemoryPlan:
+    """Engine settings derived from a memory profile.
+
+    Attributes:
+        device_index (int): Device the plan was made for.
+        max_num_seqs (int): Sequences the vLLM engine runs at once.
+        gpu_memory_utilization (float): Fraction of the device memory given to the vLLM engine.
+        semaphore_concurrency (int): Concurrent conditioning and vocoder calls to start with.
+        max_concurrent_calls (int): Concurrent conditioning and vocoder calls the memory can hold.
+        engine_bytes (int): Memory the vLLM engine takes.
+    """
+    device_index: int
+    max_num_seqs: int
+    gpu_memory_utilization: float
+    semaphore_concurrency: int
+    max_concurrent_calls: int
+    engine_bytes: int
+
+
+class MemoryAutotuner:
+    """Sizes the engine from measured memory costs instead of a fixed curve.
+
+    A model measures its memory costs once per device (see ``fit_linear`` for the parts
+    whose memory grows with the concurrency), the profile is stored on disk and reused by
+    the next starts. ``plan`` then fits as many sequences as the free memory allows, up
+    to the requested concurrency, keeping room for the vocoder and conditioning calls
+    running next to the vLLM engine.
+
+    The memory info provider can be replaced, so the planning runs without a GPU.
+    """
+
+    def __init__(self,
+                 profile_dir: Optional[Union[str, Path]] = None,
+                 memory_info: Optional[MemoryInfoProvider] = None,
+                 device_count: Optional[Callable[[], int]] = None,
+                 headroom: float = 0.05):
+        """Initialize the autotuner.
+
+        Args:
+            profile_dir (Optional[Union[str, Path]], optional): Profile location. Defaults to ``default_profile_dir()``.
+            memory_info (Optional[MemoryInfoProvider], optional): Free and total memory of a device.
+                Defaults to ``torch.cuda.mem_get_info``.
+            device_count (Optional[Callable[[], int]], optional): Number of devices.
+                Defaults to ``torch.cuda.device_count``.
+            headroom (float, optional): Fraction of the device memory left unplanned, for
+                fragmentation and the CUDA context of other libraries. Defaults to 0.05.
+        """
+        self.logger = setup_logger(__file__)
+        self.profile_dir = Path(profile_dir) if profile_dir is not None else default_profile_dir()
+        self.memory_info = memory_info or torch.cuda.mem_get_info
+        self.device_count = device_count or torch.cuda.device_count
+        self.headroom = headroom
+
+    def _path(self, profile_key: str) -> Path:
+        return self.profile_dir / f"{profile_key}.json"
+
+    def load(self, profile_key: str) -> Optional[MemoryProfile]:
+        """Load a stored profile.
+
+        Args:
+            profile_key (str): Model and device the profile is for.
+
+        Returns:
+            Optional[MemoryProfile]: The profile, None if missing, unreadable or outdated.
+        """
+        path = self._path(profile_key)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            profile = MemoryProfile(**{field.name: data[field.name] for field in fields(MemoryProfile)})
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Discarding unreadable memory profile {path.name}: {e}")
+            return None
+        return profile if profile.version == MEMORY_PROFILE_VERSION else None
+
+    def save(self, profile_key: str, profile: MemoryProfile):
+        """Store a profile atomically.
+
+        Args:
+            profile_key (str): Model and device the profile is for.
+            profile (MemoryProfile): Measured profile.
+        """
+        try:
+            self.profile_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.profile_dir, prefix=f".{profile_key}.", suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(asdict(profile), f, indent=2)
+                os.replace(tmp_path, self._path(profile_key))
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            self.logger.warning(f"Could not write memory profile: {e}")
+
+    def load_or_measure(self, profile_key: str, measure: Callable[[], MemoryProfile]) -> MemoryProfile:
+        """Load the profile of a model, measuring and storing it the first time.
+
+        Args:
+            profile_key (str): Model and device the profile is for.
+            measure (Callable[[], MemoryProfile]): Measures the profile.
+
+        Returns:
+            MemoryProfile: The profile.
+        """
+        profile = self.load(profile_key)
+        if profile is None:
+            self.logger.info(f"Measuring the memory profile {profile_key}")
+            profile = measure()
+            self.save(profile_key, profile)
+        return profile
+
+    @staticmethod
+    def fit_linear(measure_peak: Callable[[int], int], concurrencies: Sequence[int] = (1, 2, 4)) -> Tuple[int, int]:
+        """Fit the peak memory of a workload run at a few concurrencies.
+
+        Args:
+            measure_peak (Callable[[int], int]): Peak bytes of the workload at a concurrency.
+            concurrencies (Sequence[int], optional): Concurrencies measured. Defaults to (1, 2, 4).
+
+        Returns:
+            Tuple[int, int]: Base bytes and bytes per concurrent call, never negative.
+        """
+        peaks = [measure_peak(concurrency) for concurrency in concurrencies]
+        if len(set(concurrencies)) < 2:
+            return 0, max(peaks) // max(concurrencies)
+        per_call, base = np.polyfit(np.asarray(concurrencies, dtype=np.float64), np.asarray(peaks, dtype=np.float64), 1)
+        per_call = max(int(round(per_call)), 0)
+        # the fit may undershoot a measurement, the base covers the largest miss
+        base = max(int(np.ceil(max(peak - per_call * c for peak, c in zip(peaks, concurrencies)))), 0)
+        return base, per_call
+
+    def plan(self, profile: MemoryProfile, max_concurrency: int, tensor_parallel_size: int = 1) -> MemoryPlan:
+        """Derive the engine settings of the first device with room for at least one sequence.
+
+        Args:
+            profile (MemoryProfile): Memory costs of the model.
+            max_concurrency (int): Requested concurrency, the most sequences planned.
+            tensor_parallel_size (int, optional): Tensor parallel partitions. Defaults to 1.
+
+        Returns:
+            MemoryPlan: The settings.
+
+        Raises:
+            RuntimeError: If no device has room for the model and one sequence.
+        """
+        call_bytes = profile.vocoder_bytes_per_call + profile.conditioning_bytes_per_call
+        for device_index in range(self.device_count()):
+            free_memory, total_memory = self.memory_info(device_index)
+            budget = (free_memory - int(self.headroom * total_memory) - profile.model_bytes
+                      - profile.engine_bytes - profile.vocoder_base_bytes - profile.conditioning_base_bytes)
+            # the most sequences that fit next to a single conditioning and vocoder call
+            max_num_seqs = min(max_concurrency, (budget - call_bytes) // max(profile.sequence_bytes, 1))
+            if max_num_seqs < 1:
+                continue
+
+            # then as many concurrent calls as fit in what is left, up to the usual ratio
+            spare_calls = (budget - max_num_seqs * profile.sequence_bytes) // max(call_bytes, 1)
+            semaphore_concurrency = max(1, min(max(1, max_num_seqs // 6) * tensor_parallel_size, spare_calls))
+
+            engine_bytes = profile.engine_bytes + max_num_seqs * profile.sequence_bytes
+            plan = MemoryPlan(
+                device_index=device_index,
+                max_num_seqs=int(max_num_seqs),
+                # vLLM counts the memory already in use against its fraction
+                gpu_memory_utilization=(total_memory - free_memory + engine_bytes) / total_memory,
+                semaphore_concurrency=int(semaphore_concurrency),
+                max_concurrent_calls=int(max(1, spare_calls)),
+                engine_bytes=engine_bytes,
+            )
+            if max_num_seqs < max_concurrency:
+                self.logger.warning(f"Only {max_num_seqs} of the {max_concurrency} concurrent sequences "
+                                    f"fit in the memory of device {device_index}")
+            return plan
+        raise RuntimeError("Could not find the memory usage for the VLLM model initialization.")
@@ -0,0 +1,99 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+from auralis.common.logging.logger import setup_logger
+
+
+class MicroBatcher:
+    """Coalesce concurrent calls into batched calls of a synchronous function.
+
+    Requests arriving together (e.g. a burst of TTS requests) each need their own
+    small CPU-bound call, like tokenizing one text. Items submitted within ``max_wait``
+    of each other are grouped, up to ``max_batch_size``, and handed to ``batch_fn`` in a
+    single call run off the event loop; every caller then gets its own result back.
+
+    Batches run one at a time in a dedicated thread, so ``batch_fn`` never runs
+    concurrently with itself.
+
+    Attributes:
+        max_batch_size (int): Maximum items per batch call.
+        max_wait (float): Seconds the first item of a batch waits for more items.
+    """
+
+    def __init__(self,
+                 batch_fn: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 32,
+                 max_wait: float = 0.002,
+                 thread_name_prefix: str = "auralis-batcher"):
+        """Initialize the batcher.
+
+        Args:
+            batch_fn (Callable[[List[Any]], List[Any]]): Function returning one result per item, in order.
+            max_batch_size (int, optional): Maximum items per batch call. Defaults to 32.
+            max_wait (float, optional): Seconds to wait for more items. Defaults to 0.002.
+            thread_name_prefix (str, optional): Name of the batch thread. Defaults to "auralis-batcher".
+        """
+        self.logger = setup_logger(__file__)
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name_prefix)
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Add an item to the next batch and wait for its result.
+
+        Args:
+            item (Any): Input of ``batch_fn``.
+
+        Returns:
+            Any: Result of the item.
+
+        Raises:
+            Exception: Whatever ``batch_fn`` raised for the batch of the item.
+            ValueError: If ``batch_fn`` did not return one result per item.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            # Keep a reference until done, the event loop only holds weak ones
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in batch]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self._executor, self.batch_fn, items)
+            if len(results) != len(items):
+                # zip would leave the callers past the shortest side waiting forever
+                raise ValueError(f"batch_fn returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            self.logger.error(f"Batch of {len(items)} items failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            # The caller may have been cancelled in the meantime
+            if not future.done():
+                future.set_result(result)
+
+    def shutdown(self):
+        """Stop the batch thread."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,88 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from auralis.common.definitions.requests import TTSRequest
+from auralis.common.logging.logger import setup_logger
+from auralis.common.metrics.performance import track_stage
+
+T = TypeVar('T')
+
+
+class RequestPreprocessor:
+    """Runs the CPU heavy request preparation stages of phase 1 off the event loop.
+
+    Language detection and speech enhancement used to run synchronously in the
+    ``TTSRequest`` constructor, blocking every other stream served by the loop. Here they
+    run as async stages in a dedicated thread pool, each limited by its own semaphore so a
+    burst of enhancement work can't starve language detection (or the other way around).
+    Every stage is timed in the global metrics.
+
+    Attributes:
+        executor (ThreadPoolExecutor): Pool the stages run in.
+    """
+
+    def __init__(self, language_detection_concurrency: int = 4, enhancement_concurrency: int = 2):
+        """Initialize the preprocessor.
+
+        Args:
+            language_detection_concurrency (int, optional): Maximum concurrent language detections. Defaults to 4.
+            enhancement_concurrency (int, optional): Maximum concurrent reference enhancements. Defaults to 2.
+        """
+        self.logger = setup_logger(__file__)
+        self.executor = ThreadPoolExecutor(
+            max_workers=language_detection_concurrency + enhancement_concurrency,
+            thread_name_prefix="auralis-preprocess"
+        )
+        self.language_semaphore = asyncio.Semaphore(language_detection_concurrency)
+        self.enhancement_semaphore = asyncio.Semaphore(enhancement_concurrency)
+
+    async def _run_stage(self, stage: str, semaphore: asyncio.Semaphore, fn: Callable[[], T]) -> T:
+        async with semaphore:
+            loop = asyncio.get_running_loop()
+
+            def timed():
+                with track_stage(stage):
+                    return fn()
+
+            return await loop.run_in_executor(self.executor, timed)
+
+    async def detect_language(self, request: TTSRequest) -> None:
+        """Resolve ``language='auto'`` for a request.
+
+        Args:
+            request (TTSRequest): Request to update in place.
+        """
+        if request.needs_language_detection:
+            await self._run_stage('language_detection', self.language_semaphore, request.infer_language)
+
+    async def enhance_speaker_files(self, request: TTSRequest) -> None:
+        """Enhance the reference audio of a request, all the references concurrently.
+
+        Args:
+            request (TTSRequest): Request to update in place.
+        """
+        if not request.needs_enhancement:
+            return
+        enhanced = await asyncio.gather(*[
+            self._run_stage(
+                'enhancement',
+                self.enhancement_semaphore,
+                lambda source=source: request.preprocess_audio(source, request.audio_config)
+            )
+            for source in request.speaker_files
+        ])
+        request.speaker_files = list(enhanced)
+        request.speaker_files_enhanced = True
+
+    async def prepare(self, request: TTSRequest) -> None:
+        """Run all the stages a request needs, concurrently.
+
+        Args:
+            request (TTSRequest): Request to update in place.
+        """
+        await asyncio.gather(self.detect_language(request), self.enhance_speaker_files(request))
+
+    def shutdown(self):
+        """Shut down the stage pool."""
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,202 @@
+import asyncio
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncGenerator, Callable, List, Optional
+
+from auralis.common.logging.logger import setup_logger
+
+# Tokenizer of the current worker process, built once by the pool initializer
+_worker_tokenizer = None
+
+
+def _init_worker(tokenizer_factory: Callable):
+    global _worker_tokenizer
+    _worker_tokenizer = tokenizer_factory()
+
+
+def _prepare_shard(text: str, language: str, per_chunk_language: bool) -> List[List[int]]:
+    """Split, clean and tokenize a shard of text in a worker process.
+
+    Args:
+        text (str): Shard of the document.
+        language (str): Language of the document.
+        per_chunk_language (bool): Detect the language of every chunk.
+
+    Returns:
+        List[List[int]]: Token IDs of each chunk, without special tokens.
+    """
+    chunks = _worker_tokenizer.split_text(text, language)
+    if per_chunk_language:
+        from auralis.common.definitions.requests import detect_languages
+        languages = detect_languages(chunks, language)
+    else:
+        languages = [language] * len(chunks)
+    return _worker_tokenizer(chunks, lang=languages, add_special_tokens=False, padding=False)['input_ids']
+
+
+def shard_text(text: str, shard_chars: int) -> List[str]:
+    """Cut a document into shards of about ``shard_chars`` characters.
+
+    Shards end on a paragraph break when there is one, otherwise on a sentence end or
+    a space, so the sentence splitting of each shard matches the one of the whole text
+    everywhere but (at worst) around the shard boundaries.
+
+    Args:
+        text (str): Document to cut.
+        shard_chars (int): Target shard size.
+
+    Returns:
+        List[str]: Non-empty shards, in order.
+    """
+    shards = []
+    start = 0
+    while len(text) - start > shard_chars:
+        end = start + shard_chars
+        # Look for a break in the second half of the shard, strongest first
+        for separator in ("\n\n", "\n", ". ", " "):
+            cut = text.rfind(separator, start + shard_chars // 2, end)
+            if cut != -1:
+                end = cut + len(separator)
+                break
+        if shard := text[start:end].strip():
+            shards.append(shard)
+        start = end
+    if shard := text[start:].strip():
+        shards.append(shard)
+    return shards
+
+
+class TextPreparationPool:
+    """Process pool running the text preparation of long documents.
+
+    Cleaning, transliteration, sentence splitting and tokenization are pure CPU work that
+    would otherwise block the event loop (and every other stream) for seconds on a long
+    document. The document is cut into shards that are prepared in worker processes, a
+    bounded number at a time, and the chunks come back in order as soon as each shard is
+    ready, so generation can start on the first chunk while later ones are still being
+    prepared.
+
+    The pool is opt-in (``max_workers=0`` disables it). Workers are spawned (not forked,
+    the parent holds CUDA and engine threads) on first use and each builds its own
+    tokenizer with ``tokenizer_factory``. A spawned worker imports the ``__main__`` module
+    of the parent again, so a script using the pool must create the engine under an
+    ``if __name__ == "__main__":`` guard, otherwise each worker loads the whole engine.
+
+    Attributes:
+        shard_chars (int): Size of the shards, texts up to this size aren't worth sending to the pool.
+        max_workers (int): Number of worker processes, 0 when the pool is disabled.
+    """
+
+    def __init__(self,
+                 tokenizer_factory: Callable,
+                 max_workers: int = 0,
+                 shard_chars: int = 20000,
+                 max_shards_in_flight: Optional[int] = None):
+        """Initialize the pool, workers are started lazily.
+
+        Args:
+            tokenizer_factory (Callable): Picklable callable building the tokenizer in a worker. The
+                tokenizer must provide ``split_text(text, lang)`` and the usual ``__call__``.
+            max_workers (int, optional): Worker processes, 0 disables the pool and None uses
+                min(4, cpu count). Defaults to 0.
+            shard_chars (int, optional): Target shard size. Defaults to 20000.
+            max_shards_in_flight (Optional[int], optional): Shards submitted ahead of the consumer
+                per document. Defaults to twice the workers.
+        """
+        self.logger = setup_logger(__file__)
+        self.tokenizer_factory = tokenizer_factory
+        self.max_workers = min(4, os.cpu_count() or 1) if max_workers is None else max_workers
+        self.shard_chars = shard_chars
+        self.max_shards_in_flight = max_shards_in_flight or 2 * max(self.max_workers, 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self.logger.info(f"Starting {self.max_workers} text preparation workers")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.tokenizer_factory,)
+            )
+        return self._executor
+
+    def should_use(self, text) -> bool:
+        """Whether a text is long enough to be prepared in the pool.
+
+        Args:
+            text: Request text.
+
+        Returns:
+            bool: True for strings longer than a shard, when the pool is enabled.
+        """
+        return self.max_workers > 0 and isinstance(text, str) and len(text) > self.shard_chars
+
+    async def stream(self,
+                     text: str,
+                     language: str,
+                     per_chunk_language: bool = False) -> AsyncGenerator[List[int], None]:
+        """Prepare a document in the pool, streaming the tokens of each chunk in order.
+
+        Args:
+            text (str): Document to prepare.
+            language (str): Language of the document.
+            per_chunk_language (bool, optional): Detect the language of every chunk. Defaults to False.
+
+        Yields:
+            List[int]: Token IDs of the next chunk, without special tokens.
+        """
+        batches = self.stream_batches(text, language, per_chunk_language)
+        try:
+            async for chunks in batches:
+                for chunk in chunks:
+                    yield chunk
+        finally:
+            await batches.aclose()
+
+    async def stream_batches(self,
+                             text: str,
+                             language: str,
+                             per_chunk_language: bool = False) -> AsyncGenerator[List[List[int]], None]:
+        """Prepare a document in the pool, streaming the tokens of the chunks of each shard in order.
+
+        Args:
+            text (str): Document to prepare.
+            language (str): Language of the document.
+            per_chunk_language (bool, optional): Detect the language of every chunk. Defaults to False.
+
+        Yields:
+            List[List[int]]: Token IDs of the chunks of the next shard, without special tokens.
+        """
+        loop = asyncio.get_running_loop()
+        shards = iter(shard_text(text, self.shard_chars))
+        pending = deque()
+
+        def submit_next():
+            shard = next(shards, None)
+            if shard is not None:
+                pending.append(loop.run_in_executor(
+                    self.executor, _prepare_shard, shard, language, per_chunk_language
+                ))
+
+        try:
+            for _ in range(self.max_shards_in_flight):
+                submit_next()
+            while pending:
+                chunks = await pending.popleft()
+                submit_next()
+                if chunks:
+                    yield chunks
+        finally:
+            # The consumer stopped early, don't keep the workers busy for nothing
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self):
+        """Stop the workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
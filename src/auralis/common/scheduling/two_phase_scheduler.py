@@ -1,5 +1,5 @@
 import uuid
-from typing import Any, Dict, AsyncGenerator, Callable, Awaitable, Optional
+from typing import Any, Dict, AsyncGenerator, AsyncIterable, Callable, Awaitable, Optional
 import asyncio
 import time
 from contextlib import asynccontextmanager
@@ -164,7 +164,9 @@ class TwoPhaseScheduler:
                 request.first_fn(request.input),
                 timeout=self.request_timeout
             )
-            request.generators_count = len(request.first_phase_result.get('parallel_inputs', []))
+            parallel_inputs = request.first_phase_result.get('parallel_inputs', [])
+            # Inputs streamed by an async iterator are counted as they arrive in phase 2
+            request.generators_count = 0 if isinstance(parallel_inputs, AsyncIterable) else len(parallel_inputs)
             # Initialize sequence_buffers here
             request.sequence_buffers = {i: [] for i in range(request.generators_count)}
             request.state = TaskState.PROCESSING_SECOND
@@ -175,7 +177,9 @@ class TwoPhaseScheduler:
         """Execute the second phase of request processing.
 
         This phase runs multiple generators in parallel, with controlled concurrency.
-        It manages the lifecycle of all parallel tasks and handles timeouts.
+        It manages the lifecycle of all parallel tasks and handles timeouts. The inputs
+        can also be an async iterator, each generator then starts as soon as its input
+        is produced.
 
         Args:
             request (QueuedRequest): Request to process.
@@ -184,21 +188,38 @@ class TwoPhaseScheduler:
             TimeoutError: If processing exceeds request_timeout.
         """
         parallel_inputs = request.first_phase_result.get('parallel_inputs', [])
-        generator_tasks = [
-            asyncio.create_task(self._process_generator(request, gen_input, idx))
-            for idx, gen_input in enumerate(parallel_inputs)
-        ]
+        generator_tasks = []
+
+        async def start_and_wait():
+            if isinstance(parallel_inputs, AsyncIterable):
+                idx = 0
+                async for gen_input in parallel_inputs:
+                    request.sequence_buffers[idx] = []
+                    generator_tasks.append(asyncio.create_task(self._process_generator(request, gen_input, idx)))
+                    idx += 1
+                    request.generators_count = idx
+            else:
+                generator_tasks.extend(
+                    asyncio.create_task(self._process_generator(request, gen_input, idx))
+                    for idx, gen_input in enumerate(parallel_inputs)
+                )
+            await asyncio.gather(*generator_tasks, return_exceptions=True)
 
         try:
-            await asyncio.wait_for(
-                asyncio.gather(*generator_tasks, return_exceptions=True),
-                timeout=self.request_timeout
-            )
+            await asyncio.wait_for(start_and_wait(), timeout=self.request_timeout)
         except asyncio.TimeoutError:
-            for task in generator_tasks:
-                if not task.done():
-                    task.cancel()
+            self._cancel_tasks(generator_tasks)
             raise TimeoutError(f"Second phase timeout after {self.request_timeout}s")
+        except Exception:
+            # Producing the inputs failed, stop the generators already started
+            self._cancel_tasks(generator_tasks)
+            raise
+
+    @staticmethod
+    def _cancel_tasks(tasks):
+        for task in tasks:
+            if not task.done():
+                task.cancel()
 
     async def _process_generator(
             self,
@@ -342,10 +363,12 @@ class TwoPhaseScheduler:
                         last_progress = time.time()
                     except asyncio.TimeoutError:
                         raise TimeoutError(f"Timeout waiting for item in sequence {current_index}")
+                    # a generator can yield several items (streamed audio), drain it first
+                    continue
 
-
+                if self._can_advance_sequence(request, current_index):
                     current_index += 1
-
+                    continue
 
             await asyncio.sleep(0.01)
 
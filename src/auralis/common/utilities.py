@@ -5,6 +5,8 @@ import torch
 import torchaudio
 import io
 
+from auralis.common.audio.ingest import audio_ingestor
+
 
 def wav_to_mel_cloning(
         wav,
@@ -71,31 +73,23 @@ def wav_to_mel_cloning(
     return mel
 
 
-def load_audio(audiopath, sampling_rate):
+def load_audio(audiopath, sampling_rate, max_length=None):
     """Load and preprocess audio file.
 
     This function loads an audio file, converts it to mono if needed,
     resamples to the target sampling rate, and ensures valid amplitude range.
+    Decoding goes through the shared [`AudioIngestor`][auralis.common.audio.ingest.AudioIngestor],
+    so resampling kernels and decoded audio are cached.
 
     Args:
-        audiopath (Union[str, Path]): Path to audio file.
+        audiopath (Union[str, Path, bytes]): Path to audio file or encoded audio bytes.
         sampling_rate (int): Target sampling rate.
+        max_length (float, optional): Seconds of audio to read. Defaults to None (everything).
 
     Returns:
         torch.Tensor: Preprocessed audio tensor of shape [1, samples].
     """
-    audio, lsr = torchaudio.load(audiopath)
-
-    # Stereo to mono if needed
-    if audio.size(0) != 1:
-        audio = torch.mean(audio, dim=0, keepdim=True)
-
-    if lsr != sampling_rate:
-        audio = torchaudio.functional.resample(audio, lsr, sampling_rate)
-
-    # Clip audio invalid values
-    audio.clip_(-1, 1)
-    return audio
+    return audio_ingestor.load(audiopath, sampling_rate, max_length)
 
 def load_fsspec(
     path: str,
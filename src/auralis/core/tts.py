@@ -14,6 +14,7 @@ from auralis.common.logging.logger import setup_logger, set_vllm_logging_level
 from auralis.common.definitions.output import TTSOutput
 from auralis.common.definitions.requests import TTSRequest
 from auralis.common.metrics.performance import track_generation
+from auralis.common.scheduling.request_preprocessor import RequestPreprocessor
 from auralis.common.scheduling.two_phase_scheduler import TwoPhaseScheduler
 from auralis.models.base import BaseAsyncTTSEngine, AudioOutputGenerator
 
@@ -24,16 +25,23 @@ class TTS:
     with support for streaming output and parallel processing of multiple requests.
     """
 
-    def __init__(self, scheduler_max_concurrency: int = 10, vllm_logging_level=logging.DEBUG):
+    def __init__(self,
+                 scheduler_max_concurrency: int = 10,
+                 vllm_logging_level=logging.DEBUG,
+                 language_detection_concurrency: int = 4,
+                 enhancement_concurrency: int = 2):
         """Initialize the TTS engine.
 
         Args:
             scheduler_max_concurrency (int): Maximum number of concurrent requests to process.
             vllm_logging_level: Logging level for the VLLM backend.
+            language_detection_concurrency (int): Maximum concurrent language detections.
+            enhancement_concurrency (int): Maximum concurrent reference audio enhancements.
         """
         set_vllm_logging_level(vllm_logging_level)
 
         self.scheduler: Optional[TwoPhaseScheduler] = TwoPhaseScheduler(scheduler_max_concurrency)
+        self.preprocessor = RequestPreprocessor(language_detection_concurrency, enhancement_concurrency)
         self.tts_engine: Optional[BaseAsyncTTSEngine] = None
         self.concurrency = scheduler_max_concurrency
         self.max_vllm_memory: Optional[int] = None
@@ -99,6 +107,7 @@ class TTS:
         """
         conditioning_config = self.tts_engine.conditioning_config
         if conditioning_config.speaker_embeddings or conditioning_config.gpt_like_decoder_conditioning:
+            await self.preprocessor.enhance_speaker_files(request)
             gpt_cond_latent, speaker_embeddings = await self.tts_engine.get_audio_conditioning(request.speaker_files)
             return partial(self.tts_engine.get_generation_context,
                            gpt_cond_latent=gpt_cond_latent,
@@ -115,6 +124,14 @@ class TTS:
         """
         conditioning_config = self.tts_engine.conditioning_config
         input_request.start_time = time.time()
+        # Language detection and enhancement, off the event loop
+        await self.preprocessor.prepare(input_request)
+        if self.tts_engine.streams_text_preparation(input_request):
+            # Long text: chunks are handed to phase 2 as soon as they are prepared
+            return {
+                'parallel_inputs': self._iter_parallel_inputs(input_request),
+                'request': input_request
+            }
         if input_request.context_partial_function:
             (audio_token_generators, requests_ids,
              speaker_embeddings,
@@ -157,6 +174,23 @@ class TTS:
             'request': input_request
         }
 
+    async def _iter_parallel_inputs(self, input_request: TTSRequest) -> AsyncGenerator[Dict, None]:
+        """Build the phase 2 inputs of a request one text chunk at a time.
+
+        Args:
+            input_request (TTSRequest): The TTS request to process.
+
+        Yields:
+            Dict: Generator and conditioning of the next chunk.
+        """
+        async for gen, _, speaker_embedding, multimodal_data in self.tts_engine.iter_generation_context(input_request):
+            yield {
+                'generator': gen,
+                'speaker_embedding': speaker_embedding,
+                'multimodal_data': multimodal_data,
+                'request': input_request,
+            }
+
     async def _process_single_generator(self, gen_input: Dict) -> AudioOutputGenerator:
         """Process a single generator to produce speech output.
 
@@ -358,5 +392,6 @@ class TTS:
         """Shuts down the TTS engine and scheduler."""
         if self.scheduler:
             await self.scheduler.shutdown()
+        self.preprocessor.shutdown()
         if self.tts_engine and hasattr(self.tts_engine, 'shutdown'):
             await self.tts_engine.shutdown()
\ No newline at end of file
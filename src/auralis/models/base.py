@@ -3,12 +3,12 @@ from pathlib import Path
 from typing import AsyncGenerator, List, Union, Tuple, Optional
 
 import torch
-import torchaudio
 from dataclasses import dataclass
 
 from pynvml import nvmlInit, nvmlDeviceGetHandleByIndex, nvmlDeviceGetMemoryInfo, nvmlDeviceGetCount
 from vllm import RequestOutput
 
+from auralis.common.audio.ingest import audio_ingestor
 from auralis.common.definitions.output import TTSOutput
 from auralis.common.definitions.requests import TTSRequest
 
@@ -42,6 +42,14 @@ TokenGeneratorsAndPossiblyConditioning = Union[
     RequestsIds
     ]
 
+# Generation context of a single text chunk: token generator, request id and the conditioning of the chunk
+GenerationContextItem = Tuple[
+    AudioTokenGenerator,
+    str,
+    Optional[SpeakerEmbeddings],
+    Optional[GPTLikeDecoderConditioning]
+]
+
 @dataclass
 class ConditioningConfig:
     """Conditioning configuration for the model.
@@ -87,6 +95,35 @@ class BaseAsyncTTSEngine(ABC, torch.nn.Module):
         """
         raise NotImplementedError
 
+    def streams_text_preparation(self, request: TTSRequest) -> bool:
+        """Whether the generation context of a request is produced chunk by chunk.
+
+        Engines that can prepare long texts incrementally override this together with
+        ``iter_generation_context``.
+
+        Args:
+            request (TTSRequest): The TTS request.
+
+        Returns:
+            bool: True to use ``iter_generation_context`` instead of ``get_generation_context``.
+        """
+        return False
+
+    async def iter_generation_context(self, request: TTSRequest) -> AsyncGenerator[GenerationContextItem, None]:
+        """Get the generation context one text chunk at a time.
+
+        Args:
+            request (TTSRequest): The TTS request containing input text and optional speaker files.
+
+        Yields:
+            GenerationContextItem: Token generator, request id and conditioning of each chunk, in order.
+
+        Raises:
+            NotImplementedError: If the engine doesn't stream its text preparation.
+        """
+        raise NotImplementedError
+        yield
+
     @abstractmethod
     async def process_tokens_to_speech(
             self,
@@ -210,15 +247,22 @@ class BaseAsyncTTSEngine(ABC, torch.nn.Module):
         Returns:
             torch.Tensor: Preprocessed audio tensor with shape (1, samples).
         """
-        audio, lsr = torchaudio.load(audio_path)
+        return audio_ingestor.load(audio_path, sampling_rate)
+
+    @staticmethod
+    async def load_audio_async(audio_path: Union[str, Path],
+                               sampling_rate: int = 22050,
+                               max_length: Optional[float] = None) -> torch.Tensor:
+        """Load and preprocess an audio file without blocking the event loop.
 
-        # Stereo to mono if needed
-        if audio.size(0) != 1:
-            audio = torch.mean(audio, dim=0, keepdim=True)
+        Decoding and resampling run in the shared audio ingestion pool.
 
-        if lsr != sampling_rate:
-            audio = torchaudio.functional.resample(audio, lsr, sampling_rate)
+        Args:
+            audio_path (Union[str, Path]): Path to the audio file.
+            sampling_rate (int, optional): Target sampling rate. Defaults to 22050.
+            max_length (Optional[float], optional): Seconds of audio to read. Defaults to None.
 
-        # Clip audio invalid values
-        audio.clip_(-1, 1)
-        return audio
\ No newline at end of file
+        Returns:
+            torch.Tensor: Preprocessed audio tensor with shape (1, samples).
+        """
+        return await audio_ingestor.load_async(audio_path, sampling_rate, max_length)
@@ -1,5 +1,8 @@
 import asyncio
 import functools
+import hashlib
+import itertools
+import json
 import time
 import uuid
 from contextlib import asynccontextmanager
@@ -9,9 +12,7 @@ from typing import Optional, List, Tuple, Union, AsyncGenerator
 from concurrent.futures import ThreadPoolExecutor
 
 import librosa
-import numpy as np
 import torch
-import torchaudio
 from torch import nn
 
 from vllm import AsyncLLMEngine, AsyncEngineArgs, TokensPrompt, RequestOutput
@@ -19,22 +20,31 @@ from vllm.multimodal import MultiModalDataDict
 from vllm.sampling_params import RequestOutputKind
 from vllm.utils import Counter
 
-from ..base import BaseAsyncTTSEngine, ConditioningConfig, TokenGeneratorsAndPossiblyConditioning
+from ..base import BaseAsyncTTSEngine, ConditioningConfig, TokenGeneratorsAndPossiblyConditioning, GenerationContextItem
 from ...common.logging.logger import setup_logger
+from ...common.metrics.performance import metrics
 from ...common.definitions.output import TTSOutput
-from ...common.definitions.requests import TTSRequest
-from ...common.utilities import wav_to_mel_cloning, load_audio
+from ...common.definitions.requests import TTSRequest, detect_languages, language_detection_executor
+from ...common.scheduling.adaptive_limiter import AdaptiveLimiter
+from ...common.scheduling.memory_autotuner import MemoryAutotuner, MemoryPlan, MemoryProfile
+from ...common.scheduling.micro_batcher import MicroBatcher
+from ...common.scheduling.text_preparation import TextPreparationPool
+from ...common.audio.ingest import AudioSource, audio_ingestor, is_in_memory_audio, resample
+from ...common.utilities import wav_to_mel_cloning
 
 from .components.vllm_mm_gpt import LearnedPositionEmbeddings
 from .config.tokenizer import XTTSTokenizerFast
 from .config.xttsv2_config import XTTSConfig
 from .config.xttsv2_gpt_config import XTTSGPTConfig
 
-from .components.vllm.hidden_state_collector import HiddenStatesCollector
-from .components.vllm.hijack import ExtendedSamplingParams, LogitsRepetitionPenalizer
+from .components.vllm.hidden_state_collector import HiddenStatesCollector, GenerationHiddenStatesBuffer
+from .components.vllm.hijack import ExtendedSamplingParams
+from .components.vllm.placeholders import conditioning_placeholder_ids, unique_placeholder_ids
 from .components.tts.layers.xtts.hifigan_decoder import HifiDecoder
 from .components.tts.layers.xtts.latent_encoder import ConditioningEncoder
 from .components.tts.layers.xtts.perceiver_encoder import PerceiverResampler
+from .components.tts.layers.xtts.text_conditioning import PackedTextEmbedder, merge_conditioning
+from .components.tts.layers.xtts.windowed_vocoder import WindowedVocoder
 
 class XTTSv2Engine(BaseAsyncTTSEngine):
     """Asynchronous XTTS model implementation using VLLM's AsyncEngine.
@@ -66,10 +76,31 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
             **kwargs: Additional arguments including:
                 - gpt_model: Path to the GPT model
                 - max_concurrency: Maximum number of concurrent requests
+                - chunking: "characters" (default) cuts chunks by the character limit of the language,
+                  "balanced" into chunks of about the same predicted audio duration
+                - language_detection_batch_size: Chunks detected at once in per-chunk language mode
+                - text_preparation_workers: Processes preparing long texts, 0 (default) prepares
+                  them in a thread. The workers are spawned, so the script creating the engine
+                  needs an ``if __name__ == "__main__":`` guard
+                - text_preparation_shard_chars: Texts longer than this are prepared in shards by the workers
+                - tokenization_batch_size: Maximum requests tokenized together
+                - tokenization_batch_wait: Seconds a request waits for others to be tokenized with
+                - capture_hidden_states: Keep the hidden states computed while generating as the
+                  vocoder input, instead of prefilling the generated tokens again once a chunk ends
+                - enable_prefix_caching: Compute the KV of a voice conditioning once and share it
+                  between all the sentences using that voice
+                - stream_window_tokens: Audio tokens vocoded at once for streamed requests, their
+                  audio then starts while the sentence is still generating. None (default) streams
+                  whole sentences
+                - stream_context_tokens: Tokens vocoded again on each side of the window seams
+                - memory_profile_dir: Where the measured memory profiles are stored
+                - text_embedding_cache_bytes: Budget of the cache of chunk text embeddings
+                - max_streamed_text_batch: Most chunks of a streamed text embedded together
         """
         super().__init__()
 
         self.max_gb_for_vllm_model = None
+        self.memory_plan: Optional[MemoryPlan] = None
 
         self.logger = setup_logger(__file__)
         self.logger.info("Initializing XTTSv2Engine...")
@@ -81,11 +112,42 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
         self.mel_eos_token_id = gpt_config.stop_audio_token
         self.tp = tensor_parallel_size
         self.pp = pipeline_parallel_size
-        self.tokenizer = XTTSTokenizerFast.from_pretrained(self.gpt_model)
+        # Text chunking: per-language character limits, or chunks balanced on predicted duration
+        tokenizer_kwargs = {
+            'chunking': kwargs.pop('chunking', 'characters'),
+            'max_text_tokens': gpt_config.max_text_tokens,
+        }
+        self.tokenizer = XTTSTokenizerFast.from_pretrained(self.gpt_model, **tokenizer_kwargs)
         self.request_counter = Counter()
+        # Chunks sent at once to the language detection pool in per-chunk language mode
+        self.language_detection_batch_size = kwargs.pop('language_detection_batch_size', 16)
+        # Long texts are prepared in worker processes, off the event loop
+        self.text_preparation = TextPreparationPool(
+            functools.partial(XTTSTokenizerFast.from_pretrained, self.gpt_model, **tokenizer_kwargs),
+            max_workers=kwargs.pop('text_preparation_workers', 0),
+            shard_chars=kwargs.pop('text_preparation_shard_chars', 20000)
+        )
+        # Requests arriving together are split and tokenized in one call
+        self.tokenization_batcher = MicroBatcher(
+            self._encode_documents,
+            max_batch_size=kwargs.pop('tokenization_batch_size', 32),
+            max_wait=kwargs.pop('tokenization_batch_wait', 0.002),
+            thread_name_prefix="auralis-tokenizer"
+        )
 
         self.max_concurrency = kwargs.pop('max_concurrency', 10)
-        semaphore_concurrency = max(1,self.max_concurrency // 6) * self.tp
+        # Vocoder inputs captured during generation, see get_model_logits for the two-pass path
+        self.capture_hidden_states = kwargs.pop('capture_hidden_states', False)
+        self.generation_states = GenerationHiddenStatesBuffer()
+        # Hidden states of the logits only requests, one collector for the whole engine
+        self.hidden_states_collector = HiddenStatesCollector()
+        # Prompts get placeholder ids identifying their conditioning, so vLLM can share its KV blocks
+        self.enable_prefix_caching = kwargs.pop('enable_prefix_caching', False)
+        # Streamed requests vocode windows of tokens as they are generated, see _stream_speech
+        self.stream_window_tokens = kwargs.pop('stream_window_tokens', None)
+        self.stream_context_tokens = kwargs.pop('stream_context_tokens', 8)
+        # Engine sizes come from the memory measured on the device, see get_memory_usage_curve
+        self.memory_autotuner = MemoryAutotuner(profile_dir=kwargs.pop('memory_profile_dir', None))
 
         # Register buffer before creating modules
         self.register_buffer("mel_stats", torch.ones(80))
@@ -111,6 +173,16 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
             if gpt_config.max_audio_tokens != -1
             else functools.partial(gpt_config.null_position_embeddings, dim=gpt_config.hidden_size)
         )
+        # The chunks of a text are embedded together, repeated chunks come from a cache
+        self.text_embedder = PackedTextEmbedder(
+            self.text_embedding,
+            self.text_pos_embedding,
+            self.tokenizer.bos_token_id,
+            self.tokenizer.eos_token_id,
+            cache_size_bytes=kwargs.pop('text_embedding_cache_bytes', 64 * 1024 ** 2)
+        )
+        # Most chunks of a streamed text embedded together
+        self.max_streamed_text_batch = kwargs.pop('max_streamed_text_batch', 32)
 
         self.conditioning_perceiver = PerceiverResampler(
             dim=gpt_config.hidden_size,
@@ -144,31 +216,128 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
         # Initialize VLLM engine at the end, settings its concurrency
         self.init_vllm_engine(self.max_concurrency)
 
-        # Semaphore for concurrency control of the encoding process
-        self.encoder_semaphore = asyncio.BoundedSemaphore(semaphore_concurrency)
-        self.decoder_semaphore = asyncio.BoundedSemaphore(semaphore_concurrency) # empirically found a good value
+        # Concurrency of the conditioning and vocoder stages, adapted to their latency within
+        # what the memory left by the engine can hold
+        self.conditioning_limiter, self.speaker_encoder_limiter, self.vocoder_limiter = (
+            AdaptiveLimiter(stage,
+                            initial_limit=self.memory_plan.semaphore_concurrency,
+                            max_limit=self.memory_plan.max_concurrent_calls)
+            for stage in ('conditioning', 'speaker_encoder', 'vocoder')
+        )
+        for limiter in (self.conditioning_limiter, self.speaker_encoder_limiter, self.vocoder_limiter):
+            metrics.register_limiter(limiter)
         self.eval()
 
     def get_memory_usage_curve(self):
-        """Calculate the memory usage curve based on concurrency level.
-        
-        Uses empirically determined polynomial coefficients to estimate memory requirements
-        for different concurrency levels. This helps in optimizing resource allocation
-        for the VLLM engine.
+        """Plan the engine memory from the measured memory profile of the model.
+
+        The profile of the device is measured the first time (see ``_measure_memory_profile``)
+        and stored, then the autotuner derives the sequences of the vLLM engine, its memory
+        fraction and the conditioning and vocoder concurrency from the memory free now.
+
+        Raises:
+            RuntimeError: If no device has room for the model.
         """
-        # thanks to NinjaPerson24119
-        amd = 2.0  # AMD GPUs are less VRAM efficient than NVIDIA GPUs
+        if not torch.cuda.is_available():
+            raise RuntimeError("Could not find the memory usage for the VLLM model initialization.")
+        device_index = torch.cuda.current_device()
+        profile = self.memory_autotuner.load_or_measure(
+            self._memory_profile_key(device_index),
+            functools.partial(self._measure_memory_profile, device_index)
+        )
+        self.memory_plan = self.memory_autotuner.plan(profile, self.max_concurrency, self.tp)
+        self.max_gb_for_vllm_model = self.memory_plan.engine_bytes / 1024 ** 3
+        self.logger.info(f"Memory plan: {self.memory_plan}")
 
-        x = np.array([2, 5, 10, 16])
-        y = np.array([1.25 * amd, 1.35 * amd, 1.45 * amd, 1.625 * amd])
+    @property
+    def max_model_len(self) -> int:
+        # this is from the xttsv2 code, 32 is the conditioning sql
+        return self.gpt_config.max_text_tokens + self.gpt_config.max_audio_tokens + 32 + 5 + 3
+
+    def _engine_dtype(self) -> torch.dtype:
+        dtype = getattr(self.gpt_config, 'torch_dtype', None) or torch.float32
+        return getattr(torch, dtype) if isinstance(dtype, str) else dtype
+
+    def _memory_profile_key(self, device_index: int) -> str:
+        """Name of the memory profile of this model geometry on a device."""
+        gpt, hifi = self.gpt_config, self.hifi_config
+        geometry = json.dumps([
+            gpt.hidden_size, gpt.n_inner, gpt.num_hidden_layers, gpt.num_audio_tokens, gpt.max_audio_tokens,
+            gpt.max_text_tokens, gpt.gpt_max_audio_tokens, str(self._engine_dtype()),
+            hifi.decoder_input_dim, hifi.d_vector_dim, hifi.input_sample_rate, hifi.output_sample_rate,
+            torch.__version__,
+        ])
+        device_name = "".join(c if c.isalnum() else "_" for c in torch.cuda.get_device_name(device_index))
+        return f"{device_name}-{hashlib.sha1(geometry.encode()).hexdigest()[:16]}"
+
+    @torch.inference_mode()
+    def _measure_memory_profile(self, device_index: int) -> MemoryProfile:
+        """Measure the memory costs of the model on a device.
+
+        The vocoder and the conditioning encoder run on inputs of the largest size they get
+        (a full length sentence, a conditioning chunk) at a few concurrencies. The engine
+        weights and the KV cache follow from the GPT geometry, as vLLM allocates them.
+
+        Args:
+            device_index (int): CUDA device index.
 
-        # polynomial fit
-        coefficients = np.polyfit(x, y, 2)
+        Returns:
+            MemoryProfile: Measured profile.
+        """
+        device = torch.device('cuda', device_index)
+        gpt = self.gpt_config
+        hidden_size, inner_size = gpt.hidden_size, gpt.n_inner or 4 * gpt.hidden_size
+        dtype_bytes = torch.empty((), dtype=self._engine_dtype()).element_size()
+        # attention and MLP weights and the two layer norms of a block
+        layer_params = 4 * hidden_size * (hidden_size + 1) + 2 * hidden_size * inner_size + inner_size + 5 * hidden_size
+        engine_params = (gpt.num_hidden_layers * layer_params
+                         + (2 * gpt.num_audio_tokens + gpt.max_audio_tokens + 3 + 2) * hidden_size)
+        # KV cache and the activations of a layer, for every token of a full length sequence
+        token_bytes = (2 * gpt.num_hidden_layers * hidden_size + 6 * hidden_size + inner_size) * dtype_bytes
+
+        def peak(run) -> int:
+            torch.cuda.synchronize(device)
+            torch.cuda.empty_cache()
+            torch.cuda.reset_peak_memory_stats(device)
+            baseline = torch.cuda.memory_allocated(device)
+            run()
+            torch.cuda.synchronize(device)
+            return torch.cuda.max_memory_allocated(device) - baseline
+
+        def vocoder(concurrency: int):
+            self.hifigan_decoder(
+                torch.zeros(concurrency, gpt.gpt_max_audio_tokens, self.hifi_config.decoder_input_dim, device=device),
+                g=torch.zeros(concurrency, self.hifi_config.d_vector_dim, 1, device=device)
+            )
 
-        # create a polynomial object
-        self.max_gb_for_vllm_model = (coefficients[0] * self.max_concurrency ** 2 +
-                                      coefficients[1] * self.max_concurrency +
-                                      coefficients[2])
+        def conditioning(concurrency: int):
+            # mel frames of a 6s conditioning chunk
+            self.get_style_emb(torch.zeros(concurrency, self.mel_stats.shape[0], 22050 * 6 // 256 + 1, device=device))
+
+        modules = (self.hifigan_decoder, self.conditioning_encoder, self.conditioning_perceiver)
+        original_device = self.mel_stats.device
+        for module in modules:
+            module.to(device)
+        try:
+            vocoder_base, vocoder_per_call = MemoryAutotuner.fit_linear(lambda c: peak(lambda: vocoder(c)))
+            conditioning_base, conditioning_per_call = MemoryAutotuner.fit_linear(
+                lambda c: peak(lambda: conditioning(c))
+            )
+        finally:
+            for module in modules:
+                module.to(original_device)
+            torch.cuda.empty_cache()
+
+        return MemoryProfile(
+            device_name=torch.cuda.get_device_name(device_index),
+            model_bytes=sum(p.numel() * p.element_size() for p in self.parameters()),
+            engine_bytes=engine_params * dtype_bytes,
+            sequence_bytes=self.max_model_len * token_bytes,
+            vocoder_base_bytes=vocoder_base,
+            vocoder_bytes_per_call=vocoder_per_call,
+            conditioning_base_bytes=conditioning_base,
+            conditioning_bytes_per_call=conditioning_per_call,
+        )
 
     @property
     def conditioning_config(self) -> ConditioningConfig:
@@ -205,27 +374,23 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
             RuntimeError: If unable to determine memory usage for model initialization.
         """
         """Initialize models with AsyncVLLMEngine."""
-        max_seq_num = concurrency
-        mem_utils = self.get_memory_percentage(self.max_gb_for_vllm_model * 1024 ** 3) #
-        if not mem_utils:
-            raise RuntimeError("Could not find the memory usage for the VLLM model initialization.")
+        # the memory plan may fit fewer sequences than asked for
+        max_seq_num = min(concurrency, self.memory_plan.max_num_seqs)
+        mem_utils = self.memory_plan.gpu_memory_utilization
         engine_args = AsyncEngineArgs(
             model=self.gpt_model,
             tensor_parallel_size=self.tp,
             pipeline_parallel_size=self.pp,
             dtype="auto",
-            max_model_len=self.gpt_config.max_text_tokens +
-                          self.gpt_config.max_audio_tokens +
-                          32 + 5 + 3, # this is from the xttsv2 code, 32 is the conditioning sql
+            max_model_len=self.max_model_len,
             gpu_memory_utilization=mem_utils,
             trust_remote_code=True,
             enforce_eager=getattr(self, 'enforce_eager', False),  # Use stored setting or default to False
+            enable_prefix_caching=self.enable_prefix_caching,
             limit_mm_per_prompt={"audio": 1}, # even if more audio are present, they'll be condendesed into one
             max_num_seqs=max_seq_num,
             disable_log_stats=True, # temporary fix for the log stats, there is a known bug in vllm that will be fixed in the next relaese
-            max_num_batched_tokens=(self.gpt_config.max_text_tokens +
-                                    self.gpt_config.max_audio_tokens +
-                                    32 + 5 + 3) * max_seq_num,
+            max_num_batched_tokens=self.max_model_len * max_seq_num,
             #We round to the nearest multiple of 32 and multiply by max_seq_num to get the max batched number (arbitrary) of tokens
         )
         self.logger.info(f"Initializing VLLM engine with args: {engine_args}")
@@ -322,8 +487,8 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
         Returns:
             torch.Tensor: Speaker embedding tensor.
         """
-        audio_16k = torchaudio.functional.resample(audio, sr, 16000)
-        async with self.decoder_semaphore:
+        audio_16k = resample(audio, sr, 16000)
+        async with self.speaker_encoder_limiter.acquire(audio_16k.shape[-1] / 16000):
             return (
                 self.hifigan_decoder.speaker_encoder.forward(audio_16k.to(self.device), l2_norm=True)
                 .unsqueeze(-1)
@@ -340,14 +505,9 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
             audio_conditioning (torch.Tensor): Audio conditioning tensor.
 
         Returns:
-            List[torch.Tensor]: List of merged conditioning tensors.
+            List[torch.Tensor]: List of merged conditioning tensors, views of one buffer.
         """
-        cond_latents = []
-        for text_embedding in text_conditioning:
-            # Concatenate along sequence dimension
-            cond_latents.append((torch.cat([audio_conditioning, text_embedding], dim=1).squeeze(0)
-                                 .to(self.llm_engine.engine.model_config.dtype)))
-        return cond_latents
+        return merge_conditioning(text_conditioning, audio_conditioning, self.llm_engine.engine.model_config.dtype)
 
     def get_gpt_cond_latents(self, audio, sr, length: int = 30, chunk_length: int = 6):
         """Generate GPT conditioning latents from audio.
@@ -361,8 +521,7 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
         Returns:
             torch.Tensor: GPT conditioning latents.
         """
-        if sr != 22050:
-            audio = torchaudio.functional.resample(audio, sr, 22050)
+        audio = resample(audio, sr, 22050)
         if length > 0:
             audio = audio[:, : 22050 * length]
         if self.gpt_config.use_perceiver_resampler:
@@ -422,7 +581,7 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
         """Generate conditioning latents from reference audio.
 
         Args:
-            audio_reference: Reference audio file path or tensor.
+            audio_reference: Reference audio (path, encoded bytes, array or tensor) or a list of them.
             max_ref_length (int, optional): Maximum reference length in seconds. Defaults to 30.
             gpt_cond_len (int, optional): Length of GPT conditioning. Defaults to 6.
             gpt_cond_chunk_len (int, optional): Length of each conditioning chunk. Defaults to 6.
@@ -434,19 +593,23 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
             Tuple: GPT conditioning latents and speaker embeddings.
         """
         # Deal with multiple references
-        assert (isinstance(audio_reference, bytes) or
-                isinstance(audio_reference, str) or
-                isinstance(audio_reference, list)), f"audio_reference must be a string, byte or a list but it is {type(audio_reference)}"
+        assert (isinstance(audio_reference, (bytes, str, Path, list)) or
+                is_in_memory_audio(audio_reference)), \
+            f"audio_reference must be a path, bytes, an array, a tensor or a list but it is {type(audio_reference)}"
 
         if not isinstance(audio_reference, list):
             audio_paths = [audio_reference]
         else:
             audio_paths = audio_reference
 
+        # Decode all the references concurrently, off the event loop
+        loaded_audios = await asyncio.gather(*[
+            audio_ingestor.load_async(file_path, load_sr, max_ref_length) for file_path in audio_paths
+        ])
+
         speaker_embeddings = []
         audios = []
-        for file_path in audio_paths:
-            audio = load_audio(file_path, load_sr)
+        for audio in loaded_audios:
             audio = audio[:, : load_sr * max_ref_length].to(self.device).to(self.dtype)
             if sound_norm_refs:
                 audio = (audio / torch.abs(audio).max()) * 0.75
@@ -461,9 +624,14 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
 
         # Merge all the audios and compute the latents for the GPT
         full_audio = torch.cat(audios, dim=-1)
-        gpt_cond_latents = await asyncio.to_thread(self.get_gpt_cond_latents,
-            full_audio, load_sr, length=gpt_cond_len, chunk_length=gpt_cond_chunk_len
-        )  # [1, 1024, T]
+        # Only the GPU work holds a conditioning slot, sized by the seconds of audio it encodes
+        cond_seconds = full_audio.shape[-1] / load_sr
+        if gpt_cond_len > 0:
+            cond_seconds = min(cond_seconds, gpt_cond_len)
+        async with self.conditioning_limiter.acquire(cond_seconds):
+            gpt_cond_latents = await asyncio.to_thread(self.get_gpt_cond_latents,
+                full_audio, load_sr, length=gpt_cond_len, chunk_length=gpt_cond_chunk_len
+            )  # [1, 1024, T]
 
         speaker_embedding = torch.stack(speaker_embeddings)
         speaker_embedding = speaker_embedding.mean(dim=0)
@@ -506,7 +674,55 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
             conds = cond_input.unsqueeze(1)
         return conds
 
-    async def prepare_text_tokens_async(self, text: str, language: str, split_text=False) \
+    async def _encode_chunks_per_language(self, text: str, language: str) -> List[List[int]]:
+        """Split a text and tokenize every chunk with its own detected language.
+
+        Chunks are detected in batches in the language detection pool; each batch is
+        tokenized as soon as it is ready while the following ones are still being detected.
+
+        Args:
+            text (str): Input text.
+            language (str): Fallback language for chunks too short to classify.
+
+        Returns:
+            List[List[int]]: Token IDs of each chunk, without special tokens.
+        """
+        chunks = self.tokenizer.split_text(text, language)
+        loop = asyncio.get_running_loop()
+        detections = [
+            loop.run_in_executor(
+                language_detection_executor,
+                detect_languages,
+                chunks[start:start + self.language_detection_batch_size],
+                language
+            )
+            for start in range(0, len(chunks), self.language_detection_batch_size)
+        ]
+
+        text_tokens = []
+        for start, detection in zip(range(0, len(chunks), self.language_detection_batch_size), detections):
+            languages = await detection
+            batch = chunks[start:start + self.language_detection_batch_size]
+            text_tokens.extend(
+                self.tokenizer(batch, lang=languages, add_special_tokens=False, padding=False)['input_ids']
+            )
+        return text_tokens
+
+    def _encode_documents(self, documents: List[Tuple[str, str]]) -> List[List[List[int]]]:
+        """Split and tokenize many texts in one tokenizer call.
+
+        Args:
+            documents (List[Tuple[str, str]]): Text and language of each request.
+
+        Returns:
+            List[List[List[int]]]: Token IDs of the chunks of each text, without special tokens.
+        """
+        texts, languages = zip(*documents)
+        input_ids, offsets = self.tokenizer.batch_encode_documents(list(texts), lang=list(languages))
+        return [input_ids[start:end] for start, end in zip(offsets, offsets[1:])]
+
+    async def prepare_text_tokens_async(self, text: str, language: str, split_text=False,
+                                        per_chunk_language: bool = False) \
             -> Tuple[List[Union[int, List[int]]], List[torch.Tensor]]:
         """Prepare text tokens and embeddings asynchronously.
 
@@ -514,58 +730,51 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
             text (str): Input text to tokenize.
             language (str): Language code.
             split_text (bool, optional): Whether to split text into chunks. Defaults to False.
+            per_chunk_language (bool, optional): Detect the language of each chunk, only used
+                when splitting. Defaults to False.
 
         Returns:
             Tuple: Token IDs and text embeddings.
         """
         self.logger.debug(f"Preparing text tokens for text: {text}")
-        async def elaborate_tokens(text_tokens: List[int]) -> torch.Tensor:
-            text_tokens.insert(0, self.tokenizer.bos_token_id)
-            text_tokens.append(self.tokenizer.eos_token_id)
-            return torch.tensor(text_tokens).unsqueeze(0).to(self.text_embedding.weight.device)
-
-        async def embed_tokens(text_tokens: Union[torch.Tensor, List[torch.Tensor]]) -> List[torch.Tensor]:
-            embeds = []
-            if isinstance(text_tokens, list):
-                for list_element in text_tokens:
-                    embeds.append(self.text_embedding(list_element) + self.text_pos_embedding(list_element))
-            else:
-                embeds.append(self.text_embedding(text_tokens) + self.text_pos_embedding(text_tokens))
-            return embeds
-
-        fake_tokens_for_audio_generation = []
         if split_text:
-            text_tokens = self.tokenizer.batch_encode_with_split(text, lang=[language])
-            for idx, text_token in enumerate(text_tokens):
-                text_tokens[idx] = await elaborate_tokens(text_token)
-                fake_tokens_for_audio_generation.append([1] * len(text_token))
+            if per_chunk_language:
+                text_tokens = await self._encode_chunks_per_language(text, language)
+            else:
+                text_tokens = await self.tokenization_batcher.submit((text, language))
         else:
-            text_tokens = self.tokenizer(text, lang=[language])['input_ids'][0]
-            text_tokens = await elaborate_tokens(text_tokens)
-            fake_tokens_for_audio_generation = [1] * len(text_tokens)
-        return fake_tokens_for_audio_generation, await embed_tokens(text_tokens)
+            text_tokens = [self.tokenizer(text, lang=[language])['input_ids'][0]]
+        # Placeholder prompts, the actual inputs are the embeddings (with BOS/EOS)
+        fake_tokens_for_audio_generation = [[1] * (len(text_token) + 2) for text_token in text_tokens]
+        if not split_text:
+            fake_tokens_for_audio_generation = fake_tokens_for_audio_generation[0]
+        return fake_tokens_for_audio_generation, self.text_embedder.embed(text_tokens)
 
 
 
-    async def prepare_inputs_async(self, text: str, language: str, speaker_file: List[Union[str, Path]],
-                                   max_ref_length: int, gpt_cond_len: int, gpt_cond_chunk_len: int, split_text: bool) \
+    async def prepare_inputs_async(self, text: str, language: str, speaker_file: List[AudioSource],
+                                   max_ref_length: int, gpt_cond_len: int, gpt_cond_chunk_len: int, split_text: bool,
+                                   per_chunk_language: bool = False) \
             -> Tuple[List[List[int]], List[torch.Tensor], torch.Tensor]:
         """Prepare all inputs for speech generation asynchronously.
 
         Args:
             text (str): Input text.
             language (str): Language code.
-            speaker_file (List[Union[str, Path]]): List of speaker reference files.
+            speaker_file (List[AudioSource]): List of speaker references.
             max_ref_length (int): Maximum reference length in seconds.
             gpt_cond_len (int): Length of GPT conditioning.
             gpt_cond_chunk_len (int): Length of each conditioning chunk.
             split_text (bool): Whether to split text into chunks.
+            per_chunk_language (bool, optional): Detect the language of each chunk. Defaults to False.
 
         Returns:
             Tuple: Token IDs, text embeddings, and speaker embeddings.
         """
         # Tokenize text based on the language
-        text_tokens, text_embeddings = await self.prepare_text_tokens_async(text, language, split_text)
+        text_tokens, text_embeddings = await self.prepare_text_tokens_async(
+            text, language, split_text, per_chunk_language
+        )
 
         # Load the speaker file and convert it to a tensor
         gpt_cond_latent, speaker_embeddings = await self.get_audio_conditioning(
@@ -581,7 +790,7 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
 
     async def get_audio_conditioning(
             self,
-            audio_reference: [str, Path],
+            audio_reference: Union[AudioSource, List[AudioSource]],
             max_ref_length=30,
             gpt_cond_len=6,
             gpt_cond_chunk_len=6,
@@ -592,7 +801,7 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
         """Generate audio conditioning from reference files.
 
         Args:
-            audio_reference ([str, Path]): Reference audio file paths.
+            audio_reference (Union[AudioSource, List[AudioSource]]): Reference audio.
             max_ref_length (int, optional): Maximum reference length in seconds. Defaults to 30.
             gpt_cond_len (int, optional): Length of GPT conditioning. Defaults to 6.
             gpt_cond_chunk_len (int, optional): Length of each conditioning chunk. Defaults to 6.
@@ -603,19 +812,16 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
         Returns:
             Tuple: GPT conditioning latents and speaker embeddings.
         """
-        """Async version of get_conditioning_latents with concurrency control."""
-        async with self.encoder_semaphore:
-            # Run the original get_conditioning_latents in executor
-            result = await self.get_conditioning_latents(
-                audio_reference,
-                max_ref_length,
-                gpt_cond_len,
-                gpt_cond_chunk_len,
-                librosa_trim_db,
-                sound_norm_refs,
-                load_sr
-            )
-            return result
+        """Async version of get_conditioning_latents, the GPU stages take their own limiter slots."""
+        return await self.get_conditioning_latents(
+            audio_reference,
+            max_ref_length,
+            gpt_cond_len,
+            gpt_cond_chunk_len,
+            librosa_trim_db,
+            sound_norm_refs,
+            load_sr
+        )
 
     async def get_model_logits(
             self,
@@ -651,34 +857,41 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
         engine_inputs = TokensPrompt(prompt_token_ids=token_ids)
         conditioning['audio']['sequence_length'] = len(token_ids)
 
+        if self.enable_prefix_caching:
+            # the hidden states of every position are needed, none can come from the cache
+            conditioning['audio']['placeholder_ids'] = unique_placeholder_ids(
+                conditioning['audio']['embeds'].shape[0], self.gpt_config.num_audio_tokens
+            )
         engine_inputs["multi_modal_data"] = conditioning
 
-        hidden_states_collector = HiddenStatesCollector()
         # Bind the collector to this request
-        bound_collector = hidden_states_collector.bind_to_request(request_id)
-
-        # Set up sampling parameters with the bound collector
-        sampling_params = ExtendedSamplingParams(
-            detokenize=False,
-            request_id=request_id,
-            max_tokens=1,
-            hidden_state_collector=bound_collector,
-            output_kind=RequestOutputKind.FINAL_ONLY
-        )
+        bound_collector = self.hidden_states_collector.bind_to_request(request_id)
+        try:
+            # Set up sampling parameters with the bound collector
+            sampling_params = ExtendedSamplingParams(
+                detokenize=False,
+                request_id=request_id,
+                max_tokens=1,
+                hidden_state_collector=bound_collector,
+                output_kind=RequestOutputKind.FINAL_ONLY
+            )
 
-        # Generate with unique request ID
-        generator = self.llm_engine.generate(
-            prompt=engine_inputs,
-            sampling_params=sampling_params,
-            request_id=request_id
-        )
+            # Generate with unique request ID
+            generator = self.llm_engine.generate(
+                prompt=engine_inputs,
+                sampling_params=sampling_params,
+                request_id=request_id
+            )
 
-        async for output in generator:  # consume the generator
-            if output.finished:
-                pass
+            async for output in generator:  # consume the generator
+                if output.finished:
+                    pass
 
-        # Get the collected hidden states
-        hidden_states = await hidden_states_collector.get_hidden_states(request_id)
+            # Get the collected hidden states
+            hidden_states = await self.hidden_states_collector.get_hidden_states(request_id)
+        finally:
+            # a cancelled or failed generation must not keep its slot in the shared collector
+            self.hidden_states_collector.cleanup_request(request_id)
 
         if hidden_states is None:
             raise RuntimeError(
@@ -690,6 +903,24 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
         return self.final_norm(hidden_states[start_of_audio_hs:-5, ...].unsqueeze(0).to(self.device).to(self.dtype))
 
 
+    def get_captured_hidden_states(self, output: RequestOutput) -> Optional[torch.Tensor]:
+        """Get the hidden states captured while generating a finished sequence.
+
+        The state a token was sampled from is the state at the position before it, so the
+        captured states are the ones ``get_model_logits`` recomputes, without the prefill.
+
+        Args:
+            output (RequestOutput): Finished generation output.
+
+        Returns:
+            Optional[torch.Tensor]: Normalized hidden states, one per generated token, or None
+                if they were not captured entirely (capture disabled, sequence preempted).
+        """
+        hidden_states = self.generation_states.pop(output.request_id)
+        if hidden_states is None or hidden_states.shape[0] != len(output.outputs[0].token_ids):
+            return None
+        return self.final_norm(hidden_states.unsqueeze(0).to(self.device).to(self.dtype))
+
     @torch.inference_mode()
     async def get_generation_context(self,
                                      request: TTSRequest,
@@ -715,53 +946,178 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
                 request.max_ref_length,
                 request.gpt_cond_len,
                 request.gpt_cond_chunk_len,
-                split_text=True  # Split text to avoid OOM on big texts
+                split_text=True,  # Split text to avoid OOM on big texts
+                per_chunk_language=request.per_chunk_language
             )
         else:
             tokens_list, text_embeddings = await self.prepare_text_tokens_async(request.text,
                                                                                 request.language,
-                                                                                split_text=True)
+                                                                                split_text=True,
+                                                                                per_chunk_language=request.per_chunk_language)
             gpt_embed_inputs = await self._merge_conditioning(text_embeddings, gpt_cond_latent)
 
         # Start all requests in parallel
         generators = []
         requests_id = []
         for seq_index, sequence in enumerate(tokens_list):
-            sampling_params = ExtendedSamplingParams(
-                temperature=request.temperature,
-                top_p=request.top_p,
-                detokenize=False,
-                request_id=uuid.uuid4(),
-                top_k=request.top_k,
-                logits_processors=[LogitsRepetitionPenalizer(request.repetition_penalty)],
-                repetition_penalty=1.0,  # Since we're handling repetition penalty manually
-                max_tokens=self.gpt_config.gpt_max_audio_tokens,
-                ignore_eos=True,  # Ignore the tokenizer eos token since it is for textual generation
-                stop_token_ids=[self.mel_eos_token_id],
-                output_kind=RequestOutputKind.FINAL_ONLY
-            )
-
-            engine_inputs = TokensPrompt(prompt_token_ids=sequence)
-            if gpt_embed_inputs is not None:
-                engine_inputs["multi_modal_data"] = {
-                    "audio": {
-                        "embeds": gpt_embed_inputs[seq_index],
-                        "is_logits_only_mode": False,
-                        "sequence_length": len(sequence)
-                    }
-                }
-            request_id =f"{request.request_id}_{seq_index}"
-            # Get audio token generator from VLLM
-            token_generator = self.llm_engine.generate(
-                prompt=engine_inputs,
-                sampling_params=sampling_params,
-                request_id=request_id,
+            token_generator, request_id = self._start_generation(
+                request, seq_index, sequence, gpt_embed_inputs[seq_index] if gpt_embed_inputs is not None else None
             )
             generators.append(token_generator)
             requests_id.append(request_id)
 
         return generators, requests_id, speaker_embeddings, gpt_embed_inputs
 
+    def _streams_audio_windows(self, request: Optional[TTSRequest]) -> bool:
+        return request is not None and request.stream and self.stream_window_tokens is not None
+
+    def streams_text_preparation(self, request: TTSRequest) -> bool:
+        if request.context_partial_function is not None or not isinstance(request.text, str):
+            return False
+        # Anything longer than a chunk: don't wait for the last chunk to start the first one
+        char_limit = self.tokenizer.char_limits.get(request.language.split("-")[0], 250)
+        return len(request.text.strip()) > char_limit
+
+    async def _stream_text_token_batches(self, text: str, language: str,
+                                         per_chunk_language: bool = False) -> AsyncGenerator[List[List[int]], None]:
+        """Split and tokenize a text in a thread, streaming the tokens of the chunks in order.
+
+        The first batch holds a single chunk, so its generation starts right away, then the
+        batches double up to ``max_streamed_text_batch`` chunks, which are embedded together.
+        With per chunk languages, the chunks of a batch are detected and tokenized together
+        in the same thread.
+
+        Args:
+            text (str): Input text.
+            language (str): Language code.
+            per_chunk_language (bool, optional): Detect the language of each chunk. Defaults to False.
+
+        Yields:
+            List[List[int]]: Token IDs of the next chunks, without special tokens.
+        """
+        if per_chunk_language:
+            chunks = self.tokenizer.iter_split_text(text, language)
+
+            def next_batch(size: int) -> List[List[int]]:
+                batch = list(itertools.islice(chunks, size))
+                if not batch:
+                    return []
+                languages = detect_languages(batch, language)
+                return self.tokenizer(batch, lang=languages, add_special_tokens=False, padding=False)['input_ids']
+        else:
+            chunks = self.tokenizer.iter_encode_with_split(text, language)
+
+            def next_batch(size: int) -> List[List[int]]:
+                return [chunk[1] for chunk in itertools.islice(chunks, size)]
+
+        loop = asyncio.get_running_loop()
+        batch_size = 1
+        while batch := await loop.run_in_executor(None, next_batch, batch_size):
+            yield batch
+            batch_size = min(2 * batch_size, self.max_streamed_text_batch)
+
+    async def iter_generation_context(self, request: TTSRequest) -> AsyncGenerator[GenerationContextItem, None]:
+        """Get the generation context of a text, one chunk at a time.
+
+        Long texts are prepared in the text preparation pool when it is enabled, the others
+        are segmented and tokenized lazily in a thread. Either way the chunks come in batches
+        (a shard of the pool, or growing batches of the thread) that are embedded and merged
+        with the conditioning together, and each chunk starts generating as soon as its batch
+        is ready, instead of after the whole text is tokenized.
+
+        Args:
+            request (TTSRequest): TTS request object.
+
+        Yields:
+            GenerationContextItem: Token generator, request id, speaker embeddings and GPT
+                conditioning of the next chunk.
+        """
+        gpt_cond_latent, speaker_embeddings = await self.get_audio_conditioning(
+            request.speaker_files,
+            request.max_ref_length,
+            request.gpt_cond_len,
+            request.gpt_cond_chunk_len
+        )
+        seq_index = 0
+        if self.text_preparation.should_use(request.text):
+            text_token_batches = self.text_preparation.stream_batches(
+                request.text, request.language, request.per_chunk_language
+            )
+        else:
+            text_token_batches = self._stream_text_token_batches(
+                request.text, request.language, request.per_chunk_language
+            )
+        async for text_tokens_batch in text_token_batches:
+            gpt_embed_inputs = await self._merge_conditioning(
+                self.text_embedder.embed(text_tokens_batch), gpt_cond_latent
+            )
+            for text_tokens, gpt_embed_input in zip(text_tokens_batch, gpt_embed_inputs):
+                # Placeholder prompt, the actual inputs are the embeddings (with BOS/EOS)
+                sequence = [1] * (len(text_tokens) + 2)
+                token_generator, request_id = self._start_generation(request, seq_index, sequence, gpt_embed_input)
+                yield token_generator, request_id, speaker_embeddings, gpt_embed_input
+                seq_index += 1
+
+    def _start_generation(self,
+                          request: TTSRequest,
+                          seq_index: int,
+                          sequence: List[int],
+                          gpt_embed_input: Optional[torch.Tensor]) -> Tuple[AsyncGenerator[RequestOutput, None], str]:
+        """Submit the generation of one text chunk to the engine.
+
+        Args:
+            request (TTSRequest): TTS request object.
+            seq_index (int): Index of the chunk in the request.
+            sequence (List[int]): Placeholder prompt tokens of the chunk.
+            gpt_embed_input (Optional[torch.Tensor]): Conditioning embeddings of the chunk.
+
+        Returns:
+            Tuple: Audio token generator and engine request id.
+        """
+        if request.repetition_penalty < 0:
+            raise ValueError("Repetition penalty must be non-negative")
+        request_id = f"{request.request_id}_{seq_index}"
+        streams_audio_windows = self._streams_audio_windows(request)
+        sampling_params = ExtendedSamplingParams(
+            temperature=request.temperature,
+            top_p=request.top_p,
+            detokenize=False,
+            request_id=uuid.uuid4(),
+            top_k=request.top_k,
+            batched_repetition_penalty=request.repetition_penalty,
+            repetition_penalty=1.0,  # Since we're handling repetition penalty manually
+            max_tokens=self.gpt_config.gpt_max_audio_tokens,
+            ignore_eos=True,  # Ignore the tokenizer eos token since it is for textual generation
+            stop_token_ids=[self.mel_eos_token_id],
+            generation_state_collector=(
+                self.generation_states.bind_to_request(request_id)
+                if self.capture_hidden_states or streams_audio_windows else None
+            ),
+            # windowed streaming consumes the tokens as they come
+            output_kind=RequestOutputKind.DELTA if streams_audio_windows else RequestOutputKind.FINAL_ONLY
+        )
+
+        engine_inputs = TokensPrompt(prompt_token_ids=sequence)
+        if gpt_embed_input is not None:
+            engine_inputs["multi_modal_data"] = {
+                "audio": {
+                    "embeds": gpt_embed_input,
+                    "is_logits_only_mode": False,
+                    "sequence_length": len(sequence)
+                }
+            }
+            if self.enable_prefix_caching:
+                engine_inputs["multi_modal_data"]["audio"]["placeholder_ids"] = conditioning_placeholder_ids(
+                    gpt_embed_input, self.gpt_config.num_audio_tokens
+                )
+        # Get audio token generator from VLLM
+        token_generator = self.llm_engine.generate(
+            prompt=engine_inputs,
+            sampling_params=sampling_params,
+            request_id=request_id,
+        )
+        return token_generator, request_id
+
     @torch.inference_mode()
     async def process_tokens_to_speech(
             self,
@@ -784,25 +1140,31 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
         assert speaker_embeddings is not None, "Speaker embeddings must be provided for speech generation with XTTSv2."
         assert multimodal_data is not None, "Multimodal data must be provided for speech generation with XTTSv2."
 
+        if self._streams_audio_windows(request):
+            async for chunk in self._stream_speech(generator, speaker_embeddings, multimodal_data, request):
+                yield chunk
+            return
 
         async for output in generator:
 
             if output.finished:
                 # get the hidden states
-                hidden_states = await self.get_model_logits(
-                    list(output.outputs[0].token_ids),
-                    {
-                        "audio": {
-                            'embeds': multimodal_data,  # Use multimodal data for conditioning
-                            "is_logits_only_mode": True,
-                            "sequence_length": False # to be inserted later
+                hidden_states = self.get_captured_hidden_states(output)
+                if hidden_states is None:
+                    hidden_states = await self.get_model_logits(
+                        list(output.outputs[0].token_ids),
+                        {
+                            "audio": {
+                                'embeds': multimodal_data,  # Use multimodal data for conditioning
+                                "is_logits_only_mode": True,
+                                "sequence_length": False # to be inserted later
+                            },
                         },
-                    },
-                    output.request_id
-                )
+                        output.request_id
+                    )
 
 
-                async with self.decoder_semaphore:
+                async with self.vocoder_limiter.acquire(hidden_states.shape[1]):
                     async with self.cuda_memory_manager():
                         wav = (await asyncio.to_thread(self.hifigan_decoder,
                                 hidden_states,
@@ -810,14 +1172,85 @@ class XTTSv2Engine(BaseAsyncTTSEngine):
                             )).cpu().detach().numpy().squeeze()
                          # noqa
 
-                        # yield the audio output
-                        yield TTSOutput(array= wav,
-                                        start_time = request.start_time,
-                                        token_length = len(output.outputs[0].token_ids)
-                                        )
+                # yield the audio output, once the vocoder slot is released
+                yield TTSOutput(array= wav,
+                                start_time = request.start_time,
+                                token_length = len(output.outputs[0].token_ids)
+                                )
 
 
 
+    async def _stream_speech(
+            self,
+            generator: AsyncGenerator[RequestOutput, None],
+            speaker_embeddings: torch.Tensor,
+            multimodal_data: torch.Tensor,
+            request: TTSRequest,
+    ) -> AsyncGenerator[TTSOutput, None]:
+        """Convert tokens to speech while they are generated, one window of tokens at a time.
+
+        The generator yields the new tokens of each step, their hidden states are captured
+        during generation, and every ``stream_window_tokens`` tokens the vocoder runs on the
+        latest window. The audio of a sentence then starts after its first window instead
+        of after its last token.
+
+        Args:
+            generator (AsyncGenerator[RequestOutput, None]): Token generator, with delta outputs.
+            speaker_embeddings (torch.Tensor): Speaker embeddings.
+            multimodal_data (torch.Tensor): GPT conditioning of the sentence.
+            request (TTSRequest): Original TTS request.
+
+        Yields:
+            TTSOutput: Consecutive audio chunks of the sentence, seams already crossfaded.
+        """
+        windows = WindowedVocoder(self.stream_window_tokens, self.stream_context_tokens)
+        token_ids: List[int] = []
+        request_id = None
+        try:
+            async for output in generator:
+                request_id = output.request_id
+                token_ids.extend(output.outputs[0].token_ids)
+                window = windows.next_window(len(token_ids), output.finished)
+                if window is None:
+                    continue
+
+                start, end = window
+                hidden_states = self.generation_states.peek(request_id)
+                if hidden_states is not None and hidden_states.shape[0] >= end:
+                    latents = self.final_norm(hidden_states[start:end].unsqueeze(0).to(self.device).to(self.dtype))
+                else:
+                    # the buffer was evicted, compute the states of the tokens so far again
+                    latents = (await self.get_model_logits(
+                        token_ids[:end],
+                        {
+                            "audio": {
+                                'embeds': multimodal_data,
+                                "is_logits_only_mode": True,
+                                "sequence_length": False
+                            },
+                        },
+                        request_id
+                    ))[:, start:end]
+
+                async with self.vocoder_limiter.acquire(latents.shape[1]):
+                    async with self.cuda_memory_manager():
+                        wav = (await asyncio.to_thread(self.hifigan_decoder,
+                                latents,
+                                g=speaker_embeddings
+                            )).cpu().detach().numpy().squeeze()
+
+                emitted_tokens = windows.emitted_tokens
+                audio = windows.splice(wav, window, output.finished)
+                yield TTSOutput(array=audio,
+                                start_time=request.start_time,
+                                token_length=windows.emitted_tokens - emitted_tokens
+                                )
+        finally:
+            if request_id is not None:
+                self.generation_states.pop(request_id)
+
     async def shutdown(self):
+        self.text_preparation.shutdown()
+        self.tokenization_batcher.shutdown()
         self.llm_engine.shutdown_background_loop()
 
@@ -0,0 +1,121 @@
+from typing import Callable, List, Sequence, Union
+
+import torch
+from cachetools import LRUCache
+from torch import nn
+
+
+def _tensor_nbytes(tensor: torch.Tensor) -> int:
+    return tensor.numel() * tensor.element_size()
+
+
+class PackedTextEmbedder:
+    """Embeds the text tokens of many chunks at once.
+
+    The chunks are packed into one ragged sequence: their token ids and the positions of
+    the tokens within their chunk are copied to the device together, and a single
+    embedding lookup of each kind covers all of them. The embeddings of every chunk are
+    then split back out.
+
+    Chunks come back often (the same sentence requested again, a repeated heading), so the
+    embeddings are kept in a size-bounded LRU cache keyed by the token ids; cached chunks,
+    and chunks repeated within a call, are embedded only once.
+    """
+
+    def __init__(self,
+                 text_embedding: nn.Embedding,
+                 text_pos_embedding: Union[nn.Module, Callable[[torch.Tensor], torch.Tensor]],
+                 bos_token_id: int,
+                 eos_token_id: int,
+                 cache_size_bytes: int = 64 * 1024 ** 2):
+        """Initialize the embedder.
+
+        Args:
+            text_embedding (nn.Embedding): Token embedding.
+            text_pos_embedding (Union[nn.Module, Callable[[torch.Tensor], torch.Tensor]]): Position
+                embedding. A learned one (with an ``emb`` table) is looked up for all the chunks
+                at once, anything else is called on the tokens of each chunk.
+            bos_token_id (int): Token prepended to each chunk.
+            eos_token_id (int): Token appended to each chunk.
+            cache_size_bytes (int, optional): Budget for cached embeddings, 0 disables the
+                cache. Defaults to 64MB.
+        """
+        self.text_embedding = text_embedding
+        self.text_pos_embedding = text_pos_embedding
+        self.bos_token_id = bos_token_id
+        self.eos_token_id = eos_token_id
+        self.cache = LRUCache(maxsize=cache_size_bytes, getsizeof=_tensor_nbytes) if cache_size_bytes > 0 else None
+
+    @torch.inference_mode()
+    def embed(self, chunks: Sequence[Sequence[int]]) -> List[torch.Tensor]:
+        """Embed the tokens of text chunks, with BOS and EOS around each of them.
+
+        Args:
+            chunks (Sequence[Sequence[int]]): Token ids of each chunk, without special tokens.
+
+        Returns:
+            List[torch.Tensor]: Embeddings of each chunk, (tokens + 2, hidden size).
+        """
+        keys = [tuple(chunk) for chunk in chunks]
+        embeddings = {}
+        if self.cache is not None:
+            for key in keys:
+                if key not in embeddings and (cached := self.cache.get(key)) is not None:
+                    embeddings[key] = cached
+
+        missing = list(dict.fromkeys(key for key in keys if key not in embeddings))
+        if missing:
+            lengths = [len(key) + 2 for key in missing]
+            token_ids, positions = [], []
+            for key, length in zip(missing, lengths):
+                token_ids.extend((self.bos_token_id, *key, self.eos_token_id))
+                positions.extend(range(length))
+            device = self.text_embedding.weight.device
+            token_ids, positions = torch.tensor([token_ids, positions]).to(device)
+
+            packed = self.text_embedding(token_ids)
+            if (position_table := getattr(self.text_pos_embedding, 'emb', None)) is not None:
+                packed += position_table(positions)
+            else:
+                # e.g. the null position embeddings of models without a learned table
+                for chunk_ids, chunk_embedding in zip(token_ids.split(lengths), packed.split(lengths)):
+                    chunk_embedding += self.text_pos_embedding(chunk_ids.unsqueeze(0)).squeeze(0)
+            for key, embedding in zip(missing, packed.split(lengths)):
+                if self.cache is not None:
+                    # a view would keep the whole packed tensor alive in the cache
+                    embedding = embedding.clone()
+                    self.cache[key] = embedding
+                embeddings[key] = embedding
+
+        return [embeddings[key] for key in keys]
+
+
+def merge_conditioning(text_embeddings: Sequence[torch.Tensor],
+                       audio_conditioning: torch.Tensor,
+                       dtype: torch.dtype) -> List[torch.Tensor]:
+    """Prepend the audio conditioning to the text embeddings of each chunk.
+
+    All the merged inputs live in one buffer, allocated once and filled by a single
+    concatenation that also casts to ``dtype``, whatever the number of chunks.
+
+    Args:
+        text_embeddings (Sequence[torch.Tensor]): Embeddings of each chunk, (tokens, hidden size)
+            or (1, tokens, hidden size).
+        audio_conditioning (torch.Tensor): Audio conditioning, (1, latents, hidden size).
+        dtype (torch.dtype): Dtype of the merged inputs.
+
+    Returns:
+        List[torch.Tensor]: Merged inputs of each chunk, (latents + tokens, hidden size), views
+            of the shared buffer.
+    """
+    if not text_embeddings:
+        return []
+    hidden_size = audio_conditioning.shape[-1]
+    audio_conditioning = audio_conditioning.reshape(-1, hidden_size)
+    text_embeddings = [text_embedding.reshape(-1, hidden_size) for text_embedding in text_embeddings]
+    lengths = [audio_conditioning.shape[0] + text_embedding.shape[0] for text_embedding in text_embeddings]
+
+    buffer = torch.empty(sum(lengths), hidden_size, dtype=dtype, device=audio_conditioning.device)
+    torch.cat([part for text_embedding in text_embeddings for part in (audio_conditioning, text_embedding)],
+              out=buffer)
+    return list(buffer.split(lengths))
@@ -0,0 +1,89 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class WindowedVocoder:
+    """Splits the vocoding of a growing sequence of audio tokens into overlapping windows.
+
+    Instead of waiting for the whole sequence, the vocoder runs as soon as ``window_tokens``
+    new tokens are there. Each window also decodes ``context_tokens`` tokens on both sides
+    of its seams: the ones before it, so the audio starts from the right state, and the last
+    ones of the window, which are left for the next window since they lack the right
+    context. The audio of two windows meets at a token boundary, where the first
+    ``crossfade_samples`` samples of the new window fade into the held back tail of the
+    previous one.
+
+    The vocoding itself is up to the caller::
+
+        while (window := windows.next_window(available_tokens, finished)) is not None:
+            audio = windows.splice(vocoder(latents[:, window[0]:window[1]]), window, finished)
+    """
+
+    def __init__(self, window_tokens: int = 32, context_tokens: int = 8, crossfade_samples: int = 1024):
+        """Initialize the windowing.
+
+        Args:
+            window_tokens (int, optional): New tokens emitted by a window. Defaults to 32.
+            context_tokens (int, optional): Tokens decoded again on each side of a seam. Defaults to 8.
+            crossfade_samples (int, optional): Samples faded across a seam, at most the samples
+                of ``context_tokens`` tokens. Defaults to 1024.
+        """
+        if window_tokens < 1 or context_tokens < 1:
+            raise ValueError("Windows need at least one token and one context token")
+        self.window_tokens = window_tokens
+        self.context_tokens = context_tokens
+        self.crossfade_samples = crossfade_samples
+        self.emitted_tokens = 0  # tokens whose audio was emitted
+        self.tail: Optional[np.ndarray] = None  # audio after the last seam, to fade into the next window
+        self.fade_in = np.linspace(0.0, 1.0, crossfade_samples, dtype=np.float32)
+
+    def next_window(self, available_tokens: int, final: bool = False) -> Optional[Tuple[int, int]]:
+        """Tokens to vocode next, if there are enough of them.
+
+        Args:
+            available_tokens (int): Tokens generated so far.
+            final (bool, optional): Whether the sequence is complete. Defaults to False.
+
+        Returns:
+            Optional[Tuple[int, int]]: Start and end of the tokens to vocode, None if the
+                next window is not full yet (or everything was emitted).
+        """
+        if final:
+            if available_tokens <= self.emitted_tokens and self.tail is None:
+                return None
+        elif available_tokens - self.emitted_tokens < self.window_tokens + self.context_tokens:
+            return None
+        return max(0, self.emitted_tokens - self.context_tokens), available_tokens
+
+    def splice(self, wav: np.ndarray, window: Tuple[int, int], final: bool = False) -> np.ndarray:
+        """Audio of a vocoded window that can be played, seamed to the audio already emitted.
+
+        Args:
+            wav (np.ndarray): Vocoder output of the window tokens.
+            window (Tuple[int, int]): Window returned by ``next_window``.
+            final (bool, optional): Whether this is the last window. Defaults to False.
+
+        Returns:
+            np.ndarray: New audio, following the audio returned by the previous call.
+        """
+        start, end = window
+        samples_per_token = len(wav) / max(end - start, 1)
+        # audio before the seam was emitted with the previous window, only its tail overlaps
+        seam = round((self.emitted_tokens - start) * samples_per_token)
+        overlap = 0 if self.tail is None else min(len(self.tail), len(wav) - seam)
+        audio = wav[seam:].astype(np.float32, copy=True)
+        if overlap:
+            fade_in = self.fade_in[:overlap] if overlap == self.crossfade_samples else np.linspace(
+                0.0, 1.0, overlap, dtype=np.float32)
+            audio[:overlap] = self.tail[:overlap] * (1.0 - fade_in) + audio[:overlap] * fade_in
+
+        if final:
+            self.emitted_tokens, self.tail = end, None
+            return audio
+
+        # the last tokens lack the right context, the next window decodes them again
+        self.emitted_tokens = end - self.context_tokens
+        next_seam = round((self.emitted_tokens - start) * samples_per_token) - seam
+        self.tail = audio[next_seam:next_seam + self.crossfade_samples].copy()
+        return audio[:next_seam]
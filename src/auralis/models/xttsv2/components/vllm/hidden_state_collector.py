@@ -1,8 +1,8 @@
+import asyncio
 import threading
 from typing import Optional, Dict, List, Callable
 import torch
-from queue import Queue
-from concurrent.futures import ThreadPoolExecutor
+from cachetools import LRUCache
 
 from auralis.common.logging.logger import setup_logger
 
@@ -36,91 +36,90 @@ class SyncCollectorWrapper:
         """
         self.collector_fn(hidden_states, request_id or self.request_id)
 
+class _CollectionSlot:
+    """Collection state of one request, recycled across requests."""
+    __slots__ = ("loop", "future", "outputs", "expected_states")
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.future: Optional[asyncio.Future] = None
+        self.outputs: List[torch.Tensor] = []
+        self.expected_states = 1
+
+    def reset(self):
+        self.loop = None
+        self.future = None
+        self.outputs.clear()
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
 class HiddenStatesCollector:
     """Thread-safe collector for model hidden states.
     
     This class manages the collection and retrieval of model hidden states during
-    generation, with support for multiple concurrent requests. It provides thread-safe
-    operations and timeout-based retrieval.
+    generation, with support for multiple concurrent requests. A single collector
+    serves the whole engine.
 
-    The collector maintains separate queues and synchronization primitives for each
-    request, allowing for parallel collection of hidden states from different
-    generation processes.
+    Each request waiting for its states gets a slot (taken from a pool of reusable
+    slots) holding an ``asyncio.Future`` of the event loop that waits on it. VLLM
+    collects from its own thread and resolves the future on that loop with
+    ``call_soon_threadsafe``, so waiting never blocks the loop nor needs a thread.
     """
 
     def __init__(self):
-        """Initialize hidden states collector.
-        
-        Sets up thread-safe data structures for collecting and managing hidden states,
-        including locks, events, and output storage for multiple requests.
-        """
-        self.outputs: Dict[str, List[torch.Tensor]] = {}
-        self.collection_ready: Dict[str, threading.Event] = {}
-        self.collection_complete: Dict[str, threading.Event] = {}
-        self.locks: Dict[str, threading.Lock] = {}
+        """Initialize hidden states collector."""
+        self.slots: Dict[str, _CollectionSlot] = {}
+        self.free_slots: List[_CollectionSlot] = []
         self.global_lock = threading.Lock()
         self.logger = setup_logger(__file__)
-        self.states_count: Dict[str, int] = {}
-        self.expected_states: Dict[str, int] = {}
-        self.notifications: Dict[str, Queue] = {}
-        self.executor = ThreadPoolExecutor(max_workers=4)
 
     def initialize_request(self, request_id: str):
         """Initialize collection resources for a new request.
 
-        Sets up all necessary synchronization primitives and storage for a new
-        collection request. This method is thread-safe and idempotent.
+        Must be called from the event loop that will wait for the states.
+        This method is thread-safe and idempotent.
 
         Args:
             request_id (str): Unique identifier for the request.
         """
+        loop = asyncio.get_running_loop()
         with self.global_lock:
-            if request_id not in self.locks:
-                self.locks[request_id] = threading.Lock()
-                self.collection_ready[request_id] = threading.Event()
-                self.collection_complete[request_id] = threading.Event()
-                self.outputs[request_id] = []
-                self.states_count[request_id] = 0
-                self.expected_states[request_id] = 1
-                self.notifications[request_id] = Queue()
-                self.collection_ready[request_id].set()
+            if request_id not in self.slots:
+                slot = self.free_slots.pop() if self.free_slots else _CollectionSlot()
+                slot.loop = loop
+                slot.future = loop.create_future()
+                self.slots[request_id] = slot
                 self.logger.debug(f"Initialized collector for request {request_id}")
 
     def sync_collect(self, hidden_states: Optional[torch.Tensor], request_id: str):
         """Synchronously collect hidden states for a request.
 
         This method is called by VLLM to collect hidden states during generation.
-        It handles the thread-safe storage of states and signals completion when
-        all expected states are collected.
+        It handles the thread-safe storage of states and signals the waiting loop
+        when all expected states are collected.
 
         Args:
             hidden_states (Optional[torch.Tensor]): Hidden states to collect.
             request_id (str): Request identifier.
-
-        Raises:
-            Exception: If there's an error during collection.
         """
-        if request_id not in self.collection_ready:
-            self.logger.error(f"Collector not initialized for request {request_id}")
-            # Initialize on demand if needed
-            self.initialize_request(request_id)
+        if hidden_states is None:
+            self.logger.warning(f"Received None hidden states for request {request_id}")
             return
 
-        try:
-            with self.locks[request_id]:
-                if hidden_states is not None:
-                    self.outputs[request_id].append(hidden_states.clone())
-                    self.states_count[request_id] += 1
-                    self.logger.debug(f"Collected state {self.states_count[request_id]} for request {request_id}")
-
-                    if self.states_count[request_id] >= self.expected_states[request_id]:
-                        self.collection_complete[request_id].set()
-                        self.notifications[request_id].put(True)
-                else:
-                    self.logger.warning(f"Received None hidden states for request {request_id}")
-        except Exception as e:
-            self.logger.error(f"Error collecting hidden states: {e}")
-            raise
+        with self.global_lock:
+            slot = self.slots.get(request_id)
+            if slot is None:
+                # Nobody waits for them anymore (timed out)
+                self.logger.error(f"Collector not initialized for request {request_id}")
+                return
+            slot.outputs.append(hidden_states.clone())
+            self.logger.debug(f"Collected state {len(slot.outputs)} for request {request_id}")
+            if len(slot.outputs) >= slot.expected_states:
+                slot.loop.call_soon_threadsafe(_resolve, slot.future)
 
     async def get_hidden_states(self, request_id: str, timeout: float = 3.0) -> Optional[torch.Tensor]:
         """Retrieve collected hidden states for a request.
@@ -138,52 +137,51 @@ class HiddenStatesCollector:
         Raises:
             ValueError: If no hidden states were collected.
         """
-        try:
-            if request_id not in self.collection_ready:
-                self.logger.error(f"Request {request_id} was never initialized")
-                return None
-
-            # Wait for completion using threading.Event
-            if not self.collection_complete[request_id].wait(timeout):
-                return None
+        slot = self.slots.get(request_id)
+        if slot is None:
+            self.logger.error(f"Request {request_id} was never initialized")
+            return None
 
-            with self.locks[request_id]:
-                outputs = self.outputs.get(request_id, [])
-                if not outputs:
-                    self.logger.critical(f"No hidden states found for request {request_id}") # most likely due to wrong profiling data dimensions
-                    raise ValueError(f"No hidden states found for request {request_id}, "
-                                     f"this should not happen, please open an issue on github")
-
-                try:
-                    result = torch.cat(outputs, dim=0)
-                    self._cleanup_request(request_id)
-                    return result
-                except Exception as e:
-                    self.logger.error(f"Error processing hidden states: {e}")
-                    raise
-
-        except Exception as e:
-            self.logger.error(f"Error retrieving hidden states: {e}")
+        try:
+            await asyncio.wait_for(slot.future, timeout)
+        except asyncio.TimeoutError:
+            self.logger.error(f"Timed out waiting for the hidden states of request {request_id}")
+            self.cleanup_request(request_id)
             return None
+        except asyncio.CancelledError:
+            self.cleanup_request(request_id)
+            raise
+
+        with self.global_lock:
+            outputs = slot.outputs
+            if not outputs:
+                self.logger.critical(f"No hidden states found for request {request_id}") # most likely due to wrong profiling data dimensions
+                self._release(request_id)
+                raise ValueError(f"No hidden states found for request {request_id}, "
+                                 f"this should not happen, please open an issue on github")
+            result = torch.cat(outputs, dim=0)
+            self._release(request_id)
+        return result
+
+    def _release(self, request_id: str):
+        """Return the slot of a request to the pool. Must hold the global lock."""
+        slot = self.slots.pop(request_id, None)
+        if slot is not None:
+            slot.reset()
+            self.free_slots.append(slot)
+            self.logger.debug(f"Cleaned up request {request_id}")
 
-    def _cleanup_request(self, request_id: str):
-        """Clean up resources associated with a completed request.
+    def cleanup_request(self, request_id: str):
+        """Clean up resources associated with a request, if it still holds any.
 
-        This method removes all data structures and synchronization primitives
-        associated with a request to prevent memory leaks.
+        Callers binding a request should call it once they are done with it, whatever the
+        outcome, so a cancelled generation doesn't keep its slot and collected states.
 
         Args:
             request_id (str): Request identifier to clean up.
         """
         with self.global_lock:
-            self.outputs.pop(request_id, None)
-            self.collection_ready.pop(request_id, None)
-            self.collection_complete.pop(request_id, None)
-            self.locks.pop(request_id, None)
-            self.states_count.pop(request_id, None)
-            self.expected_states.pop(request_id, None)
-            self.notifications.pop(request_id, None)
-            self.logger.debug(f"Cleaned up request {request_id}")
+            self._release(request_id)
 
     def bind_to_request(self, request_id: str) -> SyncCollectorWrapper:
         """Create a synchronous collector wrapper for a request.
@@ -203,4 +201,87 @@ class HiddenStatesCollector:
         return SyncCollectorWrapper(
             collector_fn=lambda hs, rid: self.sync_collect(hs, rid),
             request_id=request_id
-        )
\ No newline at end of file
+        )
+
+
+class GenerationHiddenStatesBuffer:
+    """Per-request buffer of the hidden states produced while generating.
+
+    At each sampling step the model appends the hidden state the next token was sampled
+    from, so once a sequence ends its buffer holds one state per generated token: the
+    vocoder input, without prefilling the generated tokens a second time.
+
+    Buffers of requests that never get read (aborted generations) are evicted
+    least recently used first.
+    """
+
+    def __init__(self, max_requests: int = 1024):
+        """Initialize the buffer.
+
+        Args:
+            max_requests (int, optional): Requests buffered at most. Defaults to 1024.
+        """
+        self.states: LRUCache = LRUCache(maxsize=max_requests)
+        self.lock = threading.Lock()
+
+    def append(self, hidden_states: Optional[torch.Tensor], request_id: str):
+        """Append the hidden states of one sampling step of a request.
+
+        Args:
+            hidden_states (Optional[torch.Tensor]): States the step sampled from, one row per token.
+            request_id (str): Request identifier.
+        """
+        if hidden_states is None:
+            return
+        with self.lock:
+            states = self.states.get(request_id)
+            if states is None:
+                states = self.states[request_id] = []
+            states.append(hidden_states.clone())
+
+    def pop(self, request_id: str) -> Optional[torch.Tensor]:
+        """Remove and return the hidden states buffered for a request.
+
+        Args:
+            request_id (str): Request identifier.
+
+        Returns:
+            Optional[torch.Tensor]: Concatenated hidden states, None if nothing was buffered.
+        """
+        with self.lock:
+            states = self.states.pop(request_id, None)
+        if not states:
+            return None
+        return torch.cat(states, dim=0)
+
+    def peek(self, request_id: str) -> Optional[torch.Tensor]:
+        """Return the hidden states buffered for a request so far, keeping them buffered.
+
+        Args:
+            request_id (str): Request identifier.
+
+        Returns:
+            Optional[torch.Tensor]: Concatenated hidden states, None if nothing was buffered.
+        """
+        with self.lock:
+            states = self.states.get(request_id)
+            if not states:
+                return None
+            if len(states) > 1:
+                # concatenate once, the next peek only adds the steps after this one
+                states[:] = [torch.cat(states, dim=0)]
+            return states[0]
+
+    def bind_to_request(self, request_id: str) -> SyncCollectorWrapper:
+        """Create a collector wrapper appending to the buffer of a request.
+
+        Args:
+            request_id (str): Request identifier.
+
+        Returns:
+            SyncCollectorWrapper: Wrapper for the model to call at each sampling step.
+        """
+        return SyncCollectorWrapper(
+            collector_fn=lambda hs, rid: self.append(hs, rid),
+            request_id=request_id
+        )
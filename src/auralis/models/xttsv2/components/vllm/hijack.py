@@ -3,7 +3,7 @@ from typing import List, Optional
 import torch
 from vllm import SamplingParams
 
-from auralis.models.xttsv2.components.vllm.hidden_state_collector import HiddenStatesCollector
+from auralis.models.xttsv2.components.vllm.hidden_state_collector import HiddenStatesCollector, SyncCollectorWrapper
 
 
 class ExtendedSamplingParams(SamplingParams, kw_only=True):
@@ -16,10 +16,16 @@ class ExtendedSamplingParams(SamplingParams, kw_only=True):
     Attributes:
         hidden_state_collector (Optional[HiddenStatesCollector]): Collector for model's
             hidden states during generation.
+        generation_state_collector (Optional[SyncCollectorWrapper]): Collector receiving,
+            at each sampling step, the hidden state the next token is sampled from.
         request_id (Optional[str]): Unique identifier for the generation request.
+        batched_repetition_penalty (Optional[float]): Repetition penalty applied by the model
+            to the whole batch at once, see ``BatchedRepetitionPenalizer``.
     """
     hidden_state_collector: Optional[HiddenStatesCollector] = None
+    generation_state_collector: Optional[SyncCollectorWrapper] = None
     request_id: Optional[str] = None
+    batched_repetition_penalty: Optional[float] = None
 
 
 class LogitsRepetitionPenalizer:
@@ -0,0 +1,53 @@
+import hashlib
+import uuid
+from typing import List
+
+import torch
+
+# Rows of the GPT conditioning shared by every sentence of a voice: the perceiver latents
+CONDITIONING_PREFIX_LENGTH = 32
+
+# Placeholder ids are above the audio vocabulary, so they never collide with real tokens
+_PLACEHOLDER_ID_RANGE = 2 ** 62
+
+
+def conditioning_placeholder_ids(conditioning: torch.Tensor,
+                                 first_id: int,
+                                 prefix_length: int = CONDITIONING_PREFIX_LENGTH) -> List[int]:
+    """Placeholder prompt ids standing for the rows of a GPT conditioning.
+
+    VLLM's prefix caching identifies KV blocks by the prompt ids only. Deriving the ids of
+    the voice prefix from its content and the ids of the rest from the whole conditioning,
+    equal conditionings get equal prompts and share their KV blocks, while different ones
+    never do.
+
+    Args:
+        conditioning (torch.Tensor): Conditioning rows (voice latents then text embeddings).
+        first_id (int): Smallest placeholder id, above the model vocabulary.
+        prefix_length (int, optional): Rows of the voice prefix. Defaults to 32.
+
+    Returns:
+        List[int]: One placeholder id per conditioning row.
+    """
+    conditioning = conditioning.reshape(-1, conditioning.shape[-1])
+    data = conditioning.detach().to("cpu", torch.float32).numpy()
+    prefix_length = min(prefix_length, data.shape[0])
+
+    digest = hashlib.blake2b(data[:prefix_length].tobytes(), digest_size=8)
+    prefix_id = first_id + int.from_bytes(digest.digest(), "little") % _PLACEHOLDER_ID_RANGE
+    digest.update(data[prefix_length:].tobytes())
+    content_id = first_id + int.from_bytes(digest.digest(), "little") % _PLACEHOLDER_ID_RANGE
+    return [prefix_id] * prefix_length + [content_id] * (data.shape[0] - prefix_length)
+
+
+def unique_placeholder_ids(length: int, first_id: int) -> List[int]:
+    """Placeholder prompt ids no other prompt shares, for requests that must not hit the prefix cache.
+
+    Args:
+        length (int): Number of ids.
+        first_id (int): Smallest placeholder id, above the model vocabulary.
+
+    Returns:
+        List[int]: ``length`` times the same fresh id.
+    """
+    return [first_id + uuid.uuid4().int % _PLACEHOLDER_ID_RANGE] * length
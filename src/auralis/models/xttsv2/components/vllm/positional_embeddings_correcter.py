@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import torch
+
+PrefillLength= Union[int, List[int]]
+TokenPosition= Union[int, List[int]]
+TokenId = Union[Union[torch.Tensor,int], List[Union[torch.Tensor,int]]]
+
+# Token ids take the low bits of a key, positions the high ones
+_TOKEN_BITS = 32
+
+
+def _token_key(token_id: int, position_id: int) -> int:
+    """Pack a token-position pair into a single int dictionary key."""
+    return (position_id << _TOKEN_BITS) | token_id
+
+
+@dataclass
+class TokenPositionAndPrefillTuple:
+    prefill_len: Optional[PrefillLength] = None
+    pos_id: Optional[TokenPosition] = None
+    token_id: Optional[TokenId] = None
+
+    def update_(self,
+                prefill_len: Optional[PrefillLength] = None,
+                pos_id: Optional[TokenPosition] = None,
+                token_id: Optional[TokenId] = None):
+        if prefill_len is not None:
+            self.prefill_len=prefill_len
+        if pos_id is not None:
+            self.pos_id=pos_id
+        if token_id is not None:
+            self.token_id= token_id
+        return self
+
+
+class PositionalEmbeddingsCorrecter:
+    """Corrects positional embeddings for XTTS model,
+    since they have a different length than the text embeddings.
+    This class tracks tokens both by request_id and position for vLLM compatibility.
+
+    Each request has at most one token-position pair mapped to it (the last token it
+    sampled), kept in a reverse index so that replacing it at each decoding step does not
+    depend on the number of running requests.
+    """
+
+    def __init__(self):
+        # Maps request_id to its prefill length
+        self.request_tracker_dict: Dict[str, TokenPositionAndPrefillTuple] = {}
+        # Maps packed token_position pairs to their request_id
+        self.token_to_request: Dict[int, str] = {}
+        # Maps request_id to its packed token_position pair
+        self.request_to_token: Dict[str, int] = {}
+
+    def _map_token(self, request_id: str, token_id: int, position_id: int):
+        """Map a token-position pair to a request_id, replacing its previous pair."""
+        self._invalidate_previous_mapping(request_id)
+        token_key = _token_key(token_id, position_id)
+        self.token_to_request[token_key] = request_id
+        self.request_to_token[request_id] = token_key
+
+    def init_request_id_prefill(self, request_id: str, prefill_len: PrefillLength, nex_token: torch.Tensor):
+        """Initialize a request_id with its prefill length."""
+        self.request_tracker_dict[request_id] = TokenPositionAndPrefillTuple(prefill_len, prefill_len)
+        self._map_token(request_id, int(nex_token), prefill_len)
+
+    def get_by_request_id(self, request_id: str) -> TokenPositionAndPrefillTuple:
+        """Retrieve the prefill length for a given request_id."""
+        return self.request_tracker_dict.get(request_id, None)
+
+    def get_by_next_token(self,
+                          next_token_ids: List[int],
+                          next_position_ids: List[int]
+                          ) -> List[Optional[TokenPositionAndPrefillTuple]]:
+        """Retrieve prefill lengths for given token and position pairs.
+
+        Args:
+            next_token_ids: List of token IDs
+            next_position_ids: List of position IDs, corresponding to token IDs
+
+        Returns:
+            List of prefill lengths for each token-position pair
+
+        Raises:
+            ValueError: If no valid token mappings are found
+        """
+        assert len(next_token_ids) == len(next_position_ids), "Token and position lists must have the same length"
+        if len(next_token_ids) == 0:
+            return []
+        lookup = self.token_to_request.get
+        request_ids = [lookup(_token_key(next_token_id, next_position_id))
+                       for next_token_id, next_position_id in zip(next_token_ids, next_position_ids)]
+        prefill_lengths = [
+            self.request_tracker_dict[request_id].update_(token_id=next_token_id)
+            for request_id, next_token_id in zip(request_ids, next_token_ids)
+            if request_id is not None
+        ]
+
+        if not prefill_lengths:
+            raise ValueError("No valid mappings found for token pairs")
+        return prefill_lengths
+
+    def _invalidate_previous_mapping(self, request_id: str):
+        """Remove the token mapping associated with a given request_id.
+
+        This prevents memory leaks from old token mappings and ensures
+        we don't have stale token-to-request associations.
+        """
+        token_key = self.request_to_token.pop(request_id, None)
+        # Another request may have mapped the same pair since
+        if token_key is not None and self.token_to_request.get(token_key) == request_id:
+            del self.token_to_request[token_key]
+
+    def _get_pos_id_and_update (self, request_id: str):
+        """Get the position ID for a given request_id and update it."""
+        tuple_prefill_token = self.get_by_request_id(request_id)
+        # Update the position ID
+        self.request_tracker_dict[request_id] = TokenPositionAndPrefillTuple(tuple_prefill_token.prefill_len, tuple_prefill_token.pos_id + 1)
+        return tuple_prefill_token.pos_id + 1
+
+
+    def associate_new_tokens(self, request_id: str, next_token_id: int):
+        """Associate a new token-position pair with a request_id.
+
+        Before creating the new association, it removes the previous
+        token mapping for this request_id to maintain consistency.
+
+        Args:
+            request_id: The request identifier
+            next_token_id: The token ID to associate
+        """
+        pos_id = self._get_pos_id_and_update(request_id)
+        self._map_token(request_id, next_token_id, pos_id)
+
+    def clear_request(self, request_id: str):
+        """Remove all data associated with a request_id.
+
+        This includes both the prefill length tracking and any token mappings.
+        """
+        if request_id in self.request_tracker_dict:
+            # First remove all token mappings
+            self._invalidate_previous_mapping(request_id)
+            # Then remove the request tracking
+            del self.request_tracker_dict[request_id]
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import torch
+
+# XTTS fills the prompt with 1s, prefix caching placeholder ids (above the vocabulary) stand for them
+PROMPT_PLACEHOLDER_TOKEN = 1
+
+
+class BatchedRepetitionPenalizer:
+    """Repetition penalty applied to all the sequences of a batch at once.
+
+    Same penalty as [`LogitsRepetitionPenalizer`][auralis.models.xttsv2.components.vllm.hijack.LogitsRepetitionPenalizer]
+    (positive logits of the tokens already in the prompt or the generated sequence are divided by
+    the penalty, negative ones multiplied), but instead of rebuilding the token list of every
+    sequence at every step, it keeps on the device a token presence mask per sequence, updated
+    with the new tokens only, and penalizes the whole logits matrix in a few tensor operations.
+
+    Sequences ask for it with the ``batched_repetition_penalty`` field of their sampling params.
+    Masks of sequences that stopped coming (finished or aborted) are recycled least recently
+    used first.
+    """
+
+    def __init__(self, vocab_size: int, max_sequences: int = 256):
+        """Initialize the penalizer.
+
+        Args:
+            vocab_size (int): Size of the logits rows.
+            max_sequences (int, optional): Sequences with a mask at the same time, at least the
+                sequences of a batch. Defaults to 256.
+        """
+        self.vocab_size = vocab_size
+        self.max_sequences = max_sequences
+        # Row 0 of the presence mask is never set, rows without penalty point to it
+        self.presence: Optional[torch.Tensor] = None
+        self.slots: "OrderedDict[int, int]" = OrderedDict()  # seq_id -> row of the presence mask
+        self.seen_tokens: Dict[int, int] = {}  # seq_id -> tokens already in its row
+
+    def _get_presence(self, device: torch.device) -> torch.Tensor:
+        if self.presence is None or self.presence.device != device:
+            self.presence = torch.zeros((self.max_sequences + 1, self.vocab_size), dtype=torch.bool, device=device)
+            self.slots.clear()
+            self.seen_tokens.clear()
+        return self.presence
+
+    def _slot(self, seq_id: int, presence: torch.Tensor) -> int:
+        """Row of a sequence, recycling the least recently used one if they are all taken."""
+        slot = self.slots.get(seq_id)
+        if slot is not None:
+            self.slots.move_to_end(seq_id)
+            return slot
+        if len(self.slots) < self.max_sequences:
+            slot = len(self.slots) + 1
+        else:
+            evicted, slot = self.slots.popitem(last=False)
+            self.seen_tokens.pop(evicted, None)
+            presence[slot] = False
+        self.slots[seq_id] = slot
+        self.seen_tokens[seq_id] = 0
+        return slot
+
+    @staticmethod
+    def _new_tokens(seq_data, seen: int) -> List[int]:
+        """Tokens of a sequence (prompt and generated) not in its row yet."""
+        new = seq_data.get_len() - seen
+        if new == 1:
+            return [seq_data.get_last_token_id()]
+        return list(seq_data.get_token_ids()[seen:]) if new > 0 else []
+
+    def __call__(self, logits: torch.Tensor, sampling_metadata) -> torch.Tensor:
+        """Penalize the logits of the batch.
+
+        Args:
+            logits (torch.Tensor): Logits of the sampled positions, one row per sample index.
+            sampling_metadata (SamplingMetadata): Sequence groups of the batch.
+
+        Returns:
+            torch.Tensor: The penalized logits.
+        """
+        groups = [
+            seq_group for seq_group in sampling_metadata.seq_groups
+            if seq_group.do_sample
+            and getattr(seq_group.sampling_params, 'batched_repetition_penalty', None) not in (None, 1.0)
+        ]
+        if not groups:
+            return logits
+
+        presence = self._get_presence(logits.device)
+        rows, row_slots, row_penalties = [], [], []
+        update_slots, update_tokens = [], []
+        for seq_group in groups:
+            penalty = seq_group.sampling_params.batched_repetition_penalty
+            for seq_id, row in zip(seq_group.seq_ids, seq_group.sample_indices):
+                slot = self._slot(seq_id, presence)
+                tokens = self._new_tokens(seq_group.seq_data[seq_id], self.seen_tokens[seq_id])
+                self.seen_tokens[seq_id] += len(tokens)
+                if len(tokens) > 1:
+                    tokens = [token if token < self.vocab_size else PROMPT_PLACEHOLDER_TOKEN for token in tokens]
+                update_slots.extend([slot] * len(tokens))
+                update_tokens.extend(tokens)
+                rows.append(row)
+                row_slots.append(slot)
+                row_penalties.append(penalty)
+
+        if update_tokens:
+            presence[torch.tensor(update_slots, device=logits.device),
+                     torch.tensor(update_tokens, device=logits.device)] = True
+
+        rows = torch.tensor(rows, device=logits.device)
+        penalties = torch.tensor(row_penalties, device=logits.device, dtype=logits.dtype).unsqueeze(1)
+        repeated = presence[torch.tensor(row_slots, device=logits.device)]
+        selected_logits = logits[rows]
+        penalized = torch.where(selected_logits > 0, selected_logits / penalties, selected_logits * penalties)
+        logits[rows] = torch.where(repeated, penalized, selected_logits)
+        return logits
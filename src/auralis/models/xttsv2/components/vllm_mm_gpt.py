@@ -1,7 +1,6 @@
 import functools
 import random
 from array import array
-from dataclasses import dataclass
 
 import torch
 import torch.nn as nn
@@ -31,136 +30,12 @@ from vllm.sequence import IntermediateTensors, SequenceData, VLLM_TOKEN_ID_ARRAY
 from vllm.model_executor.models.interfaces import SupportsMultiModal, SupportsPP
 
 from typing import Dict, List
-from collections import defaultdict
 
 from vllm.utils import is_list_of
 
-PrefillLength= Union[int, List[int]]
-TokenPosition= Union[int, List[int]]
-TokenId = Union[Union[torch.Tensor,int], List[Union[torch.Tensor,int]]]
-
-@dataclass
-class TokenPositionAndPrefillTuple:
-    prefill_len: Optional[PrefillLength] = None
-    pos_id: Optional[TokenPosition] = None
-    token_id: Optional[TokenId] = None
-
-    def update_(self,
-                prefill_len: Optional[PrefillLength] = None,
-                pos_id: Optional[TokenPosition] = None,
-                token_id: Optional[TokenId] = None):
-        if prefill_len is not None:
-            self.prefill_len=prefill_len
-        if pos_id is not None:
-            self.pos_id=pos_id
-        if token_id is not None:
-            self.token_id= token_id
-        return self
-
-
-class PositionalEmbeddingsCorrecter:
-    """Corrects positional embeddings for XTTS model,
-    since they have a different length than the text embeddings.
-    This class tracks tokens both by request_id and position for vLLM compatibility.
-    """
-
-    def __init__(self):
-        # Maps request_id to its prefill length
-        self.request_tracker_dict: Dict[str, TokenPositionAndPrefillTuple] = defaultdict(lambda: TokenPositionAndPrefillTuple())
-        # Maps token_position pairs to their request_id
-        self.token_to_request: Dict[str, str] = {}
-
-    def init_request_id_prefill(self, request_id: str, prefill_len: PrefillLength, nex_token: torch.Tensor):
-        """Initialize a request_id with its prefill length."""
-        self.request_tracker_dict[request_id] = TokenPositionAndPrefillTuple(prefill_len, prefill_len)
-        self.token_to_request[f"{nex_token}_{prefill_len}"] = request_id
-
-    def get_by_request_id(self, request_id: str) -> TokenPositionAndPrefillTuple:
-        """Retrieve the prefill length for a given request_id."""
-        return self.request_tracker_dict.get(request_id, None)
-
-    def get_by_next_token(self,
-                          next_token_ids: List[int],
-                          next_position_ids: List[int]
-                          ) -> List[Optional[TokenPositionAndPrefillTuple]]:
-        """Retrieve prefill lengths for given token and position pairs.
-
-        Args:
-            next_token_ids: List of token IDs
-            next_position_ids: List of position IDs, corresponding to token IDs
-
-        Returns:
-            List of prefill lengths for each token-position pair
-
-        Raises:
-            ValueError: If no valid token mappings are found
-        """
-        prefill_lengths = []
-        assert len(next_token_ids) == len(next_position_ids), "Token and position lists must have the same length"
-        if len(next_token_ids) == 0:
-            return prefill_lengths
-        for next_token_id, next_position_id in zip(next_token_ids, next_position_ids):
-            token_key = f"{next_token_id}_{next_position_id}"
-            if token_key in self.token_to_request:
-                request_id = self.token_to_request[token_key]
-                prefill_lengths.append(self.request_tracker_dict[request_id].update_(token_id=next_token_id))
-
-        if not prefill_lengths:
-            raise ValueError(f"No valid mappings found for token pairs")
-        return prefill_lengths
-
-    def _invalidate_previous_mapping(self, request_id: str):
-        """Remove all token mappings associated with a given request_id.
-
-        This prevents memory leaks from old token mappings and ensures
-        we don't have stale token-to-request associations.
-        """
-        # Find all token keys that map to this request_id
-        keys_to_remove = [
-            token_key for token_key, req_id in self.token_to_request.items()
-            if req_id == request_id
-        ]
-
-        # Remove all found mappings
-        for token_key in keys_to_remove:
-            del self.token_to_request[token_key]
+from .vllm.positional_embeddings_correcter import PositionalEmbeddingsCorrecter
+from .vllm.repetition_penalty import BatchedRepetitionPenalizer
 
-    def _get_pos_id_and_update (self, request_id: str):
-        """Get the position ID for a given request_id and update it."""
-        tuple_prefill_token = self.get_by_request_id(request_id)
-        # Update the position ID
-        self.request_tracker_dict[request_id] = TokenPositionAndPrefillTuple(tuple_prefill_token.prefill_len, tuple_prefill_token.pos_id + 1)
-        return tuple_prefill_token.pos_id + 1
-
-
-    def associate_new_tokens(self, request_id: str, next_token_id: int):
-        """Associate a new token-position pair with a request_id.
-
-        Before creating the new association, it removes all previous
-        token mappings for this request_id to maintain consistency.
-
-        Args:
-            request_id: The request identifier
-            next_token_id: The token ID to associate
-        """
-        pos_id = self._get_pos_id_and_update(request_id)
-
-        # Clean up old mappings first
-        self._invalidate_previous_mapping(request_id)
-
-        # Create new mapping
-        self.token_to_request[f"{next_token_id}_{pos_id}"] = request_id
-
-    def clear_request(self, request_id: str):
-        """Remove all data associated with a request_id.
-
-        This includes both the prefill length tracking and any token mappings.
-        """
-        if request_id in self.request_tracker_dict:
-            # First remove all token mappings
-            self._invalidate_previous_mapping(request_id)
-            # Then remove the request tracking
-            del self.request_tracker_dict[request_id]
 
 class LearnedPositionEmbeddings(nn.Module):
     def __init__(self, seq_len, model_dim, init=0.02, relative=False, supports_pp=False):
@@ -320,11 +195,13 @@ def input_processor_for_xtts2_gpt(ctx: InputContext, inputs: DecoderOnlyInputs):
 
     prompt_token_ids = inputs.get("prompt_token_ids")
 
+    # we fill everything with 1 since we don't actually needs text token ids, it would mess up in the sampling step,
+    # unless the engine gave ids identifying the conditioning, for the prefix caching
+    placeholder_ids = audio_dict.get("placeholder_ids") or [1] * audio.shape[0]
     if not is_last_decoding_pass:
-        # we fill everything with 1 since we don't actually needs text token ids, it would mess up in the sampling step
-        new_token_ids = ([1] * (audio.shape[0])) + [ctx.model_config.hf_config.start_audio_token] # add the start audio generation token
+        new_token_ids = placeholder_ids + [ctx.model_config.hf_config.start_audio_token] # add the start audio generation token
     else:
-        new_token_ids = ([1] * audio.shape[0]) + prompt_token_ids
+        new_token_ids = placeholder_ids + prompt_token_ids
     # the encoding had already been done externally to reuse the embeddings for later use but we
     # account for the new token that will be added before generation
     new_prompt = None
@@ -382,6 +259,10 @@ class XttsGPT(nn.Module, SupportsMultiModal, SupportsPP):
         self.sampler = Sampler()
 
         self.positional_embeddings_correcter = PositionalEmbeddingsCorrecter()
+        self.repetition_penalizer = BatchedRepetitionPenalizer(
+            self.gpt_config.num_audio_tokens,
+            max_sequences=2 * vllm_config.scheduler_config.max_num_seqs
+        )
 
     @staticmethod
     def _check_is_logits_only_mode(is_logits_only_mode) -> torch.Tensor:
@@ -446,6 +327,21 @@ class XttsGPT(nn.Module, SupportsMultiModal, SupportsPP):
         # Calculate the sequence lengths
         return last_jumps
 
+    @staticmethod
+    def _cached_prefix_lengths(end_markers: torch.Tensor,
+                               attn_metadata: Optional[AttentionMetadata]) -> List[int]:
+        """Tokens of the prompt ending at each end marker whose KV came from the prefix cache.
+
+        The attention metadata has, for each sequence of the batch, the start of its tokens
+        and how many tokens it had already computed, i.e. found in the prefix cache for a prompt.
+        """
+        query_start_loc = getattr(attn_metadata, "query_start_loc", None)
+        context_lens = getattr(attn_metadata, "context_lens_tensor", None)
+        if query_start_loc is None or context_lens is None:
+            return [0] * len(end_markers)
+        sequences = torch.searchsorted(query_start_loc[1:], end_markers.to(query_start_loc.dtype), right=True)
+        return context_lens[sequences].tolist()
+
     def _maybe_correct_positions(self,
                                  input_ids: torch.Tensor,
                                  positions: torch.Tensor,
@@ -501,8 +397,9 @@ class XttsGPT(nn.Module, SupportsMultiModal, SupportsPP):
                                   conditioning_inputs_list: List[torch.Tensor],
                                   is_logit_only_mode: torch.Tensor,
                                   seq_len: Union[torch.Tensor],
-                                  is_profiling_run: bool = False
-                                  ) -> Tuple[List[int], torch.Tensor, torch.Tensor]:
+                                  is_profiling_run: bool = False,
+                                  attn_metadata: Optional[AttentionMetadata] = None,
+                                  ) -> Tuple[List[int], torch.Tensor, torch.Tensor, List[torch.Tensor]]:
         """
         Apply different ops to the tensors sequence in the batch
         Returns:
@@ -511,9 +408,10 @@ class XttsGPT(nn.Module, SupportsMultiModal, SupportsPP):
             - A mask to reinsert the tokens in the correct position for the logit only mode
             - Modified input IDs
             - Modified positions
+            - The conditioning inputs to insert, without the rows whose KV came from the prefix cache
         """
         if is_profiling_run:
-            return [], input_ids, positions
+            return [], input_ids, positions, conditioning_inputs_list
 
         # Pre-allocate lists for better memory efficiency
         starting_indexes = []
@@ -523,7 +421,7 @@ class XttsGPT(nn.Module, SupportsMultiModal, SupportsPP):
 
         if len(end_markers) == 0:
             positions = self._maybe_correct_positions(input_ids, positions, conditioning_inputs_list)
-            return [], input_ids, positions
+            return [], input_ids, positions, conditioning_inputs_list
 
         # Create mask for valid conditioning inputs
         cond_latent_mask = torch.tensor([
@@ -539,16 +437,22 @@ class XttsGPT(nn.Module, SupportsMultiModal, SupportsPP):
             else 0 for cond in conditioning_inputs_list
         ], device=input_ids.device)
 
+        # With prefix caching, the placeholders (and rows) of the cached part of a prompt are not in the batch
+        cached_lengths = self._cached_prefix_lengths(end_markers, attn_metadata)
+        conditioning_inputs_list = list(conditioning_inputs_list)
+
         # Create masks for efficient tensor operations
         keep_mask = torch.ones(len(input_ids), dtype=torch.bool, device=input_ids.device)
         non_logit_mask = torch.ones_like(keep_mask)
 
         cumulative_offset = 0
 
-        for idx, end_marker in zip(effective_indexes, end_markers):
+        for idx, end_marker, cached_length in zip(effective_indexes, end_markers, cached_lengths):
+            if cached_length > 0:
+                conditioning_inputs_list[idx] = conditioning_inputs_list[idx][..., cached_length:, :]
             # Calculate effective positions
             end_pos = end_marker.item() - cumulative_offset
-            start_pos = end_pos - sequence_lengths[idx].item()
+            start_pos = end_pos - (sequence_lengths[idx].item() - cached_length)
             start_pos_for_masking = start_pos + cumulative_offset
 
             # Store original starting index
@@ -607,7 +511,7 @@ class XttsGPT(nn.Module, SupportsMultiModal, SupportsPP):
         modified_positions = positions[keep_mask]
         assert (modified_positions < 608).all()
         assert (modified_positions >= 0).all()
-        return starting_indexes, modified_input_ids, modified_positions
+        return starting_indexes, modified_input_ids, modified_positions, conditioning_inputs_list
 
 
     # noinspection PyMethodOverriding
@@ -637,12 +541,15 @@ class XttsGPT(nn.Module, SupportsMultiModal, SupportsPP):
 
         is_logits_only_mode = self._check_is_logits_only_mode(is_logits_only_mode)
 
-        starting_sequence_start_ids, input_ids, positions = self._apply_op_to_seq_in_batch(input_ids,
-                                                                                           positions,
-                                                                                           cond_latents,
-                                                                                           is_logits_only_mode,
-                                                                                           sequence_length,
-                                                                                           is_profiling_run)
+        starting_sequence_start_ids, input_ids, positions, cond_latents = self._apply_op_to_seq_in_batch(
+            input_ids,
+            positions,
+            cond_latents,
+            is_logits_only_mode,
+            sequence_length,
+            is_profiling_run,
+            attn_metadata
+        )
 
 
         hidden_states = self.gpt(
@@ -672,9 +579,19 @@ class XttsGPT(nn.Module, SupportsMultiModal, SupportsPP):
 
         # we keep track of the last collected index to properly associate the hidden states with the correct request_id
         last_collected_idx = 0
+        sampled_hidden_states = None
         for seq in sampling_metadata.seq_groups:
             # Check if we need to collect hidden states
             sampling_params = seq.sampling_params
+            generation_state_collector = getattr(sampling_params, 'generation_state_collector', None)
+            if generation_state_collector is not None and seq.do_sample:
+                # the state the next token is sampled from, i.e. the one the vocoder needs for it
+                if sampled_hidden_states is None:
+                    sampled_hidden_states = hidden_states.index_select(
+                        0, sampling_metadata.selected_token_indices
+                    )
+                generation_state_collector(sampled_hidden_states[seq.sample_indices])  # The request_id is already bound
+
             if (hasattr(sampling_params, 'hidden_state_collector')
                     and sampling_params.hidden_state_collector is not None):
                 self.positional_embeddings_correcter.clear_request(sampling_params.request_id)
@@ -685,6 +602,8 @@ class XttsGPT(nn.Module, SupportsMultiModal, SupportsPP):
 
         # Compute logits using the mel_head
         logits = self.logits_processor(self.mel_head, hidden_states, sampling_metadata, self.mel_head.bias)
+        if logits is not None:
+            logits = self.repetition_penalizer(logits, sampling_metadata)
         return logits
 
     # noinspection PyUnresolvedReferences
@@ -732,6 +651,55 @@ class XttsGPT(nn.Module, SupportsMultiModal, SupportsPP):
             (f"Missing weights: {set(params_dict.keys()) - loaded_names}, "
              f"this probably means you are using an incompatible model, \n\nyour model has this weights: {set(params_dict.keys())}")
 
+def _conditioning_layout(num_tokens: int,
+                         insertion_ids: List[int],
+                         block_lengths: List[int]) -> Tuple[List[int], List[int], List[int], List[int]]:
+    """Compute where rows land when blocks are inserted in turn into a sequence of token rows.
+
+    Block ``k`` (``block_lengths[k]`` rows) goes at index ``insertion_ids[k]`` of the sequence
+    as it is after inserting blocks ``0..k-1``, like ``cat([rows[:i], block, rows[i:]])``.
+
+    Args:
+        num_tokens (int): Token rows before any insertion.
+        insertion_ids (List[int]): Insertion index of each block.
+        block_lengths (List[int]): Rows of each block.
+
+    Returns:
+        Tuple: Shift and count of each run of token rows (in token order), then the shift and
+            count of each run of block rows (in the order of the blocks concatenated), so that
+            a row ends at its index in the runs plus the shift of its run.
+    """
+    # Runs of the final layout: (-1 for the token rows or the block index, first row, rows)
+    runs = [(-1, 0, num_tokens)]
+    for block, (insertion_idx, block_length) in enumerate(zip(insertion_ids, block_lengths)):
+        position = 0
+        for i, (source, first, rows) in enumerate(runs):
+            if insertion_idx < position + rows:
+                before = insertion_idx - position
+                split = [(source, first, before)] if before > 0 else []
+                runs[i:i + 1] = split + [(block, 0, block_length), (source, first + before, rows - before)]
+                break
+            position += rows
+        else:
+            runs.append((block, 0, block_length))
+
+    block_offsets = [0]
+    for block_length in block_lengths:
+        block_offsets.append(block_offsets[-1] + block_length)
+
+    token_runs, block_runs = [], []
+    destination = 0
+    for source, first, rows in runs:
+        if source < 0:
+            token_runs.append((destination - first, rows))
+        else:
+            block_runs.append((block_offsets[source] + first, destination, rows))
+        destination += rows
+    block_runs.sort()
+    return ([shift for shift, _ in token_runs], [rows for _, rows in token_runs],
+            [destination - first for first, destination, _ in block_runs], [rows for _, _, rows in block_runs])
+
+
 class GPT2Model(nn.Module):
 
     def __init__(
@@ -770,19 +738,44 @@ class GPT2Model(nn.Module):
                                                 start_of_generation_embed: Optional[torch.Tensor],
                                                 insertion_ids: List[int],
                                                 is_logit_only: torch.Tensor) -> torch.Tensor:
-        empty_tensor = torch.empty(
-            (0,hidden_states.shape[-1]),
-            device=hidden_states.device, dtype=hidden_states.dtype
+        """Insert each conditioning input (followed by the start of generation embedding outside
+        the logit only mode) at its insertion index, in turn.
+
+        The final layout is computed on the indexes first, so every row is written once into
+        a preallocated tensor instead of copying the whole batch for each inserted sequence.
+        """
+        blocks, block_lengths = [], []
+        for idx, conditioning_input in enumerate(conditioning_inputs[:len(insertion_ids)]):
+            block = [conditioning_input.squeeze(0)]
+            if not is_logit_only[idx]:
+                block.append(start_of_generation_embed)
+            blocks.extend(block)
+            block_lengths.append(sum(part.shape[0] for part in block))
+        if not blocks:
+            return hidden_states
+        if len(block_lengths) == 1:
+            # a single copy either way, cast like the blocks below so cat doesn't promote the dtype
+            blocks = [block.to(hidden_states.dtype) for block in blocks]
+            return torch.cat([hidden_states[:insertion_ids[0]], *blocks, hidden_states[insertion_ids[0]:]], dim=0)
+        block_states = torch.cat(blocks, dim=0).to(hidden_states.dtype)
+
+        token_shifts, token_counts, block_shifts, block_counts = _conditioning_layout(
+            hidden_states.shape[0], insertion_ids, block_lengths
+        )
+        device = hidden_states.device
+        token_destinations = torch.arange(hidden_states.shape[0], device=device) + torch.repeat_interleave(
+            torch.tensor(token_shifts, device=device), torch.tensor(token_counts, device=device),
+            output_size=hidden_states.shape[0]
+        )
+        block_destinations = torch.arange(block_states.shape[0], device=device) + torch.repeat_interleave(
+            torch.tensor(block_shifts, device=device), torch.tensor(block_counts, device=device),
+            output_size=block_states.shape[0]
         )
-        for idx, (inserion_idx, conditioning_input) in enumerate(zip(insertion_ids, conditioning_inputs)):
-                hidden_states = torch.cat([
-                hidden_states[:inserion_idx],
-                conditioning_input.squeeze(0),
-                (start_of_generation_embed if ~is_logit_only[idx] else empty_tensor),
-                hidden_states[inserion_idx:]], dim=0
-            )
 
-        return hidden_states
+        merged = hidden_states.new_empty((hidden_states.shape[0] + block_states.shape[0], hidden_states.shape[-1]))
+        merged.index_copy_(0, token_destinations, hidden_states)
+        merged.index_copy_(0, block_destinations, block_states)
+        return merged
 
     def forward(
             self,
@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+CHUNKING_MODES = ("characters", "balanced")
+
+
+@dataclass
+class DurationModel:
+    """Linear prediction of the audio tokens generated for a chunk from its text tokens.
+
+    The defaults are rough XTTS averages; ``fit`` refits them on observed generations.
+
+    Attributes:
+        audio_tokens_per_text_token (float): Audio tokens generated per text token.
+        base_audio_tokens (float): Audio tokens generated for any chunk (pauses, breath).
+    """
+    audio_tokens_per_text_token: float = 2.4
+    base_audio_tokens: float = 12.0
+
+    def predict(self, text_tokens: int) -> float:
+        """Predict the audio tokens of a chunk.
+
+        Args:
+            text_tokens (int): Text tokens of the chunk, without special tokens.
+
+        Returns:
+            float: Predicted audio tokens.
+        """
+        return self.base_audio_tokens + self.audio_tokens_per_text_token * text_tokens
+
+    @classmethod
+    def fit(cls, text_tokens: Sequence[int], audio_tokens: Sequence[int]) -> "DurationModel":
+        """Least squares fit on observed chunks.
+
+        Args:
+            text_tokens (Sequence[int]): Text tokens of each chunk.
+            audio_tokens (Sequence[int]): Audio tokens generated for each chunk.
+
+        Returns:
+            DurationModel: Fitted model.
+        """
+        n = len(text_tokens)
+        mean_x = sum(text_tokens) / n
+        mean_y = sum(audio_tokens) / n
+        var_x = sum((x - mean_x) ** 2 for x in text_tokens)
+        if var_x == 0:
+            return cls(audio_tokens_per_text_token=mean_y / mean_x if mean_x else 0.0, base_audio_tokens=0.0)
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(text_tokens, audio_tokens)) / var_x
+        return cls(audio_tokens_per_text_token=slope, base_audio_tokens=mean_y - slope * mean_x)
+
+
+def _chunk_tokens(token_counts: Sequence[int], start: int, end: int) -> int:
+    # Sentences of a chunk are joined by a space, one more token each
+    return sum(token_counts[start:end]) + end - start - 1
+
+
+def _pack(token_counts: Sequence[int],
+          max_chunk_tokens: int,
+          max_duration: float,
+          duration_model: DurationModel) -> List[Tuple[int, int]]:
+    """Greedily pack consecutive sentences into chunks under a token and a duration bound."""
+    chunks = []
+    start = 0
+    for end in range(1, len(token_counts) + 1):
+        tokens = _chunk_tokens(token_counts, start, end)
+        if end - start > 1 and (tokens > max_chunk_tokens or duration_model.predict(tokens) > max_duration):
+            chunks.append((start, end - 1))
+            start = end - 1
+    chunks.append((start, len(token_counts)))
+    return chunks
+
+
+def balance_chunks(token_counts: Sequence[int],
+                   max_chunk_tokens: int,
+                   duration_model: DurationModel,
+                   chunk_count: Optional[int] = None,
+                   iterations: int = 30) -> List[Tuple[int, int]]:
+    """Group consecutive sentences into chunks of about the same predicted duration.
+
+    Uses up to ``chunk_count`` chunks (as many as packing up to ``max_chunk_tokens`` needs
+    by default) and minimizes the longest predicted duration among them (binary search on
+    the duration bound), so the parallel generations of a request finish at about the same time.
+
+    Args:
+        token_counts (Sequence[int]): Text tokens of each sentence, none above ``max_chunk_tokens``.
+        max_chunk_tokens (int): Maximum text tokens of a chunk.
+        duration_model (DurationModel): Audio length predictor.
+        chunk_count (Optional[int], optional): Chunks to use at most, more than packing needs
+            shortens them. Defaults to what packing needs.
+        iterations (int, optional): Binary search steps. Defaults to 30.
+
+    Returns:
+        List[Tuple[int, int]]: Start and end (exclusive) sentence index of each chunk.
+    """
+    if not token_counts:
+        return []
+    chunks = _pack(token_counts, max_chunk_tokens, float("inf"), duration_model)
+    chunk_count = max(chunk_count or 0, len(chunks))
+    low = max(duration_model.predict(count) for count in token_counts)
+    high = max(duration_model.predict(_chunk_tokens(token_counts, start, end)) for start, end in chunks)
+    for _ in range(iterations):
+        if high - low < 1e-3:
+            break
+        middle = (low + high) / 2
+        candidate = _pack(token_counts, max_chunk_tokens, middle, duration_model)
+        if len(candidate) <= chunk_count:
+            chunks, high = candidate, middle
+        else:
+            low = middle
+    return chunks
@@ -1,11 +1,18 @@
+import os
 import re
-from typing import List, Optional, Union, Dict, Any
-from functools import cached_property
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterator, List, Optional, Tuple, Union, Dict, Any
+from functools import cached_property, lru_cache
 
+import numpy as np
 import pypinyin
 import torch
+from cachetools import LRUCache
 from hangul_romanize import Transliter
 from hangul_romanize.rule import academic
+from pypinyin.seg.simpleseg import seg as pinyin_seg
 from num2words import num2words
 from spacy.lang.ar import Arabic
 from spacy.lang.en import English
@@ -19,33 +26,228 @@ from tokenizers.pre_tokenizers import WhitespaceSplit
 from tokenizers.processors import TemplateProcessing
 
 from auralis.models.xttsv2.components.tts.layers.xtts.zh_num2words import TextNorm as zh_num2words
+from auralis.models.xttsv2.config.chunking import CHUNKING_MODES, DurationModel, balance_chunks
 
 import cutlet
 
-def get_spacy_lang(lang):
-    """Get spaCy language model for text processing.
-    
-    This function returns the appropriate spaCy language model based on the
-    input language code. For languages without specific models, it defaults
-    to English which provides basic tokenization capabilities.
+def _build_spacy_lang(lang):
+    """Build a blank spaCy pipeline with a sentencizer for a language.
 
     Args:
         lang (str): Language code (e.g., 'zh', 'ja', 'ar', 'es').
 
     Returns:
-        spacy.Language: Initialized spaCy language model.
+        spacy.Language: New spaCy pipeline.
     """
     if lang == "zh":
-        return Chinese()
+        nlp = Chinese()
     elif lang == "ja":
-        return Japanese()
+        nlp = Japanese()
     elif lang == "ar":
-        return Arabic()
+        nlp = Arabic()
     elif lang == "es":
-        return Spanish()
+        nlp = Spanish()
     else:
         # For most languages, English does the job
-        return English()
+        nlp = English()
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+# Languages whose spaCy tokenizer can't be shared between threads (SudachiPy for Japanese)
+_THREAD_UNSAFE_SPACY_LANGS = {"ja"}
+# Latin-script languages the regex segmenter can handle
+REGEX_SEGMENTER_LANGS = {"en", "es", "fr", "de", "it", "pt", "pl", "tr", "nl", "cs", "hu"}
+SEGMENTER_MODES = ("spacy", "regex")
+# Characters parsed at a time when segmenting lazily
+SEGMENT_WINDOW_CHARS = 5000
+# Sentences balanced together in balanced chunking
+BALANCED_CHUNKING_BLOCK_SENTENCES = 64
+
+# Sentence end: terminators, optionally followed by a closing quote or bracket, then whitespace
+_regex_sentence_end = re.compile(r"(?:(?<=[.!?…])|(?<=[.!?…][\"'”’»)\]]))\s+")
+# Titles and initials that end with a period without ending the sentence
+_regex_abbreviation_end = re.compile(
+    r"(?:\b(?:Mr|Mrs|Ms|Dr|Prof|St|Jr|Sr|Sra|Srta|Dra|Mme|Mlle|Hr|Fr|Nr|Sig|Dott|Ing|Bc|Mgr|vs|etc)|\b[A-Z])\.$"
+)
+
+
+class SentenceSegmenters:
+    """Process-wide registry of sentence segmenters.
+
+    Building a spaCy pipeline is expensive (``Chinese()`` and ``Japanese()`` in particular),
+    so each language pipeline is built once, on first use, and shared by every caller.
+    In ``regex`` mode, latin-script languages skip spaCy entirely and are split on
+    sentence terminators, which is much faster and close enough for TTS chunking.
+
+    Attributes:
+        mode (str): Default segmentation mode, ``spacy`` or ``regex``.
+    """
+
+    def __init__(self, mode: str = "spacy"):
+        """Initialize the registry.
+
+        Args:
+            mode (str, optional): Default segmentation mode. Defaults to ``spacy``.
+        """
+        self.mode = self._check_mode(mode)
+        self._pipelines = {}
+        self._call_locks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _check_mode(mode: str) -> str:
+        if mode not in SEGMENTER_MODES:
+            raise ValueError(f"Segmenter mode {mode} not supported. Must be one of {SEGMENTER_MODES}")
+        return mode
+
+    def get(self, lang: str):
+        """Get the shared spaCy pipeline of a language, building it on first use.
+
+        Args:
+            lang (str): Language code.
+
+        Returns:
+            spacy.Language: spaCy pipeline with a sentencizer.
+        """
+        nlp = self._pipelines.get(lang)
+        if nlp is None:
+            with self._lock:
+                nlp = self._pipelines.get(lang)
+                if nlp is None:
+                    nlp = _build_spacy_lang(lang)
+                    if lang in _THREAD_UNSAFE_SPACY_LANGS:
+                        self._call_locks[lang] = threading.Lock()
+                    self._pipelines[lang] = nlp
+        return nlp
+
+    def segment(self, text: str, lang: str, mode: Optional[str] = None) -> List[str]:
+        """Split a text into sentences.
+
+        Args:
+            text (str): Text to split.
+            lang (str): Base language code.
+            mode (Optional[str], optional): Segmentation mode, defaults to the registry mode.
+
+        Returns:
+            List[str]: Sentences, stripped.
+        """
+        mode = self.mode if mode is None else self._check_mode(mode)
+        if mode == "regex" and lang in REGEX_SEGMENTER_LANGS:
+            return list(self._iter_regex_segment(text))
+        return [str(sent).strip() for sent in self._parse(text, lang).sents]
+
+    def iter_segment(self,
+                     text: str,
+                     lang: str,
+                     mode: Optional[str] = None,
+                     window_chars: int = SEGMENT_WINDOW_CHARS) -> Iterator[str]:
+        """Split a text into sentences, lazily.
+
+        spaCy parses the text one window at a time; the last sentence of a window may be
+        cut, so it is parsed again at the start of the next window. The sentences are the
+        same as the ones of [`segment`][auralis.models.xttsv2.config.tokenizer.SentenceSegmenters.segment],
+        but the first ones are available after parsing a window instead of the whole text.
+
+        Args:
+            text (str): Text to split.
+            lang (str): Base language code.
+            mode (Optional[str], optional): Segmentation mode, defaults to the registry mode.
+            window_chars (int, optional): Characters parsed at a time. Defaults to SEGMENT_WINDOW_CHARS.
+
+        Yields:
+            str: Next sentence, stripped.
+        """
+        mode = self.mode if mode is None else self._check_mode(mode)
+        if mode == "regex" and lang in REGEX_SEGMENTER_LANGS:
+            yield from self._iter_regex_segment(text)
+            return
+
+        start = 0
+        window = window_chars
+        while start < len(text):
+            end = start + window
+            sentences = list(self._parse(text[start:end], lang).sents)
+            if end >= len(text):
+                for sent in sentences:
+                    yield str(sent).strip()
+                return
+            if len(sentences) < 2:
+                # No complete sentence in the window yet
+                window *= 2
+                continue
+            for sent in sentences[:-1]:
+                yield str(sent).strip()
+            start += sentences[-1].start_char
+            window = window_chars
+
+    @staticmethod
+    def _iter_regex_segment(text: str) -> Iterator[str]:
+        previous = None
+        for sentence in _regex_sentence_end.split(text):
+            if previous is not None and _regex_abbreviation_end.search(previous):
+                previous = f"{previous} {sentence}"
+            elif sentence:
+                if previous is not None:
+                    yield previous
+                previous = sentence
+        if previous is not None:
+            yield previous
+
+    def _parse(self, text: str, lang: str):
+        nlp = self.get(lang)
+        call_lock = self._call_locks.get(lang)
+        if call_lock is not None:
+            with call_lock:
+                return nlp(text)
+        return nlp(text)
+
+
+sentence_segmenters = SentenceSegmenters(os.environ.get("AURALIS_SENTENCE_SEGMENTER", "spacy"))
+
+
+def get_spacy_lang(lang):
+    """Get spaCy language model for text processing.
+    
+    This function returns the appropriate spaCy language model based on the
+    input language code. For languages without specific models, it defaults
+    to English which provides basic tokenization capabilities. Pipelines are
+    built once and shared, see [`SentenceSegmenters`][auralis.models.xttsv2.config.tokenizer.SentenceSegmenters].
+
+    Args:
+        lang (str): Language code (e.g., 'zh', 'ja', 'ar', 'es').
+
+    Returns:
+        spacy.Language: Initialized spaCy language model, with a sentencizer.
+    """
+    return sentence_segmenters.get(lang)
+
+
+# Split markers by priority
+_split_markers = [
+    # Strong breaks (longest pause)
+    (re.compile(r'[.!?؟။။။]+[\s]*'), 1.0),  # Periods, exclamation, question (multi-script)
+    (re.compile(r'[\n\r]+\s*[\n\r]+'), 1.0),  # Multiple newlines
+    (re.compile(r'[:|;；：；][\s]*'), 0.9),  # Colons, semicolons (multi-script)
+
+    # Medium breaks
+    (re.compile(r'[,，،、][\s]*'), 0.8),  # Commas (multi-script)
+    (re.compile(r'[)}\]）】』»›》\s]+'), 0.7),  # Closing brackets/parentheses
+    (re.compile(r'[-—−]+[\s]*'), 0.7),  # Dashes
+
+    # Weak breaks
+    (re.compile(r'\s+[&+=/\s]+\s+'), 0.6),  # Special characters with spaces
+    (re.compile(r'[\s]+'), 0.5),  # Any whitespace as last resort
+]
+
+# Whitespace as matched by \s (all of it is in the BMP)
+_whitespace_codepoints = np.array([cp for cp in range(0x10000) if chr(cp).isspace()], dtype=np.uint32)
+# Markers that are plain runs of a character class, with the class (besides whitespace):
+# they match around every word, so the boundary index finds them with numpy instead
+_run_markers = {
+    _split_markers[4][0]: ")}]）】』»›》",
+    _split_markers[7][0]: "",
+}
 
 
 def find_best_split_point(text: str, target_pos: int, window_size: int = 30) -> int:
@@ -73,23 +275,6 @@ def find_best_split_point(text: str, target_pos: int, window_size: int = 30) ->
         Each marker type has a priority score, and the final position is chosen
         based on both the marker priority and proximity to target position.
     """
-    # Define split markers by priority
-    markers = [
-        # Strong breaks (longest pause)
-        (r'[.!?؟။။။]+[\s]*', 1.0),  # Periods, exclamation, question (multi-script)
-        (r'[\n\r]+\s*[\n\r]+', 1.0),  # Multiple newlines
-        (r'[:|;；：；][\s]*', 0.9),  # Colons, semicolons (multi-script)
-
-        # Medium breaks
-        (r'[,，،、][\s]*', 0.8),  # Commas (multi-script)
-        (r'[)}\]）】』»›》\s]+', 0.7),  # Closing brackets/parentheses
-        (r'[-—−]+[\s]*', 0.7),  # Dashes
-
-        # Weak breaks
-        (r'\s+[&+=/\s]+\s+', 0.6),  # Special characters with spaces
-        (r'[\s]+', 0.5),  # Any whitespace as last resort
-    ]
-
     # Calculate window boundaries
     start = max(0, target_pos - window_size)
     end = min(len(text), target_pos + window_size)
@@ -98,8 +283,8 @@ def find_best_split_point(text: str, target_pos: int, window_size: int = 30) ->
     best_pos = target_pos
     best_score = 0
 
-    for pattern, priority in markers:
-        matches = list(re.finditer(pattern, window))
+    for pattern, priority in _split_markers:
+        matches = list(pattern.finditer(window))
         for match in matches:
             # Calculate position score based on distance from target
             pos = start + match.end()
@@ -116,7 +301,99 @@ def find_best_split_point(text: str, target_pos: int, window_size: int = 30) ->
     return best_pos
 
 
-def split_sentence(text: str, lang: str, text_split_length: int = 250) -> List[str]:
+class BoundaryIndex:
+    """One-pass index of the split markers of a text.
+
+    [`find_best_split_point`][auralis.models.xttsv2.config.tokenizer.find_best_split_point]
+    runs every marker regex over a window at each call; splitting a long unpunctuated
+    text calls it once per split, each time on a fresh copy of the remainder. The index
+    finds every marker once for the whole text and answers each split with a binary
+    search per marker, giving the same split points.
+
+    The window of a query only sees part of the text, so a marker cut by a window edge
+    may match differently than in the whole text; those (rare) markers are matched again
+    on the window alone.
+    """
+
+    def __init__(self, text: str):
+        """Index the split markers of a text.
+
+        Args:
+            text (str): Text to index.
+        """
+        self.text = text
+        self._matches = []
+        codepoints = None
+        for pattern, priority in _split_markers:
+            if pattern in _run_markers:
+                if codepoints is None:
+                    codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+                starts, ends = self._character_runs(codepoints, _run_markers[pattern])
+            else:
+                spans = [match.span() for match in pattern.finditer(text)]
+                starts = [start for start, _ in spans]
+                ends = [end for _, end in spans]
+            self._matches.append((pattern, priority, starts, ends))
+
+    @staticmethod
+    def _character_runs(codepoints: np.ndarray, characters: str) -> Tuple[List[int], List[int]]:
+        # Maximal runs of whitespace and characters, i.e. the matches of [characters\s]+
+        members = np.concatenate([_whitespace_codepoints, [ord(c) for c in characters]]).astype(np.uint32)
+        in_class = np.isin(codepoints, members).astype(np.int8)
+        edges = np.diff(in_class, prepend=0, append=0)
+        return np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()
+
+    @staticmethod
+    def _straddles(starts: List[int], ends: List[int], pos: int) -> bool:
+        # Matches don't overlap: only the last one starting before pos can contain it
+        i = bisect_left(starts, pos) - 1
+        return i >= 0 and ends[i] > pos
+
+    def find_best_split_point(self, target_pos: int, start: int = 0, end: Optional[int] = None,
+                              window_size: int = 30) -> int:
+        """Find the best split point of ``text[start:end]`` near a target position.
+
+        Same result as ``find_best_split_point(text[start:end], target_pos - start, window_size) + start``.
+
+        Args:
+            target_pos (int): Target position, in the indexed text.
+            start (int, optional): Start of the part of the text being split. Defaults to 0.
+            end (Optional[int], optional): End of the part being split. Defaults to the text end.
+            window_size (int, optional): Size of text window to analyze. Defaults to 30.
+
+        Returns:
+            int: Position of the best split point, in the indexed text.
+        """
+        end = len(self.text) if end is None else end
+        window_start = max(start, target_pos - window_size)
+        window_end = min(end, target_pos + window_size)
+
+        best_pos = target_pos
+        best_score = 0
+
+        for pattern, priority, starts, ends in self._matches:
+            if best_score >= priority:
+                # Markers come by decreasing priority, none of the next ones can score higher
+                break
+            if not starts:
+                continue
+            if self._straddles(starts, ends, window_start) or self._straddles(starts, ends, window_end):
+                positions = [match.end() for match in pattern.finditer(self.text, window_start, window_end)]
+            else:
+                positions = ends[bisect_left(starts, window_start):bisect_left(starts, window_end)]
+            for pos in positions:
+                distance = abs(pos - target_pos)
+                distance_score = 1 - (distance / (window_size * 2))
+                score = priority * distance_score
+
+                if score > best_score:
+                    best_score = score
+                    best_pos = pos
+
+        return best_pos
+
+
+def split_sentence(text: str, lang: str, text_split_length: int = 250, segmenter: Optional[str] = None) -> List[str]:
     """Split text into natural sentences optimized for TTS.
     
     This function performs intelligent text splitting that considers language
@@ -162,6 +439,8 @@ def split_sentence(text: str, lang: str, text_split_length: int = 250) -> List[s
         lang (str): Language code for text processing.
         text_split_length (int, optional): Target length for text splits.
             Defaults to 250.
+        segmenter (Optional[str], optional): Sentence segmentation mode, ``spacy`` or ``regex``.
+            Defaults to the process-wide mode (``AURALIS_SENTENCE_SEGMENTER``).
 
     Returns:
         List[str]: List of text splits optimized for TTS processing.
@@ -170,24 +449,55 @@ def split_sentence(text: str, lang: str, text_split_length: int = 250) -> List[s
         - [`find_best_split_point`][auralis.models.xttsv2.config.tokenizer.find_best_split_point]: Split point finder
         - [`get_spacy_lang`][auralis.models.xttsv2.config.tokenizer.get_spacy_lang]: Language model selector
     """
+    return list(iter_split_sentence(text, lang, text_split_length, segmenter))
+
+
+def _strip_bounds(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Bounds of ``text[start:end].strip()`` in ``text``, without copying it."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _clean_split(split: str) -> str:
+    return split[:-1] + ' ' if split.endswith('.') else split  # prevents annoying sounds in italian
+
+
+def iter_split_sentence(text: str,
+                        lang: str,
+                        text_split_length: int = 250,
+                        segmenter: Optional[str] = None) -> Iterator[str]:
+    """Split text into natural sentences optimized for TTS, lazily.
+
+    Same splits as [`split_sentence`][auralis.models.xttsv2.config.tokenizer.split_sentence],
+    but each one is yielded as soon as it is complete, so the first chunks of a long
+    text can be processed while the rest is still being segmented.
+
+    Args:
+        text (str): Input text to split.
+        lang (str): Language code for text processing.
+        text_split_length (int, optional): Target length for text splits.
+            Defaults to 250.
+        segmenter (Optional[str], optional): Sentence segmentation mode, ``spacy`` or ``regex``.
+            Defaults to the process-wide mode (``AURALIS_SENTENCE_SEGMENTER``).
+
+    Yields:
+        str: Next text split.
+    """
     text = text.strip()
     if len(text) <= text_split_length:
-        return [text]
-
-    nlp = get_spacy_lang(lang)
-    if "sentencizer" not in nlp.pipe_names:
-        nlp.add_pipe("sentencizer")
+        yield text
+        return
 
-    # Get base sentences using spaCy
-    doc = nlp(text)
-    sentences = list(doc.sents)
+    # Get base sentences using the shared segmenters
+    sentences = sentence_segmenters.iter_segment(text, lang, segmenter)
 
-    splits = []
     current_split = []
     current_length = 0
 
-    for sent in sentences:
-        sentence_text = str(sent).strip()
+    for sentence_text in sentences:
         sentence_length = len(sentence_text)
 
         # If sentence fits in current split
@@ -199,22 +509,27 @@ def split_sentence(text: str, lang: str, text_split_length: int = 250) -> List[s
         elif sentence_length > text_split_length:
             # Add current split if exists
             if current_split:
-                splits.append(" ".join(current_split))
+                if split := " ".join(current_split):
+                    yield _clean_split(split)
                 current_split = []
                 current_length = 0
 
-            # Split long sentence at optimal points
-            remaining = sentence_text
-            while len(remaining) > text_split_length:
-                split_pos = find_best_split_point(
-                    remaining,
-                    text_split_length,
+            # Split long sentence at optimal points, the remainder is sentence_text[start:end]
+            boundaries = BoundaryIndex(sentence_text)
+            start, end = 0, len(sentence_text)
+            while end - start > text_split_length:
+                split_pos = boundaries.find_best_split_point(
+                    start + text_split_length,
+                    start,
+                    end,
                     window_size=30
                 )
 
                 # Add split and continue with remainder
-                splits.append(remaining[:split_pos].strip())
-                remaining = remaining[split_pos:].strip()
+                if split := sentence_text[start:split_pos].strip():
+                    yield _clean_split(split)
+                start, end = _strip_bounds(sentence_text, split_pos, end)
+            remaining = sentence_text[start:end]
 
             # Handle remaining text
             if remaining:
@@ -223,17 +538,15 @@ def split_sentence(text: str, lang: str, text_split_length: int = 250) -> List[s
 
         # Start new split
         else:
-            splits.append(" ".join(current_split))
+            if split := " ".join(current_split):
+                yield _clean_split(split)
             current_split = [sentence_text]
             current_length = sentence_length
 
     # Add final split if needed
     if current_split:
-        splits.append(" ".join(current_split))
-
-    cleaned_sentences = [s[:-1]+' ' if s.endswith('.') else s for s in splits if s] # prevents annoying sounds in italian
-    # Clean up splits
-    return cleaned_sentences
+        if split := " ".join(current_split):
+            yield _clean_split(split)
 
 _whitespace_re = re.compile(r"\s+")
 
@@ -705,18 +1018,86 @@ def lowercase(text):
 def collapse_whitespace(text):
     return re.sub(_whitespace_re, " ", text)
 
+
+def _alternation(patterns: List[str]) -> str:
+    """Join patterns into one alternation, one group each, behind a first character lookahead.
+
+    The lookahead lets the regex engine reject most positions without trying every branch.
+    """
+    first_chars = {p[:2] if p.startswith("\\") else re.escape(p[0]) for p in patterns}
+    return f"(?=[{''.join(sorted(first_chars))}])(?:{'|'.join(f'({p})' for p in patterns)})"
+
+
+class MultilingualNormalizer:
+    """Compiled text normalizer of a language.
+
+    Equivalent to applying ``expand_abbreviations_multilingual`` and then
+    ``expand_symbols_multilingual``, but the abbreviation and symbol tables are combined
+    into a single alternation with one group per entry, so the text is scanned once and
+    each match is replaced by a list lookup instead of one ``re.sub`` per entry. The
+    entries anchored on a word boundary share a single ``\\b``, which is what keeps the
+    alternation fast. Output is identical to the entry by entry substitution, including
+    its handling of abbreviations glued together; the double spaces the symbol replacements
+    leave are collapsed by the cleaners anyway.
+    """
+
+    def __init__(self, lang: str):
+        """Compile the tables of a language.
+
+        Args:
+            lang (str): Base language code.
+        """
+        self.lang = lang
+        table = _abbreviations.get(lang, []) + _symbols_multilingual.get(lang, [])
+        bounded = [(regex.pattern[2:], replacement) for regex, replacement in table if regex.pattern.startswith("\\b")]
+        unbounded = [(regex.pattern, replacement) for regex, replacement in table if not regex.pattern.startswith("\\b")]
+
+        branches = []
+        if bounded:
+            branches.append("\\b" + _alternation([pattern for pattern, _ in bounded]))
+        if unbounded:
+            branches.append(_alternation([pattern for pattern, _ in unbounded]))
+        # Group i + 1 is the i-th entry of bounded + unbounded
+        self._replacements = [replacement for _, replacement in bounded + unbounded]
+        self._bounded_entries = len(bounded)
+        self._pattern = re.compile("|".join(branches), re.IGNORECASE) if branches else None
+        self._translation = str.maketrans({'"': None, **({"İ": "i", "Ö": "ö", "Ü": "ü"} if lang == "tr" else {})})
+
+    def expand_abbreviations_and_symbols(self, text: str) -> str:
+        if self._pattern is None:
+            return text.strip()
+        previous = None  # (end, entry) of the last abbreviation replaced
+
+        def replace(m):
+            nonlocal previous
+            entry = m.lastindex - 1
+            if entry < self._bounded_entries:
+                # Applied one entry at a time, an earlier entry replaced right before this match
+                # turns the boundary in front of it into a word character, so it doesn't match
+                if previous is not None and previous[0] == m.start() and previous[1] < entry:
+                    previous = None
+                    return m.group(0)
+                previous = (m.end(), entry)
+            return self._replacements[entry]
+
+        return self._pattern.sub(replace, text).strip()
+
+    def __call__(self, text: str) -> str:
+        text = text.translate(self._translation)
+        text = lowercase(text)
+        text = expand_numbers_multilingual(text, self.lang)
+        text = self.expand_abbreviations_and_symbols(text)
+        text = collapse_whitespace(text)
+        return text
+
+
+@lru_cache(maxsize=None)
+def get_multilingual_normalizer(lang: str) -> MultilingualNormalizer:
+    return MultilingualNormalizer(lang)
+
+
 def multilingual_cleaners(text, lang):
-    text = text.replace('"', "")
-    if lang == "tr":
-        text = text.replace("İ", "i")
-        text = text.replace("Ö", "ö")
-        text = text.replace("Ü", "ü")
-    text = lowercase(text)
-    text = expand_numbers_multilingual(text, lang)
-    text = expand_abbreviations_multilingual(text, lang)
-    text = expand_symbols_multilingual(text, lang=lang)
-    text = collapse_whitespace(text)
-    return text
+    return get_multilingual_normalizer(lang)(text)
 
 def basic_cleaners(text):
     """Basic pipeline that lowercases and collapses whitespace without transliteration."""
@@ -724,18 +1105,146 @@ def basic_cleaners(text):
     text = collapse_whitespace(text)
     return text
 
-def chinese_transliterate(text):
+class TransliterationCache:
+    """Bounded LRU memo of the transliteration of text segments.
+
+    CJK requests repeat a lot of vocabulary, so transliterators are run on segments
+    (words, sentences) that are looked up here first. Misses of a batch are computed
+    once each, outside the lock, and the time they take is used to estimate the time
+    saved by the hits.
+
+    Attributes:
+        hits (int): Segments served from the cache (repeats within a batch included).
+        misses (int): Segments transliterated.
+        miss_seconds (float): Time spent transliterating the misses.
+    """
+
+    def __init__(self, maxsize: int = 65536):
+        self._cache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.miss_seconds = 0.0
+
+    def transliterate(self, segments: List[str], transliterate_segment: Callable[[str], str]) -> List[str]:
+        """Transliterate segments, running ``transliterate_segment`` only on unseen ones.
+
+        Args:
+            segments (List[str]): Segments to transliterate.
+            transliterate_segment (Callable[[str], str]): Transliterator of a single segment.
+
+        Returns:
+            List[str]: Transliteration of each segment.
+        """
+        results = [None] * len(segments)
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, segment in enumerate(segments):
+                cached = self._cache.get(segment)
+                if cached is None:
+                    missing.setdefault(segment, []).append(i)
+                else:
+                    results[i] = cached
+
+        start = time.perf_counter()
+        computed = {segment: transliterate_segment(segment) for segment in missing}
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._cache.update(computed)
+            self.hits += len(segments) - len(missing)
+            self.misses += len(missing)
+            self.miss_seconds += elapsed
+
+        for segment, indices in missing.items():
+            for i in indices:
+                results[i] = computed[segment]
+        return results
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Hits, misses, hit rate and estimated seconds saved by the hits."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "saved_seconds": self.hits * self.miss_seconds / self.misses if self.misses else 0.0,
+            }
+
+    def clear(self):
+        """Drop the cached segments and reset the counters."""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+            self.miss_seconds = 0.0
+
+
+# One cache per transliterated language, shared by every tokenizer of the process
+transliteration_caches = {lang: TransliterationCache() for lang in ("zh", "ja", "ko")}
+
+# Japanese sentences are romanized on their own: only cut after a terminator followed by
+# plain kana or kanji, where MeCab's segmentation doesn't depend on the previous sentence
+_japanese_sentence_end = re.compile(
+    r"(?<=[。！？])(?=[あいうえおか-ぢつ-もやゆよ-ろわをアイウエオカ-ヂツ-モヤユヨ-ロワヲ一-鿿])"
+)
+_whitespace_split = re.compile(r"(\s+)")
+
+
+def _transliterate_batch(texts: List[str],
+                         lang: str,
+                         segment: Callable[[str], List[str]],
+                         transliterate_segment: Callable[[str], str],
+                         join: Callable[[List[str]], str]) -> List[str]:
+    """Transliterate texts segment by segment through the cache of their language.
+
+    The segments of all the texts go through the cache in one call, so repeats across
+    texts of a batch are transliterated once.
+    """
+    segmented = [segment(text) for text in texts]
+    transliterated = iter(transliteration_caches[lang].transliterate(
+        [part for parts in segmented for part in parts], transliterate_segment
+    ))
+    return [join([next(transliterated) for _ in parts]) for parts in segmented]
+
+
+def _pinyin(text):
     return "".join(
         [p[0] for p in pypinyin.pinyin(text, style=pypinyin.Style.TONE3, heteronym=False, neutral_tone_with_five=True)]
     )
 
+def chinese_transliterate_batch(texts: List[str]) -> List[str]:
+    """Pinyin of many texts, memoized per word of pypinyin's own segmentation."""
+    return _transliterate_batch(texts, "zh", pinyin_seg, _pinyin, "".join)
+
+def japanese_cleaners_batch(texts: List[str], katsu) -> List[str]:
+    """Lowercased romaji of many texts, memoized per sentence."""
+    return _transliterate_batch(
+        texts, "ja",
+        _japanese_sentence_end.split,
+        lambda sentence: lowercase(katsu.romaji(sentence)),
+        lambda parts: " ".join(part for part in parts if part)
+    )
+
+def korean_transliterate_batch(texts: List[str], transliter) -> List[str]:
+    """Romanization of many texts, memoized per word."""
+    return _transliterate_batch(
+        texts, "ko",
+        lambda text: [part for part in _whitespace_split.split(text) if part],
+        transliter.translit,
+        "".join
+    )
+
+def chinese_transliterate(text):
+    return chinese_transliterate_batch([text])[0]
+
 def japanese_cleaners(text, katsu):
-    text = katsu.romaji(text)
-    text = lowercase(text)
-    return text
+    return japanese_cleaners_batch([text], katsu)[0]
 
 def korean_transliterate(text, transliter):
-    return transliter.translit(text)
+    return korean_transliterate_batch([text], transliter)[0]
 
 # Fast Tokenizer Class
 
@@ -756,6 +1265,13 @@ class XTTSTokenizerFast(PreTrainedTokenizerFast):
             clean_up_tokenization_spaces: bool = True,
             **kwargs
     ):
+        # Chunking of long texts, see split_text
+        self.chunking = kwargs.pop("chunking", "characters")
+        if self.chunking not in CHUNKING_MODES:
+            raise ValueError(f"Chunking mode {self.chunking} not supported. Must be one of {CHUNKING_MODES}")
+        self.max_text_tokens = kwargs.pop("max_text_tokens", 402)
+        self.duration_model = kwargs.pop("duration_model", None) or DurationModel()
+
         if tokenizer_object is None and vocab_file is not None:
             tokenizer_object = Tokenizer.from_file(vocab_file)
 
@@ -804,19 +1320,146 @@ class XTTSTokenizerFast(PreTrainedTokenizerFast):
 
     def preprocess_text(self, text: str, lang: str) -> str:
         """Apply text preprocessing for language"""
-        base_lang = lang.split("-")[0]  # remove region
-        if base_lang in {"ar", "cs", "de", "en", "es", "fr", "hu", "it",
-                         "nl", "pl", "pt", "ru", "tr", "zh", "ko"}:
-            text = multilingual_cleaners(text, base_lang)
-            if base_lang == "zh":
-                text = chinese_transliterate(text)
-            if base_lang == "ko":
-                text = korean_transliterate(text, self._korean_transliter)
-        elif base_lang == "ja":
-            text = japanese_cleaners(text, self.katsu)
-        else:
-            text = basic_cleaners(text)
-        return text
+        return self.preprocess_texts([text], [lang])[0]
+
+    def preprocess_texts(self, texts: List[str], langs: List[str]) -> List[str]:
+        """
+        Apply text preprocessing to many texts, transliterating all the texts of a language in one batch
+        """
+        base_langs = [lang.split("-")[0] for lang in langs]  # remove region
+        processed = []
+        for text, base_lang in zip(texts, base_langs):
+            if base_lang in {"ar", "cs", "de", "en", "es", "fr", "hu", "it",
+                             "nl", "pl", "pt", "ru", "tr", "zh", "ko"}:
+                text = multilingual_cleaners(text, base_lang)
+            elif base_lang != "ja":
+                text = basic_cleaners(text)
+            processed.append(text)
+
+        transliterators = {
+            "zh": chinese_transliterate_batch,
+            "ko": lambda batch: korean_transliterate_batch(batch, self._korean_transliter),
+            "ja": lambda batch: japanese_cleaners_batch(batch, self.katsu),
+        }
+        for base_lang, transliterate in transliterators.items():
+            indices = [i for i, text_lang in enumerate(base_langs) if text_lang == base_lang]
+            if indices:
+                for i, text in zip(indices, transliterate([processed[i] for i in indices])):
+                    processed[i] = text
+        return processed
+
+    def split_text(self, text: str, lang: str) -> List[str]:
+        """
+        Split a text into chunks within the character limit of its language
+        (of about the same predicted duration in balanced chunking)
+        """
+        if self.chunking == "balanced":
+            return list(self._iter_balanced_chunks(text, lang))
+        base_lang = lang.split("-")[0]
+        char_limit = self.char_limits.get(base_lang, 250)
+        return split_sentence(text, base_lang, text_split_length=char_limit)
+
+    def iter_split_text(self, text: str, lang: str) -> Iterator[str]:
+        """
+        Lazily split a text into chunks within the character limit of its language
+        """
+        if self.chunking == "balanced":
+            return self._iter_balanced_chunks(text, lang)
+        base_lang = lang.split("-")[0]
+        char_limit = self.char_limits.get(base_lang, 250)
+        return iter_split_sentence(text, base_lang, text_split_length=char_limit)
+
+    def _iter_balanced_chunks(self, text: str, lang: str) -> Iterator[str]:
+        """
+        Split a text into chunks of about the same predicted audio duration.
+
+        Sentences are taken a block at a time. Packing them up to the character limit of the language
+        (in tokens, capped by max_text_tokens) gives the even share of a chunk; sentences longer than
+        that are cut into even pieces, and the pieces are grouped into chunks of at most the even share,
+        with the longest predicted duration minimized. Chunks are then about as long as the average
+        chunk of plain packing instead of ranging up to the limit.
+        """
+        base_lang = lang.split("-")[0]
+        char_limit = self.char_limits.get(base_lang, 250)
+        text = text.strip()
+        if len(text) <= char_limit:
+            yield text
+            return
+
+        block = []
+        for sentence in sentence_segmenters.iter_segment(text, base_lang):
+            if sentence:
+                block.append(sentence)
+            if len(block) == BALANCED_CHUNKING_BLOCK_SENTENCES:
+                yield from self._balance_block(block, lang, char_limit)
+                block = []
+        if block:
+            yield from self._balance_block(block, lang, char_limit)
+
+    def _balance_block(self, sentences: List[str], lang: str, char_limit: int) -> Iterator[str]:
+        counts = self._count_tokens(sentences, lang)
+        chars_per_token = sum(len(sentence) for sentence in sentences) / max(1, sum(counts))
+        max_chunk_tokens = max(1, min(self.max_text_tokens, round(char_limit / chars_per_token)))
+
+        pieces, piece_counts = self._fit_all_tokens(sentences, counts, lang, max_chunk_tokens)
+        # The even share of plain packing becomes the budget, sentences longer than that are cut too
+        chunk_count = len(balance_chunks(piece_counts, max_chunk_tokens, self.duration_model, iterations=0))
+        even_tokens = -(-(sum(piece_counts) + len(piece_counts) - 1) // chunk_count)
+        pieces, piece_counts = self._fit_all_tokens(pieces, piece_counts, lang, even_tokens)
+
+        chunks = [
+            " ".join(pieces[start:end])
+            for start, end in balance_chunks(piece_counts, even_tokens, self.duration_model)
+        ]
+        # Joining may tokenize slightly differently, never exceed what the model accepts
+        for chunk, count in zip(chunks, self._count_tokens(chunks, lang)):
+            for piece, _ in self._fit_tokens(chunk, count, lang, self.max_text_tokens):
+                yield _clean_split(piece)
+
+    def _fit_all_tokens(self, texts: List[str], counts: List[int], lang: str,
+                        max_tokens: int) -> Tuple[List[str], List[int]]:
+        pieces, piece_counts = [], []
+        for text, count in zip(texts, counts):
+            for piece, piece_count in self._fit_tokens(text, count, lang, max_tokens):
+                pieces.append(piece)
+                piece_counts.append(piece_count)
+        return pieces, piece_counts
+
+    def _count_tokens(self, texts: List[str], lang: str) -> List[int]:
+        return [len(ids) for ids in self(texts, lang=lang, add_special_tokens=False, padding=False)['input_ids']]
+
+    def _fit_tokens(self, text: str, count: int, lang: str, max_tokens: int) -> List[Tuple[str, int]]:
+        """
+        Cut a text into even pieces of at most max_tokens tokens, at the best split points
+        """
+        if count <= max_tokens or len(text) < 2:
+            return [(text, count)]
+        parts = -(-count // max_tokens)
+        pieces = []
+        remaining = text
+        for parts_left in range(parts, 1, -1):
+            target = len(remaining) // parts_left
+            split_pos = find_best_split_point(remaining, target, window_size=30)
+            if not 0 < split_pos < len(remaining):
+                split_pos = max(1, target)
+            if piece := remaining[:split_pos].strip():
+                pieces.append(piece)
+            remaining = remaining[split_pos:].strip()
+        if remaining:
+            pieces.append(remaining)
+
+        fitted = []
+        for piece, piece_count in zip(pieces, self._count_tokens(pieces, lang)):
+            fitted.extend(self._fit_tokens(piece, piece_count, lang, max_tokens))
+        return fitted
+
+    def iter_encode_with_split(self, text: str, lang: str) -> Iterator[Tuple[str, List[int]]]:
+        """
+        Split a text and encode its chunks one at a time, yielding each chunk as soon as it is ready.
+        Chunks and tokens are the same as the ones of batch_encode_with_split
+        """
+        for chunk in self.iter_split_text(text, lang):
+            yield chunk, self([chunk], lang=[lang], add_special_tokens=False, padding=False)['input_ids'][0]
 
     def batch_encode_with_split(self, texts: Union[str, List[str]], lang: Union[str, List[str]],
                                 **kwargs) -> torch.Tensor:
@@ -824,6 +1467,17 @@ class XTTSTokenizerFast(PreTrainedTokenizerFast):
         Split texts into smaller chunks based on language character limits and encode them using HuggingFace fast tokenizer.
         strictly mimic the xttsv2 tokenizer
         """
+        input_ids, _ = self.batch_encode_documents(texts, lang, **kwargs)
+        return input_ids  # Chunks of all the texts, in order
+
+    def batch_encode_documents(self, texts: Union[str, List[str]], lang: Union[str, List[str]],
+                               **kwargs) -> Tuple[List[List[int]], List[int]]:
+        """
+        Split many documents into chunks and encode the chunks of all of them in one fast tokenizer call.
+
+        Returns the token ids of every chunk, documents after documents, and the chunk offsets of the
+        documents: the chunks of texts[i] are input_ids[offsets[i]:offsets[i + 1]]
+        """
         # Convert single inputs to lists
         if isinstance(texts, str):
             texts = [texts]
@@ -838,19 +1492,19 @@ class XTTSTokenizerFast(PreTrainedTokenizerFast):
             raise ValueError(f"Number of texts ({len(texts)}) does not match number of languages ({len(lang)}).")
 
         chunk_list = []
-        max_splits = 0
+        chunk_langs = []
+        offsets = [0]
 
         # For each text, split into chunks based on character limit
         for text, text_lang in zip(texts, lang):
-            # Get language character limit
-            base_lang = text_lang.split("-")[0]
-            char_limit = self.char_limits.get(base_lang, 250)
-
             # Clean and preprocess
             #text = self.preprocess_text(text, text_lang) we do this in the hidden function
 
             # Split text into sentences/chunks based on language
-            chunk_list = split_sentence(text, base_lang, text_split_length=char_limit)
+            chunks = self.split_text(text, text_lang)
+            chunk_list.extend(chunks)
+            chunk_langs.extend([text_lang] * len(chunks))
+            offsets.append(len(chunk_list))
 
         # Ensure the tokenizer is a fast tokenizer
         if not self.is_fast:
@@ -859,14 +1513,13 @@ class XTTSTokenizerFast(PreTrainedTokenizerFast):
         # Encode all chunks using the fast tokenizer
         encoding: BatchEncoding = self(
             chunk_list,
-            lang = lang,
+            lang=chunk_langs,
             add_special_tokens=False,
             padding=False,
             **kwargs
         )
 
-        # The 'input_ids' tensor will have shape [total_chunks, max_sequence_length]
-        return encoding['input_ids']  # Tensor of shape [total_chunks, sequence_length]
+        return encoding['input_ids'], offsets
 
     def _batch_encode_plus(
             self,
@@ -902,13 +1555,17 @@ class XTTSTokenizerFast(PreTrainedTokenizerFast):
         if len(batch_text_or_text_pairs) != len(lang):
             raise ValueError(f"Number of texts ({len(batch_text_or_text_pairs)}) does not match number of languages ({len(lang)}).")
 
-        # Preprocess each text in the batch with its corresponding language
+        # Preprocess the texts of the batch with their corresponding language
+        string_indices = [i for i, text in enumerate(batch_text_or_text_pairs) if isinstance(text, str)]
+        preprocessed = dict(zip(string_indices, self.preprocess_texts(
+            [batch_text_or_text_pairs[i] for i in string_indices], [lang[i] for i in string_indices]
+        )))
         processed_texts = []
-        for text, text_lang in zip(batch_text_or_text_pairs, lang):
+        for i, (text, text_lang) in enumerate(zip(batch_text_or_text_pairs, lang)):
             if isinstance(text, str):
                 # Check length and preprocess
                 #self.check_input_length(text, text_lang)
-                processed_text = self.preprocess_text(text, text_lang)
+                processed_text = preprocessed[i]
 
                 # Format text with language tag and spaces
                 base_lang = text_lang.split("-")[0]
@@ -0,0 +1,86 @@
+import random
+import statistics
+
+from auralis.models.xttsv2.config.tokenizer import XTTSTokenizerFast
+
+# Ebook-like prose: dialogue lines, ordinary sentences and long descriptive ones
+SENTENCES = [
+    "\"No.\"",
+    "She laughed.",
+    "\"Are you coming back tonight?\" she asked, without looking up.",
+    "The rain had not stopped for three days.",
+    "Mr. Holloway closed the shutters and lit the lamp by the window.",
+    "Nobody in the village remembered the last time the river had flooded.",
+    "He folded the letter twice, then put it in his coat pocket, walked to the door, hesitated "
+    "for a long while with his hand on the latch, and finally stepped out into the storm without "
+    "a word to anyone in the house, leaving the lamp burning behind him.",
+    "Beyond the orchard, where the old road bent toward the mill, the water had already covered "
+    "the lower fields, and the fence posts stood out of it like the masts of sunken boats, "
+    "black against a sky that had not changed color since morning.",
+]
+
+BOOK_CHARS = 300_000
+PAGE_CHARS = 3_000  # text sent per request
+
+# Ground truth of the simulation: speech rate and decoding speed, independent of the duration model
+CHARS_PER_SECOND_OF_SPEECH = 14.5
+AUDIO_TOKENS_PER_SECOND = 21.5
+SECONDS_PER_AUDIO_TOKEN = 0.012
+CHUNK_OVERHEAD_SECONDS = 0.05
+
+
+def make_pages(seed: int = 0):
+    rng = random.Random(seed)
+    pages, current, size, total = [], [], 0, 0
+    while total < BOOK_CHARS:
+        sentence = rng.choice(SENTENCES)
+        current.append(sentence)
+        size += len(sentence) + 1
+        if size >= PAGE_CHARS:
+            pages.append(" ".join(current))
+            total += size
+            current, size = [], 0
+    return pages
+
+
+def request_latency(chunks) -> float:
+    """All the chunks of a request generate in parallel: the request ends with its longest chunk."""
+    return max(
+        CHUNK_OVERHEAD_SECONDS
+        + len(chunk) / CHARS_PER_SECOND_OF_SPEECH * AUDIO_TOKENS_PER_SECOND * SECONDS_PER_AUDIO_TOKEN
+        for chunk in chunks
+    )
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def test_chunking_tail_latency(default_test_params):
+    pages = make_pages()
+    results = {}
+    for chunking in ("characters", "balanced"):
+        tokenizer = XTTSTokenizerFast.from_pretrained(default_test_params['gpt_model'], chunking=chunking)
+        chunked = [tokenizer.split_text(page, "en") for page in pages]
+        chunk_tokens = [
+            len(ids) for chunks in chunked
+            for ids in tokenizer(chunks, lang="en", add_special_tokens=False)['input_ids']
+        ]
+        latencies = [request_latency(chunks) for chunks in chunked]
+        results[chunking] = latencies
+
+        print(f"\n[{chunking}] {len(pages)} pages, {len(chunk_tokens)} chunks, "
+              f"{statistics.mean(chunk_tokens):.0f} ± {statistics.pstdev(chunk_tokens):.0f} tokens per chunk "
+              f"(max {max(chunk_tokens)})")
+        print(f"  request latency p50 {percentile(latencies, 0.5):.2f}s, p90 {percentile(latencies, 0.9):.2f}s, "
+              f"p99 {percentile(latencies, 0.99):.2f}s")
+
+        assert max(chunk_tokens) <= tokenizer.max_text_tokens
+
+    assert percentile(results["balanced"], 0.99) <= percentile(results["characters"], 0.99)
+    assert statistics.mean(results["balanced"]) <= statistics.mean(results["characters"])
+
+
+if __name__ == "__main__":
+    test_chunking_tail_latency({"gpt_model": "AstraMindAI/xtts2-gpt"})
@@ -0,0 +1,68 @@
+import time
+
+import pytest
+import torch
+
+from auralis.models.xttsv2.components.vllm_mm_gpt import GPT2Model
+
+HIDDEN_SIZE = 1024
+CONDITIONING_LENGTH = 32 + 60  # perceiver latents and the text of a sentence
+DECODING_SEQUENCES = 256  # tokens of the sequences in their decoding phase, in the same batch
+REPEATS = 20
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def insert_one_by_one(hidden_states, conditioning_inputs, start_of_generation_embed, insertion_ids, is_logit_only):
+    """Insertion as it was done before the precomputed layout: a full copy per sequence."""
+    for idx, (insertion_idx, conditioning_input) in enumerate(zip(insertion_ids, conditioning_inputs)):
+        hidden_states = torch.cat([
+            hidden_states[:insertion_idx],
+            conditioning_input.squeeze(0),
+            start_of_generation_embed[:0] if is_logit_only[idx] else start_of_generation_embed,
+            hidden_states[insertion_idx:]], dim=0
+        )
+    return hidden_states
+
+
+def make_batch(sequences: int):
+    hidden_states = torch.randn(DECODING_SEQUENCES, HIDDEN_SIZE, device=DEVICE)
+    conditioning_inputs = [torch.randn(CONDITIONING_LENGTH, HIDDEN_SIZE, device=DEVICE) for _ in range(sequences)]
+    # the new sequences come first in the batch, each one after the previous
+    insertion_ids = [i * (CONDITIONING_LENGTH + 1) for i in range(sequences)]
+    is_logit_only = torch.zeros(sequences, dtype=torch.bool)
+    return hidden_states, conditioning_inputs, torch.randn(1, HIDDEN_SIZE, device=DEVICE), insertion_ids, is_logit_only
+
+
+def time_it(fn, batch) -> float:
+    fn(*batch)  # warm up
+    if DEVICE == "cuda":
+        torch.cuda.synchronize()
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(*batch)
+    if DEVICE == "cuda":
+        torch.cuda.synchronize()
+    return (time.perf_counter() - start) / REPEATS
+
+
+@pytest.mark.parametrize("sequences", [1, 8, 32, 128])
+def test_conditioning_insertion_benchmark(sequences):
+    batch = make_batch(sequences)
+    assert torch.equal(GPT2Model._insert_conditioning_into_hidden_states(*batch), insert_one_by_one(*batch))
+
+    timings = {
+        "cat per sequence": time_it(insert_one_by_one, batch),
+        "single layout": time_it(GPT2Model._insert_conditioning_into_hidden_states, batch),
+    }
+
+    print(f"\n[{sequences} new sequences, {DEVICE}]")
+    for name, seconds in timings.items():
+        print(f"  {name:>16}: {seconds * 1e3:8.3f}ms")
+
+    if sequences >= 8:
+        assert timings["single layout"] < timings["cat per sequence"]
+
+
+if __name__ == "__main__":
+    for sequences in (1, 8, 32, 128):
+        test_conditioning_insertion_benchmark(sequences)
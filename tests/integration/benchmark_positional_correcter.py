@@ -0,0 +1,81 @@
+import random
+import time
+
+import pytest
+
+from auralis.models.xttsv2.components.vllm.positional_embeddings_correcter import PositionalEmbeddingsCorrecter
+
+DECODE_STEPS = 200
+PREFILL_LEN = 80
+AUDIO_TOKENS = 1024
+
+
+class ScanningCorrecter(PositionalEmbeddingsCorrecter):
+    """Bookkeeping as it was done before the reverse index: string keys, scanned at every token."""
+
+    def _map_token(self, request_id, token_id, position_id):
+        self._invalidate_previous_mapping(request_id)
+        self.token_to_request[f"{token_id}_{position_id}"] = request_id
+
+    def get_by_next_token(self, next_token_ids, next_position_ids):
+        prefill_lengths = []
+        for next_token_id, next_position_id in zip(next_token_ids, next_position_ids):
+            token_key = f"{next_token_id}_{next_position_id}"
+            if token_key in self.token_to_request:
+                request_id = self.token_to_request[token_key]
+                prefill_lengths.append(self.request_tracker_dict[request_id].update_(token_id=next_token_id))
+        if not prefill_lengths:
+            raise ValueError("No valid mappings found for token pairs")
+        return prefill_lengths
+
+    def _invalidate_previous_mapping(self, request_id):
+        keys_to_remove = [
+            token_key for token_key, req_id in self.token_to_request.items()
+            if req_id == request_id
+        ]
+        for token_key in keys_to_remove:
+            del self.token_to_request[token_key]
+
+
+def decode(correcter: PositionalEmbeddingsCorrecter, sequences: int, seed: int = 0) -> float:
+    """Run the bookkeeping of ``sequences`` requests decoding together, as the model does."""
+    rng = random.Random(seed)
+    request_ids = [f"request_{i}" for i in range(sequences)]
+    next_tokens = [rng.randrange(AUDIO_TOKENS) for _ in request_ids]
+    for request_id, next_token in zip(request_ids, next_tokens):
+        correcter.init_request_id_prefill(request_id, PREFILL_LEN, next_token)
+
+    start = time.perf_counter()
+    for step in range(DECODE_STEPS):
+        # the forward pass looks the batch up, the sampler then maps the new tokens
+        found = correcter.get_by_next_token(next_tokens, [PREFILL_LEN + step] * sequences)
+        assert len(found) == sequences
+        next_tokens = [rng.randrange(AUDIO_TOKENS) for _ in request_ids]
+        for request_id, next_token in zip(request_ids, next_tokens):
+            correcter.associate_new_tokens(request_id, next_token)
+    elapsed = time.perf_counter() - start
+
+    for request_id in request_ids:
+        correcter.clear_request(request_id)
+    assert not correcter.token_to_request
+    return elapsed
+
+
+@pytest.mark.parametrize("sequences", [1, 64, 512])
+def test_positional_correcter_benchmark(sequences):
+    timings = {
+        "scan": decode(ScanningCorrecter(), sequences),
+        "reverse index": decode(PositionalEmbeddingsCorrecter(), sequences),
+    }
+
+    print(f"\n[{sequences} sequences] {DECODE_STEPS} decode steps")
+    for name, seconds in timings.items():
+        print(f"  {name:>14}: {seconds * 1e3:9.2f}ms ({seconds / DECODE_STEPS * 1e6:9.1f}µs per step)")
+
+    if sequences > 1:
+        assert timings["reverse index"] < timings["scan"]
+
+
+if __name__ == "__main__":
+    for sequences in (1, 64, 512):
+        test_positional_correcter_benchmark(sequences)
@@ -0,0 +1,102 @@
+import random
+import time
+
+import pytest
+
+from auralis.models.xttsv2.config.tokenizer import _build_spacy_lang, sentence_segmenters
+
+# A few sentences per language, shuffled into a novel-sized corpus
+SENTENCES = {
+    "en": [
+        "The rain had not stopped for three days.",
+        "Mr. Holloway closed the shutters and lit the lamp by the window.",
+        "\"Are you coming back tonight?\" she asked, without looking up.",
+        "Nobody in the village remembered the last time the river had flooded.",
+        "He folded the letter twice, then put it in his coat pocket!",
+    ],
+    "es": [
+        "La lluvia no había parado en tres días.",
+        "El Sr. Ortega cerró las contraventanas y encendió la lámpara.",
+        "¿Vas a volver esta noche? preguntó ella sin levantar la vista.",
+        "Nadie en el pueblo recordaba la última vez que el río se había desbordado.",
+    ],
+    "fr": [
+        "La pluie n'avait pas cessé depuis trois jours.",
+        "M. Durand ferma les volets et alluma la lampe près de la fenêtre.",
+        "« Tu reviens ce soir ? » demanda-t-elle sans lever les yeux.",
+        "Personne au village ne se souvenait de la dernière crue de la rivière.",
+    ],
+    "de": [
+        "Der Regen hatte seit drei Tagen nicht aufgehört.",
+        "Hr. Becker schloss die Fensterläden und zündete die Lampe an.",
+        "„Kommst du heute Abend zurück?“, fragte sie, ohne aufzusehen.",
+        "Niemand im Dorf erinnerte sich an das letzte Hochwasser des Flusses.",
+    ],
+    "zh": [
+        "雨已经连续下了三天。",
+        "他关上百叶窗，点亮了窗边的灯。",
+        "“你今晚回来吗？”她头也不抬地问。",
+        "村里没有人记得河水上一次泛滥是什么时候。",
+    ],
+    "ja": [
+        "雨は三日間やまなかった。",
+        "彼は雨戸を閉めて、窓辺のランプに火をともした。",
+        "「今夜は帰ってくるの？」と彼女は顔も上げずに尋ねた。",
+        "村の誰も、川が最後にあふれたのがいつだったか覚えていなかった。",
+    ],
+}
+
+CORPUS_CHARS = 500_000  # roughly a novel per language
+PARAGRAPH_CHARS = 2_000  # text sent per request
+
+
+def make_paragraphs(lang: str, seed: int = 0):
+    rng = random.Random(seed)
+    sentences = SENTENCES[lang]
+    separator = "" if lang in ("zh", "ja") else " "
+    paragraphs, current, size, total = [], [], 0, 0
+    while total < CORPUS_CHARS:
+        sentence = rng.choice(sentences)
+        current.append(sentence)
+        size += len(sentence) + len(separator)
+        if size >= PARAGRAPH_CHARS:
+            paragraphs.append(separator.join(current))
+            total += size
+            current, size = [], 0
+    return paragraphs
+
+
+def split_rebuilding_pipeline(text: str, lang: str):
+    """Segmentation as it was done before the registry: a new pipeline per call."""
+    return [str(sent).strip() for sent in _build_spacy_lang(lang)(text).sents]
+
+
+def time_it(fn, paragraphs) -> float:
+    start = time.perf_counter()
+    for paragraph in paragraphs:
+        fn(paragraph)
+    return time.perf_counter() - start
+
+
+@pytest.mark.parametrize("lang", list(SENTENCES))
+def test_sentence_split_benchmark(lang):
+    paragraphs = make_paragraphs(lang)
+    sentence_segmenters.get(lang)  # exclude the one-off build from the cached timings
+
+    timings = {
+        "rebuild per call": time_it(lambda p: split_rebuilding_pipeline(p, lang), paragraphs),
+        "cached spacy": time_it(lambda p: sentence_segmenters.segment(p, lang, mode="spacy"), paragraphs),
+        "regex": time_it(lambda p: sentence_segmenters.segment(p, lang, mode="regex"), paragraphs),
+    }
+
+    chars = sum(len(p) for p in paragraphs)
+    print(f"\n[{lang}] {len(paragraphs)} paragraphs, {chars / 1e3:.0f}k chars")
+    for name, seconds in timings.items():
+        print(f"  {name:>16}: {seconds:7.2f}s ({chars / seconds / 1e6:.2f} Mchar/s)")
+
+    assert timings["cached spacy"] < timings["rebuild per call"]
+
+
+if __name__ == "__main__":
+    for lang in SENTENCES:
+        test_sentence_split_benchmark(lang)
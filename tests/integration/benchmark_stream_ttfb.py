@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+import torch
+
+from auralis.models.xttsv2.components.tts.layers.xtts.hifigan_decoder import HifiDecoder
+from auralis.models.xttsv2.components.tts.layers.xtts.windowed_vocoder import WindowedVocoder
+
+SENTENCE_TOKENS = 200  # about 9s of audio
+TOKEN_INTERVAL = 0.01  # stand-in for the decoding step of the GPT
+HIDDEN_SIZE = 1024
+
+
+class StandInGeneration:
+    """Produces the hidden states of a sentence at the pace of the GPT, like the engine with delta outputs."""
+
+    def __init__(self, tokens: int):
+        self.latents = torch.randn(1, tokens, HIDDEN_SIZE)
+        self.available = 0
+        self.finished = False
+        self.progress = asyncio.Event()
+
+    async def run(self):
+        for _ in range(self.latents.shape[1]):
+            await asyncio.sleep(TOKEN_INTERVAL)
+            self.available += 1
+            self.progress.set()
+        self.finished = True
+        self.progress.set()
+
+    async def wait(self):
+        await self.progress.wait()
+        self.progress.clear()
+
+
+@torch.inference_mode()
+def vocode(decoder: HifiDecoder, latents: torch.Tensor, speaker_embedding: torch.Tensor) -> np.ndarray:
+    return decoder(latents, g=speaker_embedding).cpu().numpy().squeeze()
+
+
+async def whole_sentence(decoder, speaker_embedding, generation: StandInGeneration):
+    """Vocoding once the sentence ends, as with final only outputs. Returns (ttfb, total, audio)."""
+    start = time.perf_counter()
+    producer = asyncio.create_task(generation.run())
+    while not generation.finished:
+        await generation.wait()
+    await producer
+    audio = await asyncio.to_thread(vocode, decoder, generation.latents, speaker_embedding)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, [audio]
+
+
+async def windowed(decoder, speaker_embedding, generation: StandInGeneration, window_tokens: int = 32):
+    """Vocoding windows of tokens while the sentence is generated. Returns (ttfb, total, audio)."""
+    windows = WindowedVocoder(window_tokens=window_tokens, context_tokens=8)
+    start, ttfb, chunks = time.perf_counter(), None, []
+    producer = asyncio.create_task(generation.run())
+    while True:
+        finished = generation.finished
+        window = windows.next_window(generation.available, finished)
+        if window is None:
+            if finished:
+                break
+            await generation.wait()
+            continue
+        wav = await asyncio.to_thread(
+            vocode, decoder, generation.latents[:, window[0]:window[1]], speaker_embedding
+        )
+        chunks.append(windows.splice(wav, window, finished))
+        if ttfb is None:
+            ttfb = time.perf_counter() - start
+        if finished:
+            break
+    await producer
+    return ttfb, time.perf_counter() - start, chunks
+
+
+async def measure():
+    torch.manual_seed(0)
+    decoder = HifiDecoder().eval()
+    speaker_embedding = torch.randn(1, 512, 1)
+    vocode(decoder, torch.randn(1, 8, HIDDEN_SIZE), speaker_embedding)  # warm up
+
+    return {
+        "whole sentence": await whole_sentence(decoder, speaker_embedding, StandInGeneration(SENTENCE_TOKENS)),
+        "windows of 16": await windowed(decoder, speaker_embedding, StandInGeneration(SENTENCE_TOKENS), 16),
+        "windows of 32": await windowed(decoder, speaker_embedding, StandInGeneration(SENTENCE_TOKENS), 32),
+    }
+
+
+@pytest.mark.asyncio
+async def test_stream_ttfb_benchmark():
+    timings = await measure()
+
+    print(f"\n{SENTENCE_TOKENS} tokens generated every {TOKEN_INTERVAL * 1e3:.0f}ms")
+    for name, (ttfb, total, chunks) in timings.items():
+        samples = sum(len(chunk) for chunk in chunks)
+        print(f"  {name:>14}: first audio {ttfb * 1e3:8.1f}ms, all audio {total * 1e3:8.1f}ms "
+              f"({len(chunks)} chunks, {samples} samples)")
+
+    whole_samples = len(timings["whole sentence"][2][0])
+    for name in ("windows of 16", "windows of 32"):
+        assert timings[name][0] < timings["whole sentence"][0]
+        # the windows add up to the same amount of audio, give or take the interpolation rounding
+        assert abs(sum(len(chunk) for chunk in timings[name][2]) - whole_samples) < 1024 * len(timings[name][2])
+
+
+if __name__ == "__main__":
+    asyncio.run(test_stream_ttfb_benchmark())
@@ -0,0 +1,88 @@
+import random
+import time
+
+import torch
+from torch import nn
+
+from auralis.models.xttsv2.components.tts.layers.xtts.text_conditioning import PackedTextEmbedder, merge_conditioning
+from auralis.models.xttsv2.components.vllm_mm_gpt import LearnedPositionEmbeddings
+
+CHUNKS = 3000  # a book
+REPEATS = 5
+HIDDEN_SIZE = 1024
+VOCAB_SIZE = 6681
+DEVICE = 'cuda' if torch.cuda.is_available() else 'cpu'
+
+
+def synchronize():
+    if DEVICE == 'cuda':
+        torch.cuda.synchronize()
+
+
+@torch.inference_mode()
+def one_by_one(embedder: PackedTextEmbedder, chunks, audio_conditioning):
+    """Preparation before the packed path: one copy, two lookups, a cat and a cast per chunk."""
+    merged = []
+    for chunk in chunks:
+        tokens = torch.tensor([1, *chunk, 2]).unsqueeze(0).to(DEVICE)
+        text_embedding = embedder.text_embedding(tokens) + embedder.text_pos_embedding(tokens)
+        merged.append(torch.cat([audio_conditioning, text_embedding], dim=1).squeeze(0).to(torch.float16))
+    return merged
+
+
+def packed(embedder: PackedTextEmbedder, chunks, audio_conditioning):
+    return merge_conditioning(embedder.embed(chunks), audio_conditioning, torch.float16)
+
+
+def streamed(embedder: PackedTextEmbedder, chunks, audio_conditioning, max_batch: int = 32):
+    """Batches as the engine streams a text from a thread: 1, 2, 4... chunks, up to max_batch."""
+    merged, start, batch_size = [], 0, 1
+    while start < len(chunks):
+        merged += packed(embedder, chunks[start:start + batch_size], audio_conditioning)
+        start += batch_size
+        batch_size = min(2 * batch_size, max_batch)
+    return merged
+
+
+def timed(function, *args):
+    """Best of a few runs, the first ones mostly measure the allocator."""
+    best = float('inf')
+    for _ in range(REPEATS):
+        synchronize()
+        start = time.perf_counter()
+        function(*args)
+        synchronize()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_text_conditioning_benchmark():
+    rng = random.Random(0)
+    chunks = [[rng.randrange(3, VOCAB_SIZE) for _ in range(rng.randint(20, 80))] for _ in range(CHUNKS)]
+    text_embedding = nn.Embedding(VOCAB_SIZE, HIDDEN_SIZE).to(DEVICE)
+    text_pos_embedding = LearnedPositionEmbeddings(404, HIDDEN_SIZE).to(DEVICE)
+    embedder = PackedTextEmbedder(text_embedding, text_pos_embedding, 1, 2, cache_size_bytes=0)
+    cached_embedder = PackedTextEmbedder(text_embedding, text_pos_embedding, 1, 2, cache_size_bytes=1024 ** 3)
+    audio_conditioning = torch.randn(1, 32, HIDDEN_SIZE, device=DEVICE)
+
+    timings = {
+        "one by one": timed(one_by_one, embedder, chunks, audio_conditioning),
+        "packed": timed(packed, embedder, chunks, audio_conditioning),
+        "streamed": timed(streamed, embedder, chunks, audio_conditioning),
+        "packed, cached": timed(packed, cached_embedder, chunks, audio_conditioning),
+    }
+
+    print(f"\n{CHUNKS} chunks on {DEVICE}")
+    for name, seconds in timings.items():
+        print(f"  {name:>14}: {seconds * 1e3:8.1f}ms")
+
+    # the packed path saves kernel launches, but on the CPU the temporaries of a whole book
+    # outgrow the cache where the per-chunk ones don't; the streamed batches do well on both
+    if DEVICE == 'cuda':
+        assert timings["packed"] < timings["one by one"]
+    assert timings["streamed"] < timings["one by one"]
+    assert timings["packed, cached"] < timings["one by one"]
+
+
+if __name__ == "__main__":
+    test_text_conditioning_benchmark()
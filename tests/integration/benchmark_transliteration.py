@@ -0,0 +1,116 @@
+import random
+import time
+
+import cutlet
+import pypinyin
+import pytest
+from hangul_romanize import Transliter
+from hangul_romanize.rule import academic
+
+from auralis.models.xttsv2.config.tokenizer import (
+    chinese_transliterate_batch,
+    japanese_cleaners_batch,
+    korean_transliterate_batch,
+    lowercase,
+    transliteration_caches,
+)
+
+# Everyday sentences, mixed into requests the way a chat or audiobook workload repeats vocabulary
+SENTENCES = {
+    "zh": [
+        "今天天气很好，我们去公园散步吧。",
+        "请问火车站怎么走？",
+        "他每天早上七点起床，然后去上班。",
+        "这本书非常有意思，我已经看了两遍。",
+        "我们明天下午三点在咖啡馆见面。",
+        "谢谢你的帮助，我真的很感激。",
+        "这个城市的冬天特别冷。",
+        "她在学校教中文和历史。",
+    ],
+    "ja": [
+        "今日はいい天気ですね。",
+        "駅までどうやって行けばいいですか？",
+        "彼は毎朝七時に起きて、会社に行きます。",
+        "この本はとても面白くて、もう二回読みました。",
+        "明日の午後三時に喫茶店で会いましょう。",
+        "手伝ってくれてありがとう、本当に助かりました。",
+        "この町の冬はとても寒いです。",
+        "彼女は学校で日本語と歴史を教えています。",
+    ],
+    "ko": [
+        "오늘 날씨가 정말 좋네요.",
+        "기차역에 어떻게 가야 하나요?",
+        "그는 매일 아침 일곱 시에 일어나서 회사에 갑니다.",
+        "이 책은 정말 재미있어서 벌써 두 번 읽었어요.",
+        "내일 오후 세 시에 카페에서 만나요.",
+        "도와주셔서 정말 감사합니다.",
+        "이 도시의 겨울은 아주 춥습니다.",
+        "그녀는 학교에서 한국어와 역사를 가르칩니다.",
+    ],
+}
+
+REQUESTS = 2000
+SENTENCES_PER_REQUEST = 3
+
+katsu = cutlet.Cutlet()
+korean_transliter = Transliter(academic)
+
+# The transliterators as they were called before memoization: once per whole chunk
+UNCACHED = {
+    "zh": lambda text: "".join(
+        p[0] for p in pypinyin.pinyin(text, style=pypinyin.Style.TONE3, heteronym=False, neutral_tone_with_five=True)
+    ),
+    "ja": lambda text: lowercase(katsu.romaji(text)),
+    "ko": korean_transliter.translit,
+}
+BATCHED = {
+    "zh": chinese_transliterate_batch,
+    "ja": lambda texts: japanese_cleaners_batch(texts, katsu),
+    "ko": lambda texts: korean_transliterate_batch(texts, korean_transliter),
+}
+
+
+def make_requests(lang: str, seed: int = 0):
+    rng = random.Random(seed)
+    separator = " " if lang == "ko" else ""
+    return [
+        separator.join(rng.choice(SENTENCES[lang]) for _ in range(SENTENCES_PER_REQUEST))
+        for _ in range(REQUESTS)
+    ]
+
+
+@pytest.mark.parametrize("lang", list(SENTENCES))
+def test_transliteration_benchmark(lang):
+    texts = make_requests(lang)
+    cache = transliteration_caches[lang]
+    cache.clear()
+
+    start = time.perf_counter()
+    expected = [UNCACHED[lang](text) for text in texts]
+    uncached_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    per_request = [BATCHED[lang]([text])[0] for text in texts]
+    per_request_seconds = time.perf_counter() - start
+    stats = cache.stats
+
+    cache.clear()
+    start = time.perf_counter()
+    batched = BATCHED[lang](texts)
+    batched_seconds = time.perf_counter() - start
+
+    print(f"\n[{lang}] {len(texts)} requests, {sum(len(t) for t in texts) / 1e3:.0f}k chars")
+    print(f"  {'uncached':>20}: {uncached_seconds:7.3f}s")
+    print(f"  {'memoized per request':>20}: {per_request_seconds:7.3f}s")
+    print(f"  {'memoized batch':>20}: {batched_seconds:7.3f}s")
+    print(f"  hit rate {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses), "
+          f"~{stats['saved_seconds']:.3f}s saved")
+
+    assert per_request == expected
+    assert batched == expected
+    assert per_request_seconds < uncached_seconds
+
+
+if __name__ == "__main__":
+    for lang in SENTENCES:
+        test_transliteration_benchmark(lang)
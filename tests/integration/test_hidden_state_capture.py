@@ -0,0 +1,105 @@
+import functools
+from types import SimpleNamespace
+
+import pytest
+import safetensors.torch
+import torch
+from torch import nn
+from transformers import AutoConfig, GPT2Config, GPT2Model
+
+from vllm import AsyncEngineArgs, AsyncLLMEngine
+
+from auralis.models.xttsv2.XTTSv2 import XTTSv2Engine
+from auralis.models.xttsv2.components.vllm.hidden_state_collector import GenerationHiddenStatesBuffer, HiddenStatesCollector
+from auralis.models.xttsv2.config.xttsv2_gpt_config import XTTSGPTConfig
+
+HIDDEN_SIZE = 64
+CONDITIONING_LENGTH = 32
+MAX_AUDIO_TOKENS = 40
+
+
+@pytest.fixture(scope="module")
+def tiny_gpt(tmp_path_factory):
+    """A random-weight XTTS GPT small enough to run anywhere vLLM runs."""
+    path = tmp_path_factory.mktemp("tiny-xtts-gpt")
+    AutoConfig.register("xtts_gpt", XTTSGPTConfig, exist_ok=True)
+    config = XTTSGPTConfig(
+        hidden_size=HIDDEN_SIZE,
+        n_inner=4 * HIDDEN_SIZE,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        decoder_input_dim=HIDDEN_SIZE,
+        gpt_max_audio_tokens=MAX_AUDIO_TOKENS,
+        auto_map={},
+    )
+    config.save_pretrained(path)
+
+    torch.manual_seed(0)
+    gpt = GPT2Model(GPT2Config(n_embd=HIDDEN_SIZE, n_layer=2, n_head=4, n_inner=4 * HIDDEN_SIZE))
+    weights = {f"gpt.{name}": tensor for name, tensor in gpt.state_dict().items()
+               if not name.startswith(("wte", "wpe"))}
+    weights.update({
+        "gpt.wte.weight": torch.randn(config.num_audio_tokens, HIDDEN_SIZE) * 0.02,
+        "gpt.wpe.emb.weight": torch.randn(config.max_audio_tokens + 3, HIDDEN_SIZE) * 0.02,
+        "final_norm.weight": torch.ones(HIDDEN_SIZE),
+        "final_norm.bias": torch.zeros(HIDDEN_SIZE),
+        "mel_head.weight": torch.randn(config.num_audio_tokens, HIDDEN_SIZE) * 0.02,
+        "mel_head.bias": torch.zeros(config.num_audio_tokens),
+    })
+    safetensors.torch.save_file({name: tensor.contiguous() for name, tensor in weights.items()},
+                                path / "model.safetensors")
+
+    engine = AsyncLLMEngine.from_engine_args(AsyncEngineArgs(
+        model=str(path),
+        dtype="float32",
+        skip_tokenizer_init=True,
+        trust_remote_code=True,
+        enforce_eager=True,
+        gpu_memory_utilization=0.2,
+        max_model_len=config.max_text_tokens + config.max_audio_tokens + 32 + 5 + 3,
+        limit_mm_per_prompt={"audio": 1},
+        max_num_seqs=4,
+    ))
+    # The engine methods under test only need these attributes
+    stand_in = SimpleNamespace(
+        llm_engine=engine,
+        gpt_config=config,
+        mel_bos_token_id=config.start_audio_token,
+        mel_eos_token_id=config.stop_audio_token,
+        final_norm=nn.LayerNorm(HIDDEN_SIZE).cuda(),
+        device=torch.device("cuda"),
+        dtype=torch.float32,
+        capture_hidden_states=True,
+        generation_states=GenerationHiddenStatesBuffer(),
+        hidden_states_collector=HiddenStatesCollector(),
+        enable_prefix_caching=False,
+        stream_window_tokens=None,
+    )
+    stand_in._streams_audio_windows = functools.partial(XTTSv2Engine._streams_audio_windows, stand_in)
+    yield stand_in
+    engine.shutdown_background_loop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("text_length", [3, 17])
+async def test_captured_hidden_states_match_second_prefill(tiny_gpt, text_length):
+    request = SimpleNamespace(request_id=f"capture-{text_length}", temperature=0.75, top_p=0.85,
+                              top_k=50, repetition_penalty=5.0, stream=False)
+    conditioning = torch.randn(CONDITIONING_LENGTH + text_length, HIDDEN_SIZE) * 0.02
+
+    generator, _ = XTTSv2Engine._start_generation(tiny_gpt, request, 0, [1] * text_length, conditioning)
+    async for output in generator:
+        pass
+    assert output.finished
+
+    captured = XTTSv2Engine.get_captured_hidden_states(tiny_gpt, output)
+    recomputed = await XTTSv2Engine.get_model_logits(
+        tiny_gpt,
+        list(output.outputs[0].token_ids),
+        {"audio": {"embeds": conditioning, "is_logits_only_mode": True, "sequence_length": False}},
+        output.request_id,
+    )
+
+    assert captured is not None
+    assert captured.shape == recomputed.shape == (1, len(output.outputs[0].token_ids), HIDDEN_SIZE)
+    torch.testing.assert_close(captured, recomputed, atol=1e-4, rtol=1e-4)
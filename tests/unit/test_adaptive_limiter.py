@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from auralis.common.scheduling.adaptive_limiter import AdaptiveLimiter
+
+
+class FakeDevice:
+    """Runs ``capacity`` calls at once, ``seconds`` per unit of work, the others queue."""
+
+    def __init__(self, limiter: AdaptiveLimiter, capacity: int, seconds: float = 0.004):
+        self.limiter = limiter
+        self.units = asyncio.Semaphore(capacity)
+        self.seconds = seconds
+        self.active = 0
+        self.max_active = 0
+
+    async def call(self, work: int = 1):
+        async with self.limiter.acquire(work):
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            try:
+                async with self.units:
+                    await asyncio.sleep(self.seconds * work)
+            finally:
+                self.active -= 1
+
+
+async def run_clients(device: FakeDevice, clients: int, calls: int, work=lambda i: 1):
+    async def client(offset):
+        for i in range(offset, calls, clients):
+            await device.call(work(i))
+
+    await asyncio.gather(*(client(offset) for offset in range(clients)))
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_while_latency_stays_flat():
+    limiter = AdaptiveLimiter('vocoder', initial_limit=1, max_limit=6, window=4)
+    device = FakeDevice(limiter, capacity=16)
+
+    # calls of different sizes, the latency per unit of work stays the same
+    await run_clients(device, clients=12, calls=240, work=lambda i: 1 + i % 3)
+
+    assert limiter.limit == 6
+    assert device.max_active <= 6
+
+
+@pytest.mark.asyncio
+async def test_limit_backs_off_when_latency_climbs():
+    limiter = AdaptiveLimiter('vocoder', initial_limit=12, max_limit=16, window=4)
+    device = FakeDevice(limiter, capacity=2)
+
+    await run_clients(device, clients=16, calls=320)
+
+    assert limiter.limit <= 4
+    assert limiter.stats['latency'] > 0 and limiter.stats['in_flight'] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiters_give_their_slot_back():
+    limiter = AdaptiveLimiter('conditioning', initial_limit=1, max_limit=1)
+    release = asyncio.Event()
+
+    async def hold():
+        async with limiter.acquire():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    assert limiter.stats['waiting'] == 1
+
+    waiter.cancel()
+    release.set()
+    await asyncio.gather(holder, waiter, return_exceptions=True)
+
+    assert limiter.in_flight == 0 and not limiter.waiters
+    async with limiter.acquire():
+        assert limiter.in_flight == 1
+
+
+def test_limits_are_validated():
+    with pytest.raises(ValueError):
+        AdaptiveLimiter('vocoder', initial_limit=1, max_limit=0)
+    # the first window measures the baseline at the lowest limit
+    limiter = AdaptiveLimiter('vocoder', initial_limit=10, max_limit=4, min_limit=2)
+    assert limiter.limit == 2 and limiter._probe_return == 4
@@ -0,0 +1,157 @@
+import os
+
+import numpy as np
+import pytest
+import soundfile as sf
+import torch
+import torchaudio
+
+from auralis.common.audio import ingest
+from auralis.common.audio.ingest import AudioIngestor, decode_audio, get_resampler, resample
+
+SAMPLE_RATE = 24000
+
+
+def write_wav(path, seconds: float = 1.0, sample_rate: int = 44100, seed: int = 0, channels: int = 1):
+    rng = np.random.default_rng(seed)
+    data = (rng.uniform(-0.5, 0.5, (int(seconds * sample_rate), channels))).astype(np.float32)
+    sf.write(path, data, sample_rate, subtype='FLOAT')
+    return path
+
+
+@pytest.fixture
+def ingestor():
+    ingestor = AudioIngestor(max_workers=1)
+    yield ingestor
+    ingestor.shutdown()
+
+
+def test_resampler_is_built_once_per_rate_pair():
+    assert get_resampler(44100, SAMPLE_RATE) is get_resampler(44100, SAMPLE_RATE)
+    assert get_resampler(44100, SAMPLE_RATE) is not get_resampler(22050, SAMPLE_RATE)
+    assert get_resampler(44100, SAMPLE_RATE) is not get_resampler(44100, SAMPLE_RATE, dtype=torch.float64)
+
+
+def test_cached_resampler_matches_functional_resample():
+    audio = torch.randn(1, 44100)
+
+    torch.testing.assert_close(resample(audio, 44100, SAMPLE_RATE),
+                               torchaudio.functional.resample(audio, 44100, SAMPLE_RATE))
+    assert resample(audio, SAMPLE_RATE, SAMPLE_RATE) is audio
+
+
+def test_same_content_is_decoded_once(ingestor, tmp_path, monkeypatch):
+    first = write_wav(tmp_path / "voice.wav")
+    renamed = tmp_path / "copy.wav"
+    renamed.write_bytes(first.read_bytes())
+    decodes = []
+    monkeypatch.setattr(ingest, 'decode_audio', lambda *args: decodes.append(args) or decode_audio(*args))
+
+    audio = ingestor.load(str(first), SAMPLE_RATE)
+    assert torch.equal(ingestor.load(str(renamed), SAMPLE_RATE), audio)
+    assert torch.equal(ingestor.load(renamed.read_bytes(), SAMPLE_RATE), audio)
+    assert len(decodes) == 1
+
+    # callers get their own copy, not the cached tensor
+    audio.zero_()
+    assert ingestor.load(str(first), SAMPLE_RATE).abs().sum() > 0
+
+
+def test_content_cache_is_bounded(tmp_path):
+    ingestor = AudioIngestor(max_workers=1, cache_size_bytes=3 * SAMPLE_RATE * 4)  # three seconds of audio
+    try:
+        for seed in range(5):
+            ingestor.load(str(write_wav(tmp_path / f"{seed}.wav", seed=seed)), SAMPLE_RATE)
+        assert len(ingestor._cache) == 3
+        assert ingestor._cache.currsize <= ingestor._cache.maxsize
+    finally:
+        ingestor.shutdown()
+
+
+def test_file_hash_is_memoized_until_the_file_changes(ingestor, tmp_path, monkeypatch):
+    path = write_wav(tmp_path / "voice.wav")
+    reads = []
+    monkeypatch.setattr(ingest, 'hash_audio_source', lambda source: reads.append(source) or "hash")
+
+    assert ingestor.content_hash(str(path)) == ingestor.content_hash(str(path))
+    assert len(reads) == 1
+
+    write_wav(path, seed=1)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    ingestor.content_hash(str(path))
+    assert len(reads) == 2
+
+
+def test_edited_file_is_not_served_from_the_cache(ingestor, tmp_path):
+    path = write_wav(tmp_path / "voice.wav")
+    before = ingestor.load(str(path), SAMPLE_RATE)
+
+    write_wav(path, seed=1)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert not torch.equal(ingestor.load(str(path), SAMPLE_RATE), before)
+
+
+def test_max_length_decodes_only_the_start(ingestor, tmp_path):
+    path = write_wav(tmp_path / "long.wav", seconds=10.0, channels=2)
+
+    audio, sr = decode_audio(str(path), max_length=2.0)
+    assert sr == 44100
+    assert audio.shape[0] == 1
+    assert 2.0 * sr < audio.shape[1] < 2.1 * sr
+
+    full, _ = decode_audio(str(path))
+    assert full.shape[1] == 10 * 44100
+    torch.testing.assert_close(audio, full[:, :audio.shape[1]])
+
+    loaded = ingestor.load(str(path), SAMPLE_RATE, max_length=2.0)
+    assert loaded.shape == (1, 2 * SAMPLE_RATE)
+    # the margin keeps the resampler away from the cut
+    torch.testing.assert_close(loaded, resample(full, 44100, SAMPLE_RATE)[:, :2 * SAMPLE_RATE])
+    # a different max_length is a different entry
+    assert ingestor.load(str(path), SAMPLE_RATE, max_length=1.0).shape == (1, SAMPLE_RATE)
+
+
+@pytest.mark.parametrize("make_source", [
+    lambda audio: audio[0].numpy(),
+    lambda audio: audio[0],
+    lambda audio: (audio[0].numpy(), 44100),
+    lambda audio: (audio.repeat(2, 1), 44100),  # stereo, channels first
+])
+def test_in_memory_sources_skip_decoding(ingestor, monkeypatch, make_source):
+    monkeypatch.setattr(ingest, 'decode_audio', lambda *args: pytest.fail("in-memory audio was decoded"))
+    audio = torch.rand(1, 44100) - 0.5
+    source = make_source(audio)
+
+    loaded = ingestor.load(source, SAMPLE_RATE, max_length=0.5)
+
+    if isinstance(source, tuple):
+        # tuples carry their rate and are resampled
+        expected = resample(audio, 44100, SAMPLE_RATE)[:, :SAMPLE_RATE // 2]
+    else:
+        # bare arrays are taken as sampled at the target rate already
+        expected = audio[:, :SAMPLE_RATE // 2]
+    torch.testing.assert_close(loaded, expected)
+    assert not ingestor._cache
+
+
+def test_in_memory_sources_are_clipped_and_copied(ingestor):
+    audio = torch.linspace(-2, 2, SAMPLE_RATE)
+
+    loaded = ingestor.load(audio, SAMPLE_RATE)
+
+    assert loaded.min() == -1 and loaded.max() == 1
+    assert audio.min() == -2  # the caller's waveform is left untouched
+
+
+def test_in_memory_content_hash():
+    ingestor = AudioIngestor(max_workers=1)
+    try:
+        audio = np.random.default_rng(0).uniform(-1, 1, SAMPLE_RATE).astype(np.float32)
+
+        assert ingestor.content_hash(audio) == ingestor.content_hash(torch.from_numpy(audio.copy()))
+        assert ingestor.content_hash((audio, 22050)) != ingestor.content_hash((audio, 44100))
+        assert ingestor.content_hash(audio) != ingestor.content_hash(audio[::-1])
+    finally:
+        ingestor.shutdown()
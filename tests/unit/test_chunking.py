@@ -0,0 +1,28 @@
+import random
+
+from auralis.models.xttsv2.config.chunking import DurationModel, balance_chunks
+
+
+def test_balance_chunks_keeps_chunk_count_and_lowers_longest_chunk():
+    rng = random.Random(0)
+    token_counts = [rng.choice([3, 8, 15, 40, 90]) for _ in range(200)]
+    model = DurationModel()
+
+    chunks = balance_chunks(token_counts, max_chunk_tokens=120, duration_model=model)
+    packed = balance_chunks(token_counts, max_chunk_tokens=120, duration_model=model, iterations=0)
+
+    # Contiguous cover of every sentence, as many chunks as plain packing, none too long
+    assert [start for start, _ in chunks] == [0] + [end for _, end in chunks[:-1]]
+    assert chunks[-1][1] == len(token_counts)
+    assert len(chunks) == len(packed)
+    chunk_tokens = [sum(token_counts[start:end]) + end - start - 1 for start, end in chunks]
+    packed_tokens = [sum(token_counts[start:end]) + end - start - 1 for start, end in packed]
+    assert max(chunk_tokens) <= 120
+    assert max(chunk_tokens) <= max(packed_tokens)
+
+
+def test_duration_model_fit():
+    model = DurationModel.fit([10, 20, 30, 40], [32, 56, 80, 104])
+    assert abs(model.audio_tokens_per_text_token - 2.4) < 1e-9
+    assert abs(model.base_audio_tokens - 8.0) < 1e-9
+    assert abs(model.predict(50) - 128.0) < 1e-9
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+import torch
+
+from auralis.models.xttsv2.components.vllm_mm_gpt import GPT2Model
+
+HIDDEN_SIZE = 8
+
+
+def insert_one_by_one(hidden_states, conditioning_inputs, start_of_generation_embed, insertion_ids, is_logit_only):
+    """Insertion as it was done before the precomputed layout: a full copy per sequence."""
+    for idx, (insertion_idx, conditioning_input) in enumerate(zip(insertion_ids, conditioning_inputs)):
+        hidden_states = torch.cat([
+            hidden_states[:insertion_idx],
+            conditioning_input.squeeze(0),
+            start_of_generation_embed[:0] if is_logit_only[idx] else start_of_generation_embed,
+            hidden_states[insertion_idx:]], dim=0
+        )
+    return hidden_states
+
+
+def make_batch(rng: random.Random, sequences: int, sorted_ids: bool = True):
+    num_tokens = rng.choice([0, 1, 5, 40])
+    conditioning_inputs = [
+        torch.randn(rng.choice([(1, rng.randint(2, 40), HIDDEN_SIZE), (rng.randint(2, 40), HIDDEN_SIZE)]))
+        for _ in range(sequences)
+    ]
+    insertion_ids, offset = [], 0
+    for conditioning_input in conditioning_inputs:
+        # in the model, each index accounts for the sequences inserted before it
+        insertion_idx = rng.randint(0, num_tokens) if not sorted_ids else offset + rng.randint(0, num_tokens)
+        insertion_ids.append(insertion_idx)
+        offset += conditioning_input.squeeze(0).shape[0]
+    is_logit_only = torch.tensor([rng.random() < 0.3 for _ in range(sequences)])
+    return torch.randn(num_tokens, HIDDEN_SIZE), conditioning_inputs, torch.randn(1, HIDDEN_SIZE), insertion_ids, is_logit_only
+
+
+@pytest.mark.parametrize("sequences", [1, 2, 7, 32])
+@pytest.mark.parametrize("sorted_ids", [True, False])
+def test_layout_insertion_matches_one_by_one(sequences, sorted_ids):
+    rng = random.Random(sequences)
+    for _ in range(50):
+        batch = make_batch(rng, sequences, sorted_ids)
+        expected = insert_one_by_one(*batch)
+        assert torch.equal(GPT2Model._insert_conditioning_into_hidden_states(*batch), expected)
+
+
+@pytest.mark.parametrize("sequences", [1, 3])
+def test_insertion_keeps_the_hidden_states_dtype(sequences):
+    hidden_states, conditioning_inputs, start_of_generation_embed, insertion_ids, is_logit_only = make_batch(
+        random.Random(0), sequences
+    )
+    hidden_states = hidden_states.half()
+
+    merged = GPT2Model._insert_conditioning_into_hidden_states(
+        hidden_states, conditioning_inputs, start_of_generation_embed, insertion_ids, is_logit_only
+    )
+
+    assert merged.dtype == torch.float16
+    expected = insert_one_by_one(hidden_states.float(), conditioning_inputs, start_of_generation_embed,
+                                 insertion_ids, is_logit_only)
+    assert torch.equal(merged, expected.half())
@@ -0,0 +1,147 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from auralis.common.audio import enhancement_cache as enhancement_cache_module
+from auralis.common.audio.enhancement_cache import STALE_TMP_SECONDS, EnhancementCache
+from auralis.common.definitions import requests
+from auralis.common.definitions.enhancer import AudioPreprocessingConfig
+from auralis.common.definitions.requests import TTSRequest
+
+
+def make_array(seed: int, size: int = 1000) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(size).astype(np.float32)
+
+
+def age(path, seconds: float):
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EnhancementCache(tmp_path / "enhancement", max_size_bytes=1024 ** 2)
+
+
+def test_round_trip_leaves_no_temporary_files(cache):
+    key = cache.make_key("content", "config")
+    assert cache.get(key) is None
+
+    cache.put(key, make_array(0))
+
+    np.testing.assert_array_equal(cache.get(key), make_array(0))
+    assert [path.name for path in cache.cache_dir.iterdir()] == [f"{key}.npy"]
+
+
+def test_failed_write_keeps_the_previous_entry(cache, monkeypatch):
+    key = cache.make_key("content", "config")
+    cache.put(key, make_array(0))
+
+    def interrupted_save(f, array, allow_pickle):
+        f.write(b"partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(enhancement_cache_module.np, 'save', interrupted_save)
+    cache.put(key, make_array(1))
+    monkeypatch.undo()
+
+    np.testing.assert_array_equal(cache.get(key), make_array(0))
+    assert len(list(cache.cache_dir.iterdir())) == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    entry_bytes = make_array(0).nbytes + 128  # with the .npy header
+    cache = EnhancementCache(tmp_path, max_size_bytes=3 * entry_bytes)
+    keys = [cache.make_key(str(i), "config") for i in range(5)]
+    for i, key in enumerate(keys[:3]):
+        cache.put(key, make_array(i))
+        age(cache._path(key), 100 - i)
+    # a hit makes the oldest entry the most recently used
+    assert cache.get(keys[0]) is not None
+
+    for i, key in enumerate(keys[3:], start=3):
+        cache.put(key, make_array(i))
+    cache.evict()
+
+    assert [cache.get(key) is not None for key in keys] == [True, False, False, True, True]
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= cache.max_size_bytes
+
+
+def test_writes_in_progress_count_against_the_budget(tmp_path):
+    cache = EnhancementCache(tmp_path, max_size_bytes=10_000)
+    key = cache.make_key("content", "config")
+    cache.put(key, make_array(0))
+    (tmp_path / f".{key}.writing.tmp").write_bytes(bytes(8_000))
+
+    cache.evict()
+
+    assert cache.get(key) is None
+    assert (tmp_path / f".{key}.writing.tmp").exists()
+
+
+@pytest.mark.parametrize("content", [b"", b"\x93NUMPY garbage", b"not an array at all"])
+def test_corrupt_entries_are_discarded(cache, content):
+    key = cache.make_key("content", "config")
+    cache.put(key, make_array(0))
+    cache._path(key).write_bytes(content)
+
+    assert cache.get(key) is None
+    assert not cache._path(key).exists()
+
+    cache.put(key, make_array(0))
+    np.testing.assert_array_equal(cache.get(key), make_array(0))
+
+
+def test_stale_temporary_files_are_swept(tmp_path):
+    stale, fresh = tmp_path / ".a.1.tmp", tmp_path / ".b.2.tmp"
+    for path in (stale, fresh):
+        path.write_bytes(bytes(100))
+    age(stale, STALE_TMP_SECONDS + 60)
+
+    EnhancementCache(tmp_path, max_size_bytes=1024 ** 2)
+
+    assert not stale.exists()
+    assert fresh.exists()
+
+    age(fresh, STALE_TMP_SECONDS + 60)
+    EnhancementCache(tmp_path, max_size_bytes=1024 ** 2).evict()
+    assert not fresh.exists()
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = EnhancementCache(tmp_path / "enhancement", max_size_bytes=0)
+    cache.put(cache.make_key("content", "config"), make_array(0))
+
+    assert cache.get(cache.make_key("content", "config")) is None
+    assert not cache.cache_dir.exists()
+
+
+class RecordingProcessor:
+    def __init__(self, config):
+        self.config = config
+
+    def process(self, audio):
+        return audio.numpy() * 0.5
+
+
+def test_preprocess_audio_keys_and_processes_with_the_same_config(tmp_path, monkeypatch):
+    cache = EnhancementCache(tmp_path, max_size_bytes=1024 ** 2)
+    processors = []
+    monkeypatch.setattr(requests, 'enhancement_cache', cache)
+    monkeypatch.setattr(requests, 'get_audio_processor',
+                        lambda config: processors.append(RecordingProcessor(config)) or processors[-1])
+    audio = make_array(0, 22050)
+    request = TTSRequest(text="Hello.", speaker_files=[audio])
+
+    config, unnormalized = AudioPreprocessingConfig(), AudioPreprocessingConfig(normalize=False)
+    processed, sample_rate = request.preprocess_audio(audio, config)
+    assert sample_rate == config.sample_rate
+    assert request.preprocess_audio(audio, config)[0] is not processed  # from the disk cache
+    np.testing.assert_array_equal(request.preprocess_audio(audio, config)[0], processed)
+    request.preprocess_audio(audio, unnormalized)
+
+    assert [processor.config for processor in processors] == [config, unnormalized]
+    content_hash = requests.audio_ingestor.content_hash(audio)
+    assert cache.get(cache.make_key(content_hash, unnormalized.config_hash())) is not None
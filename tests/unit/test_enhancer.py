@@ -0,0 +1,109 @@
+import dataclasses
+
+import numpy as np
+import pytest
+import torch
+
+from auralis.common.definitions.enhancer import (
+    AudioPreprocessingConfig,
+    EnhancedAudioProcessor,
+    FusedAudioProcessor,
+    StreamingAudioProcessor,
+)
+
+SAMPLE_RATE = 22050
+
+
+def synthetic_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """Harmonic signal with a wobbling pitch, syllable-like envelope, background noise and a pause."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    f0 = 140 + 20 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 20))
+    envelope = (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)) ** 2
+    audio = 0.3 * voiced * envelope + 0.01 * rng.standard_normal(t.size)
+    pause = slice(int(0.4 * t.size), int(0.55 * t.size))
+    audio[pause] = 0.002 * rng.standard_normal(pause.stop - pause.start)
+    return audio.astype(np.float32)
+
+
+def snr_db(reference: np.ndarray, estimate: np.ndarray) -> float:
+    return 10 * np.log10(np.sum(reference ** 2) / max(np.sum((reference - estimate) ** 2), 1e-20))
+
+
+@pytest.mark.parametrize("seconds, seed", [(3.0, 0), (7.3, 1)])
+def test_fused_matches_reference(seconds, seed):
+    config = AudioPreprocessingConfig()
+    audio = synthetic_speech(seconds, seed)
+
+    reference = EnhancedAudioProcessor(config).process(audio)
+    fused = FusedAudioProcessor(config, torch.device('cpu')).process(audio)
+
+    assert fused.shape == reference.shape
+    assert not np.isnan(fused).any()
+    assert snr_db(reference, fused) > 30
+
+
+@pytest.mark.parametrize("stage", ["trim_silence", "remove_noise", "enhance_speech", "normalize"])
+def test_fused_single_stage_matches_reference(stage):
+    stages = ["trim_silence", "remove_noise", "enhance_speech", "normalize"]
+    config = dataclasses.replace(AudioPreprocessingConfig(), **{s: s == stage for s in stages})
+    audio = synthetic_speech(5.0, seed=2)
+
+    reference = EnhancedAudioProcessor(config).process(audio)
+    fused = FusedAudioProcessor(config, torch.device('cpu')).process(audio)
+
+    assert fused.shape == reference.shape
+    np.testing.assert_allclose(fused, reference, atol=1e-4)
+
+
+def test_fused_loudness_matches_pyloudnorm():
+    import pyloudnorm
+
+    audio = synthetic_speech(4.0)
+    expected = pyloudnorm.Meter(SAMPLE_RATE).integrated_loudness(audio.astype(np.float64))
+    measured = FusedAudioProcessor(AudioPreprocessingConfig(), torch.device('cpu')).integrated_loudness(
+        torch.from_numpy(audio)
+    )
+    assert measured == pytest.approx(expected, abs=1e-3)
+
+
+def test_fused_batch_matches_single_clips():
+    processor = FusedAudioProcessor(AudioPreprocessingConfig(), torch.device('cpu'))
+    clips = [synthetic_speech(seconds, seed) for seed, seconds in enumerate((3.0, 5.5, 4.1))]
+
+    batched = processor.process_batch(clips)
+
+    assert len(batched) == len(clips)
+    for clip, output in zip(clips, batched):
+        np.testing.assert_allclose(output.numpy(), processor.process(clip), atol=1e-5)
+
+
+@pytest.mark.parametrize("block_frames", [37, 200])
+@pytest.mark.parametrize("disabled", [None, "trim_silence", "remove_noise", "normalize"])
+def test_streaming_matches_fused(block_frames, disabled):
+    config = AudioPreprocessingConfig()
+    if disabled is not None:
+        config = dataclasses.replace(config, **{disabled: False})
+    audio = synthetic_speech(12.0, seed=3)
+
+    expected = FusedAudioProcessor(config, torch.device('cpu')).process(audio)
+    streamed = StreamingAudioProcessor(config, torch.device('cpu'), block_frames=block_frames).process(audio)
+
+    assert streamed.shape == expected.shape
+    np.testing.assert_allclose(streamed, expected, atol=1e-5)
+
+
+def test_streaming_file_matches_in_memory(tmp_path):
+    import soundfile as sf
+
+    audio = synthetic_speech(10.0, seed=4)
+    sf.write(tmp_path / "input.wav", audio, SAMPLE_RATE, subtype='FLOAT')
+    processor = StreamingAudioProcessor(AudioPreprocessingConfig(), torch.device('cpu'), block_frames=64)
+
+    written = processor.process_file(tmp_path / "input.wav", tmp_path / "output.wav")
+    output, _ = sf.read(tmp_path / "output.wav", dtype='float32')
+
+    assert written == len(output)
+    np.testing.assert_allclose(output, processor.process(audio), atol=1e-6)
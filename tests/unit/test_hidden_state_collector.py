@@ -0,0 +1,114 @@
+import asyncio
+import gc
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import torch
+
+from auralis.models.xttsv2.components.vllm.hidden_state_collector import HiddenStatesCollector
+
+CALLS = 10_000
+CONCURRENT_CALLS = 100
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.001) -> float:
+    """Longest delay of a periodic wake up of the loop."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+@pytest.mark.asyncio
+async def test_collector_stress_no_thread_growth_nor_loop_stalls():
+    collector = HiddenStatesCollector()
+    loop = asyncio.get_running_loop()
+    # stands for the thread VLLM runs the model in
+    model_thread = ThreadPoolExecutor(max_workers=1)
+    loop.run_in_executor(model_thread, lambda: None)
+    threads_before = threading.active_count()
+
+    async def call(request_id: str):
+        collect = collector.bind_to_request(request_id)
+        loop.run_in_executor(model_thread, collect, torch.ones(2, 4))
+        hidden_states = await collector.get_hidden_states(request_id)
+        assert hidden_states.shape == (2, 4)
+
+    stop = asyncio.Event()
+    lag = asyncio.create_task(measure_loop_lag(stop))
+    # full garbage collections walk every object torch created, not what is measured here
+    gc.freeze()
+    try:
+        for start in range(0, CALLS, CONCURRENT_CALLS):
+            await asyncio.gather(*(call(f"request_{i}") for i in range(start, start + CONCURRENT_CALLS)))
+            assert threading.active_count() == threads_before
+    finally:
+        gc.unfreeze()
+        stop.set()
+        model_thread.shutdown()
+
+    assert await lag < 0.1
+    assert not collector.slots
+    assert len(collector.free_slots) <= CONCURRENT_CALLS
+
+
+@pytest.mark.asyncio
+async def test_timed_out_request_is_released():
+    collector = HiddenStatesCollector()
+    collect = collector.bind_to_request("late")
+
+    assert await collector.get_hidden_states("late", timeout=0.01) is None
+    assert not collector.slots
+
+    collect(torch.ones(1, 4))  # arriving after the timeout is dropped
+    assert not collector.slots
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_is_released():
+    collector = HiddenStatesCollector()
+    collect = collector.bind_to_request("aborted")
+    collector.slots["aborted"].expected_states = 2
+    collect(torch.ones(1, 4))  # one state out of two, the wait goes on
+
+    waiting = asyncio.create_task(collector.get_hidden_states("aborted"))
+    await asyncio.sleep(0.01)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+
+    assert not collector.slots
+    assert all(not slot.outputs for slot in collector.free_slots)
+    collect(torch.ones(1, 4))  # arriving after the cancellation is dropped
+    assert not collector.slots
+
+
+@pytest.mark.asyncio
+async def test_request_cancelled_while_generating_is_released():
+    collector = HiddenStatesCollector()
+    generating = asyncio.Event()
+
+    async def get_model_logits(request_id: str):
+        # same lifecycle as the engine: bind, generate, wait for the states, always clean up
+        collect = collector.bind_to_request(request_id)
+        try:
+            collect(torch.ones(1, 4))
+            generating.set()
+            await asyncio.sleep(10)  # stands for the generation
+            return await collector.get_hidden_states(request_id)
+        finally:
+            collector.cleanup_request(request_id)
+
+    call = asyncio.create_task(get_model_logits("aborted"))
+    await generating.wait()
+    assert "aborted" in collector.slots
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+    assert not collector.slots
+    assert all(not slot.outputs for slot in collector.free_slots)
@@ -0,0 +1,95 @@
+import langid
+import pytest
+
+from auralis.common.definitions import requests
+from auralis.common.definitions.requests import (
+    LANGUAGE_SAMPLE_CHARS,
+    LANGUAGE_SAMPLE_WINDOWS,
+    MIN_CHUNK_DETECTION_CHARS,
+    _classify,
+    detect_languages,
+    get_language,
+    sample_text,
+)
+
+ENGLISH = "The committee will publish its final report on the new railway line next spring. "
+RUSSIAN = "Комитет опубликует свой окончательный доклад о новой железной дороге следующей весной. "
+JAPANESE = "委員会は来年の春に新しい鉄道路線に関する最終報告書を公表する予定です。"
+CHINESE = "委员会将于明年春天发布关于新铁路线的最终报告。"
+
+
+@pytest.fixture(autouse=True)
+def empty_language_cache():
+    requests._language_cache.clear()
+    yield
+    requests._language_cache.clear()
+
+
+@pytest.fixture
+def classified(monkeypatch):
+    """Texts handed to langid."""
+    texts = []
+    classify = langid.classify
+    monkeypatch.setattr(langid, 'classify', lambda text: texts.append(text) or classify(text))
+    return texts
+
+
+def test_short_text_is_its_own_sample():
+    assert sample_text(ENGLISH) == ENGLISH
+
+
+def test_sample_covers_the_whole_text():
+    text = ENGLISH * 100 + RUSSIAN * 100
+    sample = sample_text(text)
+
+    assert len(sample) <= LANGUAGE_SAMPLE_CHARS + LANGUAGE_SAMPLE_WINDOWS
+    assert sample.startswith(text[:100])
+    assert sample.endswith(text[-100:])
+    assert any('a' <= char <= 'z' for char in sample) and any('а' <= char <= 'я' for char in sample)
+
+
+@pytest.mark.parametrize("text, language", [
+    (ENGLISH, "en"), (RUSSIAN, "ru"), (JAPANESE, "ja"), (CHINESE, "zh-cn"),
+])
+def test_classify(text, language):
+    assert _classify(text) == language
+
+
+def test_classify_is_cached_by_hash(classified):
+    for _ in range(3):
+        assert _classify(RUSSIAN) == "ru"
+
+    assert classified == [RUSSIAN]
+    assert RUSSIAN not in requests._language_cache.keys()
+
+
+@pytest.mark.parametrize("repeats", [1, 10, 1000])
+def test_detection_cost_does_not_grow_with_the_text(classified, repeats):
+    text = (ENGLISH + JAPANESE) * repeats
+
+    get_language(text)
+
+    assert len(classified) == 1
+    assert len(classified[0]) <= LANGUAGE_SAMPLE_CHARS + LANGUAGE_SAMPLE_WINDOWS
+
+
+def test_chunk_languages_of_a_mixed_document():
+    chunks = [ENGLISH, RUSSIAN, "Да.", JAPANESE, CHINESE, "   OK   ", ENGLISH]
+
+    languages = detect_languages(chunks, default_language="en")
+
+    assert languages == ["en", "ru", "en", "ja", "zh-cn", "en", "en"]
+
+
+def test_short_chunks_keep_the_default_language(classified):
+    short = "Ja, natürlich."
+    assert len(short) < MIN_CHUNK_DETECTION_CHARS
+
+    assert detect_languages([short, "  " + short + "  "], default_language="fr") == ["fr", "fr"]
+    assert classified == []
+
+
+def test_unsupported_languages_fall_back_to_the_default(monkeypatch):
+    monkeypatch.setattr(langid, 'classify', lambda text: ("sw", 1.0))
+
+    assert detect_languages([ENGLISH], default_language="de") == ["de"]
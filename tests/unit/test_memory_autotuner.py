@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from auralis.common.scheduling.memory_autotuner import MemoryAutotuner, MemoryProfile
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+
+PROFILE = MemoryProfile(
+    device_name="Fake GPU",
+    model_bytes=500 * MB,
+    engine_bytes=800 * MB,
+    sequence_bytes=100 * MB,
+    vocoder_base_bytes=50 * MB,
+    vocoder_bytes_per_call=200 * MB,
+    conditioning_base_bytes=10 * MB,
+    conditioning_bytes_per_call=40 * MB,
+)
+
+
+def autotuner(tmp_path, *devices, headroom=0.0):
+    """Autotuner seeing devices with the given (free, total) memory."""
+    return MemoryAutotuner(
+        profile_dir=tmp_path,
+        memory_info=lambda index: devices[index],
+        device_count=lambda: len(devices),
+        headroom=headroom,
+    )
+
+
+def test_plenty_of_memory_gets_the_requested_concurrency(tmp_path):
+    plan = autotuner(tmp_path, (20 * GB, 24 * GB)).plan(PROFILE, max_concurrency=12)
+
+    assert plan.max_num_seqs == 12 and plan.device_index == 0
+    assert plan.semaphore_concurrency == 2
+    assert plan.max_concurrent_calls == (20 * GB - 1360 * MB - 12 * 100 * MB) // (240 * MB)
+    # memory in use by others, the engine weights and 12 sequences
+    assert plan.gpu_memory_utilization == pytest.approx((4 * GB + 800 * MB + 12 * 100 * MB) / (24 * GB))
+
+
+def test_tight_memory_fits_fewer_sequences_and_calls(tmp_path):
+    # 4GB free: 2.66GB left after the weights and workspaces
+    plan = autotuner(tmp_path, (4 * GB, 8 * GB)).plan(PROFILE, max_concurrency=64, tensor_parallel_size=2)
+
+    budget = 4 * GB - 500 * MB - 800 * MB - 50 * MB - 10 * MB
+    assert plan.max_num_seqs == (budget - 240 * MB) // (100 * MB)
+    assert plan.semaphore_concurrency == 1
+    assert plan.gpu_memory_utilization < 1.0
+    assert plan.max_num_seqs * 100 * MB + plan.semaphore_concurrency * 240 * MB <= budget
+
+
+def test_headroom_is_kept_free(tmp_path):
+    without = autotuner(tmp_path, (4 * GB, 8 * GB)).plan(PROFILE, max_concurrency=64)
+    with_headroom = autotuner(tmp_path, (4 * GB, 8 * GB), headroom=0.05).plan(PROFILE, max_concurrency=64)
+
+    # 410MB of headroom, 4 sequences less
+    assert (without.max_num_seqs, with_headroom.max_num_seqs) == (24, 20)
+
+
+def test_full_devices_are_skipped(tmp_path):
+    tuner = autotuner(tmp_path, (1 * GB, 24 * GB), (16 * GB, 16 * GB))
+
+    assert tuner.plan(PROFILE, max_concurrency=4).device_index == 1
+    with pytest.raises(RuntimeError):
+        autotuner(tmp_path, (1 * GB, 24 * GB)).plan(PROFILE, max_concurrency=4)
+
+
+def test_profiles_are_measured_once_and_stored(tmp_path):
+    tuner = autotuner(tmp_path, (20 * GB, 24 * GB))
+    measured = []
+
+    def measure():
+        measured.append(True)
+        return PROFILE
+
+    assert tuner.load_or_measure("fake-model", measure) == PROFILE
+    assert autotuner(tmp_path).load_or_measure("fake-model", measure) == PROFILE
+    assert len(measured) == 1
+
+    stale = json.loads((tmp_path / "fake-model.json").read_text())
+    stale["version"] = 0
+    (tmp_path / "fake-model.json").write_text(json.dumps(stale))
+    assert tuner.load("fake-model") is None
+    (tmp_path / "fake-model.json").write_text("{")
+    assert tuner.load("fake-model") is None
+
+
+def test_fit_linear_separates_workspace_and_per_call_memory():
+    assert MemoryAutotuner.fit_linear(lambda concurrency: 64 * MB + concurrency * 200 * MB) == (64 * MB, 200 * MB)
+    # noisy measurements are covered by the base
+    base, per_call = MemoryAutotuner.fit_linear({1: 260 * MB, 2: 470 * MB, 4: 860 * MB}.get)
+    assert all(base + per_call * c >= peak for c, peak in ((1, 260 * MB), (2, 470 * MB), (4, 860 * MB)))
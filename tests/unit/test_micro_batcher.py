@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from auralis.common.scheduling.micro_batcher import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_concurrent_items_are_batched():
+    batches = []
+
+    def double(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(double, max_batch_size=4, max_wait=0.01)
+    try:
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+    finally:
+        batcher.shutdown()
+
+    assert results == [i * 2 for i in range(10)]
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_reach_every_caller():
+    def fail(items):
+        raise ValueError("bad batch")
+
+    batcher = MicroBatcher(fail, max_wait=0.001)
+    try:
+        results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+    finally:
+        batcher.shutdown()
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("results", [[1], [1, 2, 3, 4]])
+async def test_result_count_mismatch_fails_every_caller(results):
+    batcher = MicroBatcher(lambda items: results, max_wait=0.001)
+    try:
+        outcomes = await asyncio.wait_for(
+            asyncio.gather(batcher.submit(1), batcher.submit(2), batcher.submit(3), return_exceptions=True),
+            timeout=5
+        )
+    finally:
+        batcher.shutdown()
+
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
@@ -0,0 +1,32 @@
+import pytest
+
+from auralis.models.xttsv2.components.vllm.positional_embeddings_correcter import PositionalEmbeddingsCorrecter
+
+
+def test_each_request_keeps_only_its_last_token():
+    correcter = PositionalEmbeddingsCorrecter()
+    correcter.init_request_id_prefill("a", 40, 7)
+    correcter.init_request_id_prefill("b", 60, 7)
+
+    assert [found.prefill_len for found in correcter.get_by_next_token([7, 7], [40, 60])] == [40, 60]
+
+    correcter.associate_new_tokens("a", 3)
+    correcter.associate_new_tokens("b", 9)
+    assert len(correcter.token_to_request) == 2
+    assert [found.pos_id for found in correcter.get_by_next_token([3, 9, 7], [41, 61, 40])] == [41, 61]
+    with pytest.raises(ValueError):
+        correcter.get_by_next_token([7], [40])
+
+    correcter.clear_request("a")
+    correcter.clear_request("b")
+    assert not correcter.token_to_request and not correcter.request_to_token
+
+
+def test_clearing_a_request_keeps_a_pair_remapped_by_another():
+    correcter = PositionalEmbeddingsCorrecter()
+    correcter.init_request_id_prefill("a", 40, 7)
+    correcter.init_request_id_prefill("b", 40, 7)
+
+    correcter.clear_request("a")
+
+    assert correcter.get_by_next_token([7], [40]) == [correcter.get_by_request_id("b")]
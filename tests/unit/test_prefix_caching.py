@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from auralis.models.xttsv2.components.vllm.placeholders import (
+    CONDITIONING_PREFIX_LENGTH,
+    conditioning_placeholder_ids,
+    unique_placeholder_ids,
+)
+from auralis.models.xttsv2.components.vllm.positional_embeddings_correcter import PositionalEmbeddingsCorrecter
+from auralis.models.xttsv2.components.vllm_mm_gpt import GPT2Model, XttsGPT
+
+HIDDEN_SIZE = 4
+VOCAB_SIZE = 1026
+START_AUDIO_TOKEN = 1024
+
+
+class BatchPreparation:
+    """The part of XttsGPT that lays the batch out before the GPT layers."""
+    audio_start_generation_token = START_AUDIO_TOKEN
+    find_len_of_sequence = staticmethod(XttsGPT.find_len_of_sequence)
+    _cached_prefix_lengths = staticmethod(XttsGPT._cached_prefix_lengths)
+    _maybe_correct_positions = XttsGPT._maybe_correct_positions
+    _apply_op_to_seq_in_batch = XttsGPT._apply_op_to_seq_in_batch
+
+    def __init__(self):
+        self.positional_embeddings_correcter = PositionalEmbeddingsCorrecter()
+
+
+def test_placeholder_ids_identify_the_conditioning():
+    voice, other_voice = torch.randn(CONDITIONING_PREFIX_LENGTH, HIDDEN_SIZE), torch.randn(CONDITIONING_PREFIX_LENGTH, HIDDEN_SIZE)
+    sentence, other_sentence = torch.randn(10, HIDDEN_SIZE), torch.randn(10, HIDDEN_SIZE)
+
+    ids = conditioning_placeholder_ids(torch.cat([voice, sentence]), VOCAB_SIZE)
+    assert len(ids) == CONDITIONING_PREFIX_LENGTH + 10 and min(ids) >= VOCAB_SIZE
+    assert ids == conditioning_placeholder_ids(torch.cat([voice, sentence]).clone(), VOCAB_SIZE)
+
+    same_voice = conditioning_placeholder_ids(torch.cat([voice, other_sentence]), VOCAB_SIZE)
+    assert same_voice[:CONDITIONING_PREFIX_LENGTH] == ids[:CONDITIONING_PREFIX_LENGTH]
+    assert set(same_voice[CONDITIONING_PREFIX_LENGTH:]).isdisjoint(ids[CONDITIONING_PREFIX_LENGTH:])
+
+    other = conditioning_placeholder_ids(torch.cat([other_voice, sentence]), VOCAB_SIZE)
+    assert set(other).isdisjoint(ids)
+    assert unique_placeholder_ids(5, VOCAB_SIZE) != unique_placeholder_ids(5, VOCAB_SIZE)
+
+
+@pytest.mark.parametrize("cached_lengths", [(0, 0), (32, 16), (16, 0), (0, 32)])
+def test_cached_prefix_rows_are_left_out_of_the_batch(cached_lengths):
+    conditionings = [torch.randn(1, 40, HIDDEN_SIZE), torch.randn(1, 36, HIDDEN_SIZE)]
+    start_of_generation_embed = torch.randn(1, HIDDEN_SIZE)
+    is_logit_only = torch.tensor([False, False])
+
+    # each prompt: a placeholder per conditioning row then the start audio token, minus the cached part
+    input_ids, positions, query_start_loc = [], [], [0]
+    for conditioning, cached_length in zip(conditionings, cached_lengths):
+        prompt_length = conditioning.shape[1] + 1
+        input_ids += [7] * (conditioning.shape[1] - cached_length) + [START_AUDIO_TOKEN]
+        positions += list(range(cached_length, prompt_length))
+        query_start_loc.append(len(input_ids))
+    attn_metadata = SimpleNamespace(query_start_loc=torch.tensor(query_start_loc),
+                                    context_lens_tensor=torch.tensor(cached_lengths))
+
+    starting_ids, kept_ids, kept_positions, to_insert = BatchPreparation()._apply_op_to_seq_in_batch(
+        torch.tensor(input_ids), torch.tensor(positions), list(conditionings), is_logit_only, [-1, -1],
+        False, attn_metadata
+    )
+    hidden_states = GPT2Model._insert_conditioning_into_hidden_states(
+        torch.empty(len(kept_ids), HIDDEN_SIZE), to_insert, start_of_generation_embed, starting_ids, is_logit_only
+    )
+
+    assert len(kept_ids) == 0 and len(hidden_states) == len(input_ids)
+    expected = torch.cat([
+        part for conditioning, cached_length in zip(conditionings, cached_lengths)
+        for part in (conditioning[0, cached_length:], start_of_generation_embed)
+    ])
+    assert torch.equal(hidden_states, expected)
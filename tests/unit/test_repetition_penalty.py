@@ -0,0 +1,71 @@
+import random
+from types import SimpleNamespace
+
+import torch
+
+from auralis.models.xttsv2.components.vllm.hijack import LogitsRepetitionPenalizer
+from auralis.models.xttsv2.components.vllm.repetition_penalty import BatchedRepetitionPenalizer
+
+VOCAB_SIZE = 64
+
+
+class SequenceData:
+    """The part of vLLM's SequenceData the penalizer reads."""
+
+    def __init__(self, prompt_token_ids):
+        self.prompt_token_ids = list(prompt_token_ids)
+        self.output_token_ids = []
+
+    def get_len(self):
+        return len(self.prompt_token_ids) + len(self.output_token_ids)
+
+    def get_token_ids(self):
+        return self.prompt_token_ids + self.output_token_ids
+
+    def get_last_token_id(self):
+        return self.get_token_ids()[-1]
+
+
+def make_metadata(running, penalties):
+    seq_groups, row = [], 0
+    for seq_id, seq_data in running.items():
+        seq_groups.append(SimpleNamespace(
+            seq_ids=[seq_id],
+            seq_data={seq_id: seq_data},
+            sample_indices=[row],
+            do_sample=True,
+            sampling_params=SimpleNamespace(batched_repetition_penalty=penalties[seq_id]),
+        ))
+        row += 1
+    return SimpleNamespace(seq_groups=seq_groups)
+
+
+def test_batched_penalty_matches_per_sequence_penalty():
+    rng = random.Random(0)
+    penalizer = BatchedRepetitionPenalizer(VOCAB_SIZE, max_sequences=6)
+    running, penalties, next_seq_id = {}, {}, 0
+
+    for step in range(200):
+        # sequences start and finish along the way, more of them than masks over time
+        while len(running) < 4 or (len(running) < 6 and rng.random() < 0.1):
+            running[next_seq_id] = SequenceData(rng.choices(range(VOCAB_SIZE), k=rng.randint(1, 10)))
+            penalties[next_seq_id] = rng.choice([None, 1.0, 0.5, 2.0, 5.0])
+            next_seq_id += 1
+        for seq_id in [seq_id for seq_id in running if rng.random() < 0.05]:
+            del running[seq_id]
+        if not running:
+            continue
+
+        logits = torch.randn(len(running), VOCAB_SIZE)
+        expected = logits.clone()
+        for row, (seq_id, seq_data) in enumerate(running.items()):
+            if penalties[seq_id] is not None:
+                expected[row] = LogitsRepetitionPenalizer(penalties[seq_id])(
+                    seq_data.prompt_token_ids, seq_data.output_token_ids, expected[row]
+                )
+
+        penalized = penalizer(logits, make_metadata(running, penalties))
+        torch.testing.assert_close(penalized, expected, rtol=0, atol=0)
+
+        for seq_data in running.values():
+            seq_data.output_token_ids.append(rng.randrange(VOCAB_SIZE))
@@ -0,0 +1,117 @@
+import langid
+import numpy as np
+import pytest
+
+from auralis.common.audio.enhancement_cache import EnhancementCache
+from auralis.common.audio.ingest import audio_ingestor
+from auralis.common.definitions import requests
+from auralis.common.definitions.enhancer import get_audio_processor
+from auralis.common.definitions.requests import TTSRequest
+from auralis.common.metrics.performance import metrics
+from auralis.common.scheduling.request_preprocessor import RequestPreprocessor
+
+TEXTS = [
+    "The quick brown fox jumps over the lazy dog while the farmer watches.",
+    "El rápido zorro marrón salta sobre el perro perezoso mientras el granjero mira.",
+    "Le renard brun rapide saute par-dessus le chien paresseux pendant que le fermier regarde.",
+    "Der schnelle braune Fuchs springt über den faulen Hund, während der Bauer zusieht.",
+    "敏捷的棕色狐狸跳过了懒惰的狗，农夫在一旁看着。",
+]
+
+
+def reference_audio(seed: int, seconds: float = 2.0, sample_rate: int = 22050):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    voice = 0.3 * np.sin(2 * np.pi * 180 * t) * (1 + np.sin(2 * np.pi * 3 * t))
+    return (voice + 0.01 * rng.standard_normal(t.shape)).astype(np.float32)
+
+
+def preprocess_inline(request: TTSRequest) -> TTSRequest:
+    """The preprocessing TTSRequest.__post_init__ used to run when a request was built."""
+    if request.language == 'auto' and len(request.text) > 0:
+        language = langid.classify(request.text)[0].strip()
+        request.language = "zh-cn" if language == "zh" else language
+    if isinstance(request.speaker_files, list) and request.enhance_speech:
+        processor = get_audio_processor(request.audio_config)
+        request.speaker_files = [
+            (processor.process(audio_ingestor.load(source, request.audio_config.sample_rate).squeeze(0)),
+             request.audio_config.sample_rate)
+            for source in request.speaker_files
+        ]
+    return request
+
+
+@pytest.fixture(autouse=True)
+def no_enhancement_cache(monkeypatch, tmp_path):
+    # every request is enhanced from scratch, as before the cache
+    monkeypatch.setattr(requests, 'enhancement_cache', EnhancementCache(tmp_path, max_size_bytes=0))
+
+
+@pytest.fixture
+def preprocessor():
+    preprocessor = RequestPreprocessor(language_detection_concurrency=2, enhancement_concurrency=2)
+    yield preprocessor
+    preprocessor.shutdown()
+
+
+def make_request(text: str, **kwargs) -> TTSRequest:
+    return TTSRequest(text=text, speaker_files=[reference_audio(0), reference_audio(1)], **kwargs)
+
+
+def test_construction_does_no_preprocessing(monkeypatch):
+    monkeypatch.setattr(requests, 'get_language', lambda text: pytest.fail("language detected on construction"))
+    monkeypatch.setattr(TTSRequest, 'preprocess_audio', lambda *args: pytest.fail("enhanced on construction"))
+
+    request = make_request(TEXTS[0], enhance_speech=True)
+
+    assert request.language == 'auto'
+    assert request.needs_language_detection and request.needs_enhancement
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("text", TEXTS)
+async def test_language_matches_inline_preprocessing(preprocessor, text):
+    request = make_request(text)
+
+    await preprocessor.prepare(request)
+
+    assert request.language == preprocess_inline(make_request(text)).language
+    assert not request.needs_language_detection
+
+
+@pytest.mark.asyncio
+async def test_enhancement_matches_inline_preprocessing(preprocessor):
+    request = make_request(TEXTS[0], language='en', enhance_speech=True)
+
+    await preprocessor.prepare(request)
+
+    expected = preprocess_inline(make_request(TEXTS[0], language='en', enhance_speech=True))
+    assert len(request.speaker_files) == len(expected.speaker_files)
+    for (audio, sample_rate), (expected_audio, expected_sample_rate) in zip(request.speaker_files,
+                                                                            expected.speaker_files):
+        assert sample_rate == expected_sample_rate
+        np.testing.assert_allclose(audio, expected_audio, atol=1e-5)
+    assert not request.needs_enhancement
+
+
+@pytest.mark.asyncio
+async def test_preprocessing_runs_once(preprocessor, monkeypatch):
+    request = make_request(TEXTS[1], enhance_speech=True)
+    await preprocessor.prepare(request)
+    monkeypatch.setattr(TTSRequest, 'preprocess_audio', lambda *args: pytest.fail("enhanced twice"))
+    monkeypatch.setattr(requests, 'get_language', lambda text: pytest.fail("language detected twice"))
+
+    await preprocessor.prepare(request)
+    await preprocessor.prepare(request.copy())
+
+
+@pytest.mark.asyncio
+async def test_stages_are_timed(preprocessor, monkeypatch):
+    stages = []
+    monkeypatch.setattr(metrics, 'record_stage', lambda stage, seconds: stages.append(stage))
+
+    request = make_request(TEXTS[2], enhance_speech=True)
+    await preprocessor.prepare(request)
+
+    assert stages[0] == 'request_init'
+    assert sorted(stages[1:]) == ['enhancement', 'enhancement', 'language_detection']
@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from auralis.models.xttsv2.config.tokenizer import (
+    BoundaryIndex,
+    find_best_split_point,
+    iter_split_sentence,
+    sentence_segmenters,
+    split_sentence,
+)
+
+SENTENCES = {
+    "en": [
+        "The rain had not stopped for three days.",
+        "Mr. Holloway closed the shutters and lit the lamp by the window.",
+        "\"Are you coming back tonight?\" she asked, without looking up.",
+        "He folded the letter twice, then put it in his coat pocket, walked to the door, "
+        "hesitated for a long while with his hand on the latch and finally went out into the "
+        "storm without saying a word to anyone in the house.",
+    ],
+    "zh": [
+        "雨已经连续下了三天。",
+        "“你今晚回来吗？”她头也不抬地问。",
+        "村里没有人记得河水上一次泛滥是什么时候，也没有人记得那座桥是谁修的，更没有人知道那条路通向哪里。",
+    ],
+}
+SEPARATORS = [" ", "  ", "\n", "\n\n", ""]
+
+
+def make_text(lang: str, seed: int) -> str:
+    rng = random.Random(seed)
+    return "".join(
+        rng.choice(SENTENCES[lang]) + rng.choice(SEPARATORS) for _ in range(rng.randint(1, 200))
+    )
+
+
+@pytest.mark.parametrize("lang", list(SENTENCES))
+@pytest.mark.parametrize("mode", ["spacy", "regex"])
+def test_lazy_segmentation_matches_whole_text(lang, mode):
+    for seed in range(5):
+        text = make_text(lang, seed)
+        expected = sentence_segmenters.segment(text, lang, mode)
+        for window_chars in (40, 500, 5000):
+            assert list(sentence_segmenters.iter_segment(text, lang, mode, window_chars)) == expected
+
+
+@pytest.mark.parametrize("lang", list(SENTENCES))
+def test_lazy_split_matches_split_sentence(lang):
+    for seed in range(5):
+        text = make_text(lang, seed)
+        for text_split_length in (60, 250):
+            assert list(iter_split_sentence(text, lang, text_split_length)) == \
+                split_sentence(text, lang, text_split_length)
+
+
+def test_boundary_index_matches_find_best_split_point():
+    rng = random.Random(0)
+    transcript = " ".join(rng.choice("so um yeah i think we should go there and then maybe".split()) for _ in range(400))
+    # Every marker, unicode whitespace and runs of them, scattered in words
+    alphabet = list("abcde      \n\r.,;:!?-—)]}»&+=/，。、：\u3000\xa0")
+    noisy = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 400))) for _ in range(200)]
+
+    for text in [transcript, " ".join(SENTENCES["en"] * 5), "".join(SENTENCES["zh"] * 5)] + noisy:
+        index = BoundaryIndex(text)
+        for _ in range(50):
+            start = rng.randint(0, len(text))
+            end = rng.randint(start, len(text))
+            target = rng.randint(start, end + 40)
+            assert index.find_best_split_point(target, start, end) == \
+                find_best_split_point(text[start:end], target - start) + start
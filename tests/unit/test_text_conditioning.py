@@ -0,0 +1,104 @@
+import functools
+import random
+
+import pytest
+import torch
+from torch import nn
+
+from auralis.models.xttsv2.components.tts.layers.xtts.text_conditioning import PackedTextEmbedder, merge_conditioning
+from auralis.models.xttsv2.components.vllm_mm_gpt import LearnedPositionEmbeddings
+
+HIDDEN_SIZE = 16
+VOCAB_SIZE = 100
+BOS, EOS = 1, 2
+
+
+def make_embedder(cache_size_bytes: int = 1024 ** 2) -> PackedTextEmbedder:
+    torch.manual_seed(0)
+    return PackedTextEmbedder(nn.Embedding(VOCAB_SIZE, HIDDEN_SIZE), LearnedPositionEmbeddings(64, HIDDEN_SIZE),
+                              BOS, EOS, cache_size_bytes=cache_size_bytes)
+
+
+def embed_one_by_one(embedder: PackedTextEmbedder, chunk):
+    """Embedding as it was done before the packed path: one lookup per chunk."""
+    tokens = torch.tensor([BOS, *chunk, EOS]).unsqueeze(0)
+    return embedder.text_embedding(tokens) + embedder.text_pos_embedding(tokens)
+
+
+def make_chunks(rng: random.Random, count: int):
+    return [[rng.randrange(3, VOCAB_SIZE) for _ in range(rng.randint(0, 40))] for _ in range(count)]
+
+
+@pytest.mark.parametrize("cache_size_bytes", [0, 1024 ** 2])
+def test_packed_embeddings_match_one_by_one(cache_size_bytes):
+    embedder = make_embedder(cache_size_bytes)
+    chunks = make_chunks(random.Random(0), 30)
+    chunks += chunks[:5]  # repeated within the call
+
+    for _ in range(2):  # the second time from the cache, if any
+        embeddings = embedder.embed(chunks)
+        assert len(embeddings) == len(chunks)
+        for chunk, embedding in zip(chunks, embeddings):
+            assert torch.allclose(embedding, embed_one_by_one(embedder, chunk).squeeze(0))
+
+
+def test_repeated_chunks_are_embedded_once():
+    embedder = make_embedder()
+    lookups = []
+    embedder.text_embedding.register_forward_hook(lambda module, args, output: lookups.append(args[0].numel()))
+
+    embedder.embed([[5, 6], [7], [5, 6]])
+    assert lookups == [4 + 3]
+    embedder.embed([[7], [8, 9, 10], [5, 6]])
+    assert lookups == [4 + 3, 5]
+    embedder.embed([[7], [5, 6]])
+    assert lookups == [4 + 3, 5]
+
+
+def test_cache_is_bounded():
+    embedder = make_embedder(cache_size_bytes=3 * 4 * HIDDEN_SIZE * 4)  # three chunks of two tokens
+    embedder.embed([[i, i] for i in range(3, 10)])
+    assert len(embedder.cache) == 3
+    assert embedder.cache.currsize <= embedder.cache.maxsize
+
+
+def null_position_embeddings(range: torch.Tensor, dim: int) -> torch.Tensor:
+    return torch.zeros((range.shape[0], range.shape[1], dim), device=range.device)
+
+
+def token_position_embeddings(tokens: torch.Tensor) -> torch.Tensor:
+    """Depends on the position within the chunk, like a learned table would."""
+    return torch.arange(tokens.shape[1], dtype=torch.float32)[None, :, None].expand(*tokens.shape, HIDDEN_SIZE)
+
+
+@pytest.mark.parametrize("text_pos_embedding", [
+    functools.partial(null_position_embeddings, dim=HIDDEN_SIZE), token_position_embeddings
+])
+def test_position_embeddings_without_table(text_pos_embedding):
+    embedder = make_embedder()
+    embedder.text_pos_embedding = text_pos_embedding
+    chunks = make_chunks(random.Random(2), 10)
+
+    for chunk, embedding in zip(chunks, embedder.embed(chunks)):
+        assert torch.allclose(embedding, embed_one_by_one(embedder, chunk).squeeze(0))
+
+
+@pytest.mark.parametrize("dtype", [torch.float32, torch.float16])
+def test_merge_matches_one_by_one(dtype):
+    rng = random.Random(1)
+    audio_conditioning = torch.randn(1, 32, HIDDEN_SIZE)
+    text_embeddings = [torch.randn(rng.choice([(1,), ()]) + (rng.randint(2, 40), HIDDEN_SIZE)) for _ in range(20)]
+
+    merged = merge_conditioning(text_embeddings, audio_conditioning, dtype)
+
+    assert len(merged) == len(text_embeddings)
+    for text_embedding, inputs in zip(text_embeddings, merged):
+        expected = torch.cat([audio_conditioning, text_embedding.reshape(1, -1, HIDDEN_SIZE)], dim=1).squeeze(0)
+        assert inputs.dtype == dtype
+        assert torch.equal(inputs, expected.to(dtype))
+    # all of them share one buffer
+    assert len({inputs.untyped_storage().data_ptr() for inputs in merged}) == 1
+
+
+def test_merge_without_chunks():
+    assert merge_conditioning([], torch.randn(1, 32, HIDDEN_SIZE), torch.float32) == []
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from auralis.common.scheduling.text_preparation import TextPreparationPool, shard_text
+from auralis.common.scheduling.two_phase_scheduler import TwoPhaseScheduler
+
+
+class WordTokenizer:
+    """Stand-in for the XTTS tokenizer: one chunk per sentence, one token per word length."""
+
+    def split_text(self, text, lang):
+        return [sentence.strip() + "." for sentence in text.split(".") if sentence.strip()]
+
+    def __call__(self, texts, lang, **kwargs):
+        return {'input_ids': [[len(word) for word in text.split()] for text in texts]}
+
+
+def make_document(paragraphs: int = 40) -> str:
+    return "\n\n".join(
+        " ".join(f"Sentence {p} {s} has {'word ' * (s % 7)}here." for s in range(12))
+        for p in range(paragraphs)
+    )
+
+
+def test_shard_text_keeps_all_the_text():
+    document = make_document()
+    shards = shard_text(document, 1000)
+
+    assert len(shards) > 1
+    assert all(len(shard) <= 1000 for shard in shards)
+    assert " ".join(shards).split() == document.split()
+
+
+def test_pool_is_opt_in():
+    document = make_document()
+
+    assert not TextPreparationPool(WordTokenizer, shard_chars=1500).should_use(document)
+    assert TextPreparationPool(WordTokenizer, max_workers=None, shard_chars=1500).should_use(document)
+    assert not TextPreparationPool(WordTokenizer, max_workers=2, shard_chars=1500).should_use("Short.")
+
+
+@pytest.mark.asyncio
+async def test_pool_streams_chunks_in_order():
+    document = make_document()
+    tokenizer = WordTokenizer()
+    expected = tokenizer(tokenizer.split_text(document, "en"), "en")['input_ids']
+
+    pool = TextPreparationPool(WordTokenizer, max_workers=2, shard_chars=1500, max_shards_in_flight=3)
+    try:
+        streamed = [tokens async for tokens in pool.stream(document, "en")]
+        batches = [batch async for batch in pool.stream_batches(document, "en")]
+    finally:
+        pool.shutdown()
+
+    assert streamed == expected
+    # one batch per shard
+    assert len(batches) == len(shard_text(document, 1500))
+    assert [tokens for batch in batches for tokens in batch] == expected
+
+
+@pytest.mark.asyncio
+async def test_scheduler_accepts_streamed_inputs():
+    scheduler = TwoPhaseScheduler(second_phase_concurrency=4)
+
+    async def inputs():
+        for i in range(6):
+            await asyncio.sleep(0.01 * (6 - i))
+            yield i
+
+    async def first_phase(_):
+        return {'parallel_inputs': inputs()}
+
+    async def second_phase(i):
+        await asyncio.sleep(0.01 * i)
+        yield i
+
+    try:
+        outputs = [item async for item in scheduler.run(None, first_phase, second_phase, request_id="streamed")]
+    finally:
+        await scheduler.shutdown()
+
+    assert outputs == list(range(6))
@@ -0,0 +1,58 @@
+import random
+import string
+
+import pytest
+from tokenizers import Tokenizer
+from tokenizers.models import BPE
+
+from auralis.models.xttsv2.config.tokenizer import XTTSTokenizerFast
+
+SPECIAL_TOKENS = ["[STOP]", "[UNK]", "[SPACE]", "[START]", "[PAD]", "[en]", "[es]"]
+
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    """Character level stand-in for the XTTS vocabulary."""
+    vocab = {token: i for i, token in enumerate(SPECIAL_TOKENS + list(string.ascii_lowercase + ".,"))}
+    tokenizer_object = Tokenizer(BPE(vocab, [], unk_token="[UNK]"))
+    tokenizer_object.add_special_tokens(SPECIAL_TOKENS)
+    return XTTSTokenizerFast(tokenizer_object=tokenizer_object)
+
+
+def test_batch_encode_documents_maps_chunks_to_documents(tokenizer):
+    texts = ["Hello world. " * 30, "Short one.", "Hola mundo. " * 40]
+    languages = ["en", "en", "es"]
+
+    input_ids, offsets = tokenizer.batch_encode_documents(texts, lang=languages)
+
+    assert offsets[0] == 0 and offsets[-1] == len(input_ids)
+    for i, (text, language) in enumerate(zip(texts, languages)):
+        expected = tokenizer(
+            tokenizer.split_text(text, language), lang=language, add_special_tokens=False
+        )['input_ids']
+        assert input_ids[offsets[i]:offsets[i + 1]] == expected
+
+
+def test_batch_encode_with_split_keeps_every_document(tokenizer):
+    texts = ["First document. " * 20, "Second document. " * 20]
+    input_ids = tokenizer.batch_encode_with_split(texts, lang="en")
+
+    assert input_ids == tokenizer.batch_encode_with_split(texts[0], lang="en") + \
+        tokenizer.batch_encode_with_split(texts[1], lang="en")
+
+
+def test_balanced_chunking_stays_within_max_text_tokens(tokenizer):
+    rng = random.Random(0)
+    words = "the rain had not stopped for three days and nobody remembered the flood".split()
+    text = " ".join(
+        " ".join(rng.choice(words) for _ in range(rng.choice([2, 5, 10, 20, 40, 90]))) + "."
+        for _ in range(200)
+    )
+    balanced = XTTSTokenizerFast(tokenizer_object=tokenizer.backend_tokenizer, chunking="balanced", max_text_tokens=120)
+
+    chunks = balanced.split_text(text, "en")
+    token_counts = [len(ids) for ids in balanced(chunks, lang="en", add_special_tokens=False)['input_ids']]
+
+    assert max(token_counts) <= 120
+    assert " ".join(chunks).replace(".", " ").split() == text.replace(".", " ").split()
+    assert list(balanced.iter_split_text(text, "en")) == chunks
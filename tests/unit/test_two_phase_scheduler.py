@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from auralis.common.scheduling.two_phase_scheduler import TwoPhaseScheduler
+
+
+@pytest.mark.asyncio
+async def test_items_of_each_generator_come_out_together_and_in_order():
+    async def first_phase(inputs):
+        return {'parallel_inputs': inputs}
+
+    async def second_phase(gen_input):
+        # later sequences are faster, every sequence yields several chunks
+        for chunk in range(3):
+            await asyncio.sleep(0.02 / (gen_input + 1))
+            yield gen_input, chunk
+
+    async def collect():
+        return [item async for item in scheduler.run(
+            inputs=[0, 1, 2], first_phase_fn=first_phase, second_phase_fn=second_phase
+        )]
+
+    scheduler = TwoPhaseScheduler(second_phase_concurrency=3)
+    try:
+        outputs = await asyncio.wait_for(collect(), timeout=5)
+    finally:
+        await scheduler.shutdown()
+
+    assert outputs == [(sequence, chunk) for sequence in range(3) for chunk in range(3)]
@@ -0,0 +1,55 @@
+import random
+
+import numpy as np
+import pytest
+
+from auralis.models.xttsv2.components.tts.layers.xtts.windowed_vocoder import WindowedVocoder
+
+SAMPLES_PER_TOKEN = 1024
+
+
+def vocode(latents: np.ndarray) -> np.ndarray:
+    """Stand-in vocoder, each token only shapes its own samples."""
+    ramp = np.linspace(0.5, 1.0, SAMPLES_PER_TOKEN, dtype=np.float32)
+    return (latents[:, None] * ramp).reshape(-1)
+
+
+def stream(latents: np.ndarray, windows: WindowedVocoder, steps: list) -> list:
+    chunks, available = [], 0
+    for i, step in enumerate(steps):
+        available += step
+        final = i == len(steps) - 1
+        while (window := windows.next_window(available, final)) is not None:
+            chunks.append(windows.splice(vocode(latents[window[0]:window[1]]), window, final))
+            if final:
+                break
+    return chunks
+
+
+@pytest.mark.parametrize("tokens", [5, 40, 41, 300])
+def test_windows_splice_back_to_the_whole_sequence(tokens):
+    rng = random.Random(tokens)
+    latents = np.random.default_rng(tokens).standard_normal(tokens).astype(np.float32)
+    steps = [1] * min(tokens, 50) + [rng.randint(1, 8) for _ in range(tokens)]
+    steps = steps[:next(i for i in range(len(steps) + 1) if sum(steps[:i]) >= tokens)]
+    steps[-1] -= sum(steps) - tokens
+
+    chunks = stream(latents, WindowedVocoder(window_tokens=32, context_tokens=8), steps)
+
+    np.testing.assert_allclose(np.concatenate(chunks), vocode(latents), rtol=1e-6, atol=1e-6)
+    if tokens <= 40:
+        assert len(chunks) == 1
+    else:
+        # the first window goes out as soon as it has its right context
+        assert len(chunks[0]) == 32 * SAMPLES_PER_TOKEN
+
+
+def test_seams_are_crossfaded():
+    windows = WindowedVocoder(window_tokens=4, context_tokens=2, crossfade_samples=SAMPLES_PER_TOKEN)
+    first = windows.splice(np.zeros(6 * SAMPLES_PER_TOKEN, dtype=np.float32), windows.next_window(6), False)
+    window = windows.next_window(8, True)
+    second = windows.splice(np.ones((window[1] - window[0]) * SAMPLES_PER_TOKEN, dtype=np.float32), window, True)
+
+    assert len(first) == 4 * SAMPLES_PER_TOKEN and len(first) + len(second) == 8 * SAMPLES_PER_TOKEN
+    assert np.all(np.diff(second[:SAMPLES_PER_TOKEN]) > 0) and second[0] == 0.0
+    assert np.all(second[SAMPLES_PER_TOKEN:] == 1.0)
@@ -5,8 +5,6 @@ import base64
 import sounddevice as sd
 import numpy as np
 from auralis import TTS, TTSRequest
-import tempfile
-import os
 from typing import Optional
 import wave
 import io
@@ -32,16 +30,9 @@ class TTSServer:
     async def handle_health_check(self, websocket):
         await websocket.send(json.dumps({"type": "health_check", "status": "ok"}))
 
-    def base64_to_wav(self, base64_audio: str) -> str:
-        # Decode base64 audio
-        audio_data = base64.b64decode(base64_audio)
-        
-        # Create a temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-        temp_file.write(audio_data)
-        temp_file.close()
-        
-        return temp_file.name
+    def base64_to_wav(self, base64_audio: str) -> bytes:
+        # Decode base64 audio, the engine reads the encoded bytes directly
+        return base64.b64decode(base64_audio)
 
     async def play_audio(self, audio_data: np.ndarray, sample_rate: int, websocket):
         self.is_playing = True
@@ -91,10 +82,6 @@ class TTSServer:
             # Play audio and monitor progress
             await self.play_audio(audio_data, sample_rate, websocket)
 
-            # Cleanup temporary speaker file if it was created
-            if "speaker_file" in data:
-                os.unlink(speaker_file)
-
         except Exception as e:
             await websocket.send(json.dumps({
                 "type": "error",